@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+.agd data 테이블 청크 단위 NumPy 리더
+
+.agd(SQLite)의 data 테이블(dataTimestamp, axis1~3, steps, lux, incline*)을
+고정 크기 청크의 NumPy 레코드 배열 또는 컬럼 배열로 읽습니다.
+메모리 사용량은 청크 크기로 제한되며 DataFrame을 만들지 않습니다.
+
+dataTimestamp는 기록 순서(rowid)대로 정렬되어 있으므로 시작/종료 Ticks 구간은
+rowid 이진 탐색(O(log n) 번의 단일 행 조회)으로 찾고, 그 구간만 rowid 순으로 읽습니다.
+파일은 읽기 전용(mode=ro)으로 열어 수정하지 않습니다.
+
+사용 예시:
+    from agd_data import AgdDataReader
+    with AgdDataReader(path, columns=['axis1', 'axis2', 'axis3']) as reader:
+        for chunk in reader.iter_chunks(start=datetime(2025, 11, 21), stop=datetime(2025, 11, 28)):
+            chunk['axis1']  # 청크별 NumPy 배열
+"""
+
+import datetime
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+# data 테이블 컬럼 (ActiLife 표준 - 파일에 따라 일부 없을 수 있음)
+AGD_DATA_COLUMNS = [
+    "dataTimestamp", "axis1", "axis2", "axis3", "steps", "lux",
+    "inclineOff", "inclineStanding", "inclineSitting", "inclineLying",
+]
+
+TIMESTAMP_COLUMN = "dataTimestamp"
+
+# 기본 청크 크기 (행 수)
+DEFAULT_CHUNK_ROWS = 65536
+
+# Unix epoch(1970-01-01)의 Windows Ticks (100ns 단위, 0001-01-01 기준)
+TICKS_AT_UNIX_EPOCH = 621355968000000000
+TICKS_PER_MICROSECOND = 10
+
+TickValue = Union[int, datetime.datetime]
+
+
+def to_ticks(value: TickValue) -> int:
+    """datetime 또는 Ticks를 Ticks(int)로 변환 (정수 연산으로 정밀도 유지)"""
+    if isinstance(value, datetime.datetime):
+        delta = value - datetime.datetime(1, 1, 1)
+        return delta // datetime.timedelta(microseconds=1) * TICKS_PER_MICROSECOND
+    return int(value)
+
+
+def ticks_to_datetime64(ticks: np.ndarray) -> np.ndarray:
+    """Ticks 배열을 datetime64[us] 배열로 변환 (벡터 연산)"""
+    microseconds = (np.asarray(ticks, dtype=np.int64) - TICKS_AT_UNIX_EPOCH) // TICKS_PER_MICROSECOND
+    return microseconds.astype('datetime64[us]')
+
+
+def open_agd_readonly(path) -> sqlite3.Connection:
+    """.agd를 읽기 전용으로 열기 (저널/잠금 파일을 만들지 않음)"""
+    uri = f"{Path(path).resolve().as_uri()}?mode=ro"
+    return sqlite3.connect(uri, uri=True)
+
+
+class AgdDataReader:
+    """.agd data 테이블 청크 리더"""
+
+    def __init__(self, path, columns: Optional[Sequence[str]] = None,
+                 chunk_rows: int = DEFAULT_CHUNK_ROWS, dtype=np.float64):
+        """
+        Args:
+            path: .agd 파일 경로
+            columns: 읽을 컬럼 (기본값: 파일에 있는 AGD_DATA_COLUMNS 전체,
+                     dataTimestamp는 항상 포함)
+            chunk_rows: 청크당 행 수
+            dtype: 측정값 컬럼 dtype (dataTimestamp는 항상 int64)
+        """
+        self.path = Path(path)
+        self.chunk_rows = int(chunk_rows)
+        self.conn = open_agd_readonly(self.path)
+
+        available = [row[1] for row in self.conn.execute("PRAGMA table_info(data)")]
+        if not available:
+            self.conn.close()
+            raise ValueError(f"data table not found in {self.path.name}")
+
+        if columns is None:
+            columns = [column for column in AGD_DATA_COLUMNS if column in available]
+        missing = [column for column in columns if column not in available]
+        if missing:
+            self.conn.close()
+            raise KeyError(f"Columns not found in data table: {', '.join(missing)}")
+
+        self.columns: List[str] = [TIMESTAMP_COLUMN] + [c for c in columns if c != TIMESTAMP_COLUMN]
+        self.dtype = np.dtype([
+            (column, np.int64 if column == TIMESTAMP_COLUMN else dtype) for column in self.columns
+        ])
+
+    def __enter__(self) -> 'AgdDataReader':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    # ------------------------------------------------------------------
+    # 구간 탐색
+    # ------------------------------------------------------------------
+
+    def row_count(self) -> int:
+        """data 테이블 행 수"""
+        return self.conn.execute("SELECT COUNT(*) FROM data").fetchone()[0]
+
+    def rowid_bounds(self) -> Tuple[int, int]:
+        """(최소 rowid, 최대 rowid + 1) - 비어 있으면 (0, 0)"""
+        low, high = self.conn.execute("SELECT MIN(rowid), MAX(rowid) FROM data").fetchone()
+        if low is None:
+            return 0, 0
+        return low, high + 1
+
+    def _row_at_or_after(self, rowid: int) -> Optional[Tuple[int, int]]:
+        """rowid 이상인 첫 행의 (rowid, dataTimestamp)"""
+        return self.conn.execute(
+            f"SELECT rowid, {TIMESTAMP_COLUMN} FROM data WHERE rowid >= ? ORDER BY rowid LIMIT 1",
+            (rowid,)
+        ).fetchone()
+
+    def _first_rowid_at(self, ticks: int, low: int, high: int) -> int:
+        """dataTimestamp >= ticks인 첫 행의 rowid (rowid 이진 탐색, 없으면 high)
+
+        삭제로 rowid가 비어 있어도 되도록 각 탐색 지점에서 그 이상인 첫 행을 조회합니다.
+        """
+        left, right = low, high
+        while left < right:
+            middle = (left + right) // 2
+            row = self._row_at_or_after(middle)
+            if row is not None and row[0] < high and row[1] < ticks:
+                left = row[0] + 1
+            else:
+                right = middle
+        row = self._row_at_or_after(left)
+        return row[0] if row is not None and row[0] < high else high
+
+    def rowid_range(self, start: Optional[TickValue] = None,
+                    stop: Optional[TickValue] = None) -> Tuple[int, int]:
+        """[start, stop) Ticks 구간에 해당하는 rowid 구간 [low, high)
+
+        Args:
+            start: 시작 시각 (Ticks 또는 datetime, 포함, None이면 처음부터)
+            stop: 종료 시각 (Ticks 또는 datetime, 제외, None이면 끝까지)
+
+        Returns:
+            (시작 rowid, 끝 rowid) 튜플
+        """
+        low, high = self.rowid_bounds()
+        if start is not None:
+            low = self._first_rowid_at(to_ticks(start), low, high)
+        if stop is not None:
+            high = self._first_rowid_at(to_ticks(stop), low, high)
+        return low, high
+
+    # ------------------------------------------------------------------
+    # 청크 읽기
+    # ------------------------------------------------------------------
+
+    def iter_chunks(self, start: Optional[TickValue] = None,
+                    stop: Optional[TickValue] = None) -> Iterator[np.ndarray]:
+        """[start, stop) 구간을 청크 단위 레코드 배열로 읽기
+
+        Yields:
+            np.ndarray: 구조화 배열 (필드: self.columns), 최대 chunk_rows 행
+        """
+        low, high = self.rowid_range(start, stop)
+        column_list = ", ".join(self.columns)
+        query = (f"SELECT rowid, {column_list} FROM data "
+                 f"WHERE rowid >= ? AND rowid < ? ORDER BY rowid LIMIT ?")
+
+        while low < high:
+            rows = self.conn.execute(query, (low, high, self.chunk_rows)).fetchall()
+            if not rows:
+                return
+            low = rows[-1][0] + 1
+            chunk = np.array([row[1:] for row in rows], dtype=self.dtype)
+            del rows
+            yield chunk
+
+    def iter_columns(self, start: Optional[TickValue] = None,
+                     stop: Optional[TickValue] = None) -> Iterator[Dict[str, np.ndarray]]:
+        """[start, stop) 구간을 청크 단위 컬럼 배열 dict로 읽기
+
+        Yields:
+            dict: {컬럼명: 연속 NumPy 배열}
+        """
+        for chunk in self.iter_chunks(start, stop):
+            yield {column: np.ascontiguousarray(chunk[column]) for column in self.columns}
+
+    def read(self, start: Optional[TickValue] = None,
+             stop: Optional[TickValue] = None) -> np.ndarray:
+        """[start, stop) 구간 전체를 하나의 레코드 배열로 읽기 (구간 크기만큼 메모리 사용)"""
+        low, high = self.rowid_range(start, stop)
+        result = np.empty(max(0, high - low), dtype=self.dtype)
+        filled = 0
+        for chunk in self.iter_chunks(start, stop):
+            result[filled:filled + len(chunk)] = chunk
+            filled += len(chunk)
+        return result[:filled]
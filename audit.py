@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+디렉토리 전체 메타데이터 감사 (Excel 대상자 정보와 비교)
+
+디렉토리의 모든 .agd/.gt3x 헤더 메타데이터를 inspector로 읽고, 대상자 정보 레지스트리와
+한 번의 벡터화된 조인으로 맞춰 필드별 불일치를 보고합니다. 파일은 수정하지 않습니다.
+
+조인 키:
+  - 원본 파일명 (고유번호 (날짜)): 고유번호 → 관리번호
+  - 변경된 파일명 (ID_이름 (날짜)): ID
+  위 키별로 파일 날짜 이전의 가장 최근 착용 시작일(merge_asof)을 찾아 (연도, 구분)을 정하므로
+  name.py의 구분 자동 판별과 같은 기준입니다.
+
+비교 필드: subjectname, sex, height, mass, age, dateOfBirth(Ticks), side, dominance, limb
+기대값은 name.py/modify.py가 실제로 기록하는 값과 같은 방식으로 계산합니다.
+
+사용 예시:
+    # config.yaml의 target_directory 전체, 기본 연도
+    python audit.py -o audit.csv
+
+    # 여러 연도, 특정 구분만
+    python audit.py D:/site1 --year 2024-2025 --week 1주차-40주차
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from inspector import collect_paths, inspect_files
+from modify import AGD_FIELDS, ActiGraphModifier
+from name import ActiGraphRenamer, expand_divisions, expand_years
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# 비교할 메타데이터 필드 (inspector 컬럼 = AGD_FIELDS 키)
+AUDIT_FIELDS = list(AGD_FIELDS)
+
+# 파일명 패턴 (name.py의 extract_info_from_renamed_file / extract_serial_from_filename과 동일)
+RENAMED_PATTERN = r'^(?P<id>[A-Z0-9]+)_(?P<name>[가-힣]+)\s*\((?P<date>\d{4}-\d{2}-\d{2})\)'
+ORIGINAL_PATTERN = r'^(?P<serial>[A-Z0-9]+)\s*\((?P<date>\d{4}-\d{2}-\d{2})\)'
+
+# 보고서 컬럼
+REPORT_COLUMNS = ['path', 'filename', 'key', 'year', 'division', 'management_number', 'id',
+                  'field', 'expected', 'actual']
+
+
+def registry_frame(renamer: ActiGraphRenamer) -> 'pd.DataFrame':
+    """로드된 레지스트리를 (연도, 구분, 관리번호)당 한 행의 기대값 DataFrame으로 변환
+
+    기대값은 extract_metadata_from_subject_info → _prepare_updates로 계산하므로
+    파일에 기록되는 문자열과 같습니다 (대상자 수만큼만 계산).
+    """
+    import pandas as pd
+
+    modifier = ActiGraphModifier(config=renamer.config)
+    rows = []
+    for (management_number, division, year), records in renamer.subject_index.items():
+        if renamer.division_filter is not None and (year, division) not in renamer.division_filter:
+            continue
+        record = records[0]
+        wear_date = renamer._format_wear_date(record.get('wear_start_date'))
+        if wear_date is None:
+            continue
+
+        # 생년월일/키 등이 비어 있거나 숫자가 아닌 행(중도 탈락 등)은 기대값 없이 (경고 출력 생략)
+        with contextlib.redirect_stdout(io.StringIO()):
+            try:
+                metadata = renamer.extract_metadata_from_subject_info(management_number, division, year)
+                expected = modifier._prepare_updates(metadata, AGD_FIELDS) if metadata else {}
+            except (TypeError, ValueError):
+                expected = {}
+
+        row = {
+            'year': year,
+            'division': division,
+            'management_number': management_number,
+            'id': None if record.get('id') is None else str(record['id']),
+            'wear_date': wear_date,
+        }
+        row.update((f"expected_{field}", expected.get(field)) for field in AUDIT_FIELDS)
+        rows.append(row)
+
+    columns = ['year', 'division', 'management_number', 'id', 'wear_date'] + [
+        f"expected_{field}" for field in AUDIT_FIELDS]
+    frame = pd.DataFrame(rows, columns=columns)
+    frame['wear_date'] = pd.to_datetime(frame['wear_date'])
+    return frame
+
+
+def _match(files: 'pd.DataFrame', registry: 'pd.DataFrame', by: str) -> 'pd.DataFrame':
+    """키(by)별로 파일 날짜 이전의 가장 최근 착용 시작일 행과 조인 (merge_asof)"""
+    import pandas as pd
+
+    left = files.dropna(subset=[by, 'file_date']).sort_values('file_date')
+    right = registry.dropna(subset=[by]).sort_values('wear_date')
+    left = left.astype({by: right[by].dtype})
+    return pd.merge_asof(left, right, left_on='file_date', right_on='wear_date', by=by,
+                         direction='backward', suffixes=('', '_registry'))
+
+
+def audit_files(rows: List[Dict], renamer: ActiGraphRenamer) -> Tuple['pd.DataFrame', Dict]:
+    """파일 헤더 메타데이터와 레지스트리 비교
+
+    Args:
+        rows: inspect_files 결과
+        renamer: load_data를 마친 ActiGraphRenamer (division_filter 적용)
+
+    Returns:
+        (불일치 보고서 DataFrame, 요약 dict)
+    """
+    import pandas as pd
+
+    files = pd.DataFrame(rows)
+    registry = registry_frame(renamer)
+
+    # 파일명에서 키/날짜 추출 (벡터 연산)
+    renamed = files['filename'].str.extract(RENAMED_PATTERN)
+    original = files['filename'].str.extract(ORIGINAL_PATTERN)
+    files['id'] = renamed['id']
+    files['serial'] = original['serial'].where(renamed['id'].isna())
+    files['file_date'] = pd.to_datetime(renamed['date'].fillna(original['date']), errors='coerce')
+    files['key'] = 'id'
+    files.loc[files['id'].isna(), 'key'] = 'serial'
+
+    # 고유번호 → 관리번호 (한 번의 조인)
+    serials = pd.DataFrame(list(renamer.serial_index.items()), columns=['serial', 'management_number'])
+    by_serial = files[files['serial'].notna()].drop(columns=['id']).merge(serials, on='serial', how='left')
+    by_id = files[files['id'].notna()]
+
+    readable = files['error'] == ''
+    matched = pd.concat([
+        _match(by_serial[by_serial['error'] == ''], registry, 'management_number'),
+        _match(by_id[by_id['error'] == ''], registry, 'id'),
+    ], ignore_index=True)
+    matched = matched[matched['wear_date'].notna()]
+
+    # 필드별 불일치 (벡터 비교 후 긴 형식으로 변환)
+    reports = []
+    base_columns = ['path', 'filename', 'key', 'year', 'division', 'management_number', 'id']
+    for field in AUDIT_FIELDS:
+        expected = matched[f"expected_{field}"]
+        actual = matched[field].fillna('').astype(str)
+        mask = expected.notna() & (actual != expected.astype(str))
+        if mask.any():
+            report = matched.loc[mask, base_columns].copy()
+            report['field'] = field
+            report['expected'] = expected[mask].astype(str).values
+            report['actual'] = actual[mask].values
+            reports.append(report)
+
+    # 대상자 정보가 불완전해 기대값을 만들 수 없는 파일
+    incomplete = matched[matched[[f"expected_{field}" for field in AUDIT_FIELDS]].isna().all(axis=1)]
+    if not incomplete.empty:
+        reports.append(incomplete[base_columns].assign(
+            field='registry', expected='', actual='대상자 메타데이터 불완전'))
+
+    # 대상자 매칭 실패 / 읽기 실패
+    unmatched = files[readable & ~files['path'].isin(matched['path'])]
+    if not unmatched.empty:
+        reports.append(unmatched[['path', 'filename', 'key', 'id']].assign(
+            field='registry', expected='', actual='대상자 정보 없음'))
+    errors = files[~readable]
+    if not errors.empty:
+        reports.append(errors[['path', 'filename', 'key', 'id']].assign(
+            field='error', expected='', actual=errors['error']))
+
+    report = (pd.concat(reports, ignore_index=True) if reports
+              else pd.DataFrame(columns=REPORT_COLUMNS)).reindex(columns=REPORT_COLUMNS)
+    report = report.sort_values(['filename', 'field'], kind='stable').reset_index(drop=True)
+
+    field_mismatches = report[report['field'].isin(AUDIT_FIELDS)]
+    summary = {
+        'files': len(files),
+        'matched': len(matched),
+        'mismatched_files': field_mismatches['path'].nunique(),
+        'incomplete': len(incomplete),
+        'field_counts': field_mismatches['field'].value_counts().reindex(AUDIT_FIELDS).dropna().astype(int).to_dict(),
+        'unmatched': len(unmatched),
+        'errors': len(errors),
+    }
+    return report, summary
+
+
+def print_summary(summary: Dict, elapsed: float):
+    """감사 결과 요약 출력"""
+    print(f"\n{'='*60}")
+    print("📊 감사 결과")
+    print(f"{'='*60}")
+    print(f"📁 파일: {summary['files']}개 ({elapsed:.2f}초)")
+    print(f"✅ 일치: {summary['matched'] - summary['mismatched_files'] - summary['incomplete']}개")
+    print(f"❌ 불일치: {summary['mismatched_files']}개")
+    for field, count in summary['field_counts'].items():
+        print(f"    {field:<12} {count}건")
+    print(f"⚠️  대상자 메타데이터 불완전: {summary['incomplete']}개")
+    print(f"⚠️  대상자 정보 없음: {summary['unmatched']}개")
+    print(f"⚠️  읽기 실패: {summary['errors']}개")
+    print(f"{'='*60}\n")
+
+
+def run_audit(renamer: ActiGraphRenamer, targets: List, years: List[int],
+              divisions: Optional[List[str]] = None, jobs: Optional[int] = None) -> Tuple['pd.DataFrame', Dict]:
+    """대상 파일 헤더 읽기 → 레지스트리 로드 → 조인/비교"""
+    paths = collect_paths(targets, renamer.config.get('scan') or {})
+    rows = inspect_files(paths, jobs=jobs)
+
+    renamer.load_data(years)
+    renamer.division_filter = None
+    if divisions is not None:
+        renamer.division_filter = {(y, d) for y in years for d in divisions}
+    return audit_files(rows, renamer)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="ActiGraph 파일 메타데이터 감사 (Excel 대상자 정보와 비교)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python audit.py -o audit.csv
+  python audit.py D:/site1 --year 2024-2025 --week 1주차-40주차
+        """
+    )
+    parser.add_argument('paths', nargs='*',
+                        help='파일 또는 디렉토리 (기본값: config.yaml의 paths.target_directory)')
+    parser.add_argument('--year', nargs='+',
+                        help='연도 (예: 2025, 2024-2025) (기본값: config.yaml의 defaults.year)')
+    parser.add_argument('--week', nargs='+',
+                        help='비교할 구분 (기본값: 전체, 예: "1주차-40주차")')
+    parser.add_argument('--output', '-o', default='audit.csv',
+                        help='불일치 보고서 CSV (기본값: audit.csv)')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help='헤더 읽기 워커 프로세스 수 (기본값: CPU 수)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='레지스트리 캐시를 사용하지 않고 Excel을 다시 읽음')
+    parser.add_argument('--config', default='config.yaml', help='설정 파일 경로 (기본값: config.yaml)')
+    args = parser.parse_args()
+
+    try:
+        renamer = ActiGraphRenamer(args.config)
+        if args.no_cache:
+            renamer.use_cache = False
+
+        targets = args.paths or renamer.config['paths']['target_directory']
+        if isinstance(targets, str):
+            targets = [targets]
+        years = expand_years(args.year) if args.year else [renamer.config['defaults']['year']]
+        divisions = expand_divisions(args.week) if args.week else None
+
+        started = time.perf_counter()
+        report, summary = run_audit(renamer, targets, years, divisions, jobs=args.jobs)
+        elapsed = time.perf_counter() - started
+
+        report.to_csv(args.output, index=False, encoding='utf-8-sig')
+        print_summary(summary, elapsed)
+        print(f"📝 보고서 저장: {args.output} ({len(report)}건)")
+    except FileNotFoundError as e:
+        print(f"❌ 오류: 파일을 찾을 수 없습니다: {e}")
+        sys.exit(1)
+
+    if len(report):
+        sys.exit(2)
+
+
+if __name__ == '__main__':
+    main()
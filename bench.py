@@ -0,0 +1,739 @@
+#!/usr/bin/env python3
+"""
+ActiGraph 파일 처리 벤치마크
+
+합성 .agd(SQLite settings/data 테이블)와 .gt3x(info.txt, log.bin, calibration.json)
+파일, 이와 매칭되는 레지스트리 Excel(관리번호-시리얼번호, 대상자 정보)을 생성한 뒤
+다음 작업의 파일별 지연 시간, 초당 파일 수, 최대 RSS 증가량, 기록 바이트를 JSON으로 출력합니다.
+  - agd: ActiGraphModifier.modify_agd_file
+  - gt3x: ActiGraphModifier.modify_gt3x_file
+  - validate: validate_agd_modification / validate_gt3x_modification
+  - run: ActiGraphRenamer.run (레지스트리 로드 + 메타데이터 수정 + 파일명 변경 전체)
+
+importtime 명령은 `python -X importtime`으로 CLI 시작 비용을 측정해 무거운 모듈
+(pandas, numpy, yaml, openpyxl)이 시작 시 import되거나 예산을 넘으면 실패(종료 코드 1)합니다.
+
+각 작업은 새 프로세스(spawn)에서 코퍼스 복사본으로 실행하므로 이전 작업의 파일 변경/캐시가
+결과에 영향을 주지 않습니다.
+최대 RSS 증가량은 준비(import, 코퍼스 복사)가 끝난 뒤 /proc/self/clear_refs로 최대 RSS를
+초기화하고 측정 구간의 VmHWM - 기준 VmRSS로 계산합니다 (Linux 전용, run --jobs의 병렬 워커 제외).
+기록 바이트는 /proc/self/io의 wchar(write 호출 바이트)로 측정합니다 (Linux 전용).
+
+사용 예시:
+    # 기본 (대상자 20명 = .agd 20개 + .gt3x 20개, 결과 JSON은 stdout)
+    conda run -n module python bench.py run
+
+    # 크기/개수 지정, 결과 저장 후 이전 결과와 비교
+    conda run -n module python bench.py run --count 100 --agd-rows 40320 --output bench.json --baseline old.json
+
+    # 코퍼스만 생성 (name.py --config <DIR>/config.yaml로 직접 실행 가능)
+    conda run -n module python bench.py generate /tmp/corpus --count 10
+
+    # 시작 시간 예산 확인 (커밋 전 회귀 확인용)
+    conda run -n module python bench.py importtime
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from agd_data import to_ticks
+from gt3x_log import PACKET_TYPES, build_packet
+from instrument import io_counters
+
+
+# 결과 형식 버전 (필드가 바뀌면 올림)
+BENCH_FORMAT_VERSION = 2
+
+# 벤치마크 작업
+BENCH_CASES = ["agd", "gt3x", "validate", "run"]
+
+# 시작 시 import되면 안 되는 무거운 모듈 (필요한 경로에서만 지연 import)
+STARTUP_FORBIDDEN_MODULES = ("pandas", "numpy", "yaml", "openpyxl")
+
+# import 시간 측정 대상: (이름, python 인자, 예산을 적용할 모듈 - None이면 금지 모듈만 확인)
+IMPORT_CHECKS = [
+    ("import name", ["-c", "import name"], "name"),
+    ("import modify", ["-c", "import modify"], "modify"),
+    ("name.py --help", ["name.py", "--help"], None),
+    ("modify.py --help", ["modify.py", "--help"], None),
+]
+
+# 모듈 import 예산 (ms, 인터프리터 시작 제외 누적 시간)
+DEFAULT_IMPORT_BUDGET_MS = 200.0
+
+# 합성 코퍼스 기본값
+DEFAULT_SUBJECT_COUNT = 20
+DEFAULT_AGD_ROWS = 10080          # 60초 epoch 7일
+DEFAULT_GT3X_SECONDS = 3600       # 1시간
+DEFAULT_SAMPLE_RATE = 30
+DEFAULT_YEAR = 2025
+AGD_EPOCH_SECONDS = 60
+GT3X_ACCELERATION_SCALE = 256.0
+
+# 코퍼스 구성 파일
+CORPUS_FILES_DIRECTORY = "files"
+CORPUS_DESCRIPTION = "corpus.json"
+SERIAL_WORKBOOK = "관리번호-시리얼번호.xlsx"
+SUBJECT_WORKBOOK = "대상자 키,체중,주손 정보.xlsx"
+
+# 대상자 정보 시트 컬럼 (실제 레지스트리와 같은 순서)
+SUBJECT_COLUMNS = ["구분", "관리번호", "ID", "이름", "성별", "나이", "키", "체중",
+                   "생년월일", "주손", "지급일", "착용 시작일"]
+
+# 합성 이름 음절
+SURNAMES = "김이박최정강조윤장임"
+GIVEN_SYLLABLES = "민서준지현우수영은하도연"
+
+# .agd settings 템플릿 (ActiLife 6.15 내보내기 기준, 대상자 정보는 수정 전 값)
+AGD_SETTINGS_TEMPLATE = [
+    ("softwarename", "ActiLife"), ("softwareversion", "6.15.0"),
+    ("osversion", "Microsoft Windows NT 10.0.19045.0"), ("machinename", "BENCH"),
+    ("datetimeformat", "yyyy-MM-dd"), ("decimal", "."), ("grouping", ","),
+    ("culturename", "한국어(대한민국)"), ("finished", "true"), ("devicename", "wGT3XBT"),
+    ("filter", "Normal"), ("deviceserial", None), ("deviceversion", "1.9.2"),
+    ("modenumber", "61"), ("epochlength", str(AGD_EPOCH_SECONDS)), ("startdatetime", None),
+    ("stopdatetime", None), ("downloaddatetime", None), ("batteryvoltage", "4.17"),
+    ("original sample rate", str(DEFAULT_SAMPLE_RATE)), ("proximityIntervalInSeconds", "60"),
+    ("subjectname", None), ("sex", "Undefined"), ("height", "0"), ("mass", "0"), ("age", "0"),
+    ("race", "Asian / Pacific Islander"), ("limb", "Waist"), ("side", "Left"),
+    ("dominance", "Dominant"), ("dateOfBirth", "0"), ("unexpectedResets", "0"),
+    ("epochcount", None), ("sleepscorealgorithmname", "Cole-Kripke"),
+    ("customsleepparameters", ""), ("notes", ""), ("agdversion", "2.0"),
+]
+
+
+# ============================================================================
+# 합성 코퍼스 생성
+# ============================================================================
+
+def generate_agd(path: Path, serial: str, start: datetime.datetime, rows: int,
+                 rng: np.random.Generator):
+    """합성 .agd 파일 생성 (settings + data 테이블, IX_dataTimestamp 인덱스)"""
+    start_ticks = to_ticks(start)
+    step_ticks = AGD_EPOCH_SECONDS * 10_000_000
+    stop_ticks = start_ticks + rows * step_ticks
+    values = {
+        "deviceserial": serial, "startdatetime": str(start_ticks),
+        "stopdatetime": str(stop_ticks), "downloaddatetime": str(stop_ticks),
+        "subjectname": serial, "epochcount": str(rows),
+    }
+
+    conn = sqlite3.connect(str(path))
+    try:
+        conn.execute("CREATE TABLE settings (settingID INTEGER PRIMARY KEY, "
+                     "settingName VARCHAR(64), settingValue VARCHAR(8192))")
+        conn.execute("CREATE TABLE data (dataTimestamp INTEGER, axis1 REAL, axis2 REAL, axis3 REAL, "
+                     "steps REAL, lux REAL, inclineOff REAL, inclineStanding REAL, "
+                     "inclineSitting REAL, inclineLying REAL)")
+        conn.executemany(
+            "INSERT INTO settings (settingName, settingValue) VALUES (?, ?)",
+            [(name, values.get(name, value)) for name, value in AGD_SETTINGS_TEMPLATE]
+        )
+
+        timestamps = start_ticks + np.arange(rows, dtype=np.int64) * step_ticks
+        counts = rng.gamma(0.6, 400.0, size=(rows, 3)).round()
+        steps = rng.poisson(8, size=rows).astype(float)
+        posture = np.zeros((rows, 4))
+        posture[np.arange(rows), rng.integers(0, 4, size=rows)] = AGD_EPOCH_SECONDS
+        conn.executemany(
+            "INSERT INTO data VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            ((int(t), *map(float, c), float(s), 0.0, *map(float, p))
+             for t, c, s, p in zip(timestamps, counts, steps, posture))
+        )
+        conn.execute("CREATE INDEX IX_dataTimestamp ON data (dataTimestamp)")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _activity2_packets(timestamps: np.ndarray, payloads: np.ndarray) -> bytes:
+    """ACTIVITY2 패킷 일괄 인코딩 (헤더/체크섬 벡터 연산)"""
+    count, size = payloads.shape
+    headers = np.zeros(count, dtype=[('separator', 'u1'), ('type', 'u1'),
+                                     ('timestamp', '<u4'), ('size', '<u2')])
+    headers['separator'] = 0x1E
+    headers['type'] = PACKET_TYPES["ACTIVITY2"]
+    headers['timestamp'] = timestamps
+    headers['size'] = size
+    header_bytes = headers.view(np.uint8).reshape(count, -1)
+
+    checksums = ~(np.bitwise_xor.reduce(header_bytes, axis=1) ^ np.bitwise_xor.reduce(payloads, axis=1))
+    return np.concatenate([header_bytes, payloads, checksums[:, None]], axis=1).tobytes()
+
+
+def generate_gt3x(path: Path, serial: str, start: datetime.datetime, seconds: int,
+                  sample_rate: int, rng: np.random.Generator):
+    """합성 .gt3x 파일 생성 (info.txt, log.bin, calibration.json)
+
+    log.bin은 Bio METADATA 패킷, 1분마다 BATTERY 패킷, 초당 ACTIVITY2 패킷으로
+    구성되며 ZIP 엔트리에 분 단위로 스트리밍 기록합니다.
+    """
+    start_ticks = to_ticks(start)
+    last_ticks = start_ticks + seconds * 10_000_000
+    start_timestamp = int((start - datetime.datetime(1970, 1, 1)).total_seconds())
+
+    info = "\n".join([
+        f"Serial Number: {serial}", "Device Type: wGT3XBT", "Firmware: 1.9.2",
+        "Battery Voltage: 4.17", f"Sample Rate: {sample_rate}", f"Start Date: {start_ticks}",
+        "Stop Date: 0", f"Last Sample Time: {last_ticks}", "TimeZone: 09:00:00",
+        f"Download Date: {last_ticks}", "Board Revision: 8", "Unexpected Resets: 0",
+        f"Acceleration Scale: {GT3X_ACCELERATION_SCALE}", "Acceleration Min: -8.0",
+        "Acceleration Max: 8.0", "Limb: Waist", "Side: Left", "Dominance: Dominant",
+        f"Subject Name: {serial}", "Race: Asian / Pacific Islander",
+    ]) + "\n"
+    bio = {
+        "MetadataType": "Bio", "SubjectName": serial, "Race": "Asian / Pacific Islander",
+        "Limb": "Waist", "Side": "Left", "Dominance": "Dominant", "Parsed": False, "JSON": None,
+    }
+
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        with zf.open('log.bin', 'w') as log:
+            log.write(build_packet(PACKET_TYPES["METADATA"], start_timestamp,
+                                   json.dumps(bio, separators=(',', ':')).encode('utf-8')))
+            for minute in range(0, seconds, 60):
+                count = min(60, seconds - minute)
+                log.write(build_packet(PACKET_TYPES["BATTERY"], start_timestamp + minute,
+                                       (4170).to_bytes(2, 'little')))
+
+                # 정지 상태 근처의 가속도 (z축 1g + 잡음)
+                samples = rng.normal(0.0, 0.05, size=(count, sample_rate, 3))
+                samples[:, :, 2] += 1.0
+                raw = np.round(samples * GT3X_ACCELERATION_SCALE).astype('<i2')
+                payloads = raw.reshape(count, -1).view(np.uint8)
+                timestamps = start_timestamp + minute + np.arange(count, dtype=np.uint32)
+                log.write(_activity2_packets(timestamps, payloads))
+
+        zf.writestr('info.txt', info)
+        zf.writestr('calibration.json', json.dumps({
+            "isCalibrated": True, "accelerationScale": GT3X_ACCELERATION_SCALE,
+            "sampleRate": sample_rate,
+        }))
+
+
+def _korean_name(rng: np.random.Generator) -> str:
+    return SURNAMES[rng.integers(len(SURNAMES))] + "".join(
+        GIVEN_SYLLABLES[i] for i in rng.integers(len(GIVEN_SYLLABLES), size=2))
+
+
+def generate_registry(directory: Path, subjects: List[Dict], year: int):
+    """레지스트리 Excel 생성 (실제 파일과 같은 구조)
+
+    - 관리번호-시리얼번호.xlsx: Sheet1 (관리번호, 고유번호)
+    - 대상자 정보: 연도 시트, 두 번째 행은 보조 헤더(관리번호 비어 있음),
+      구분 컬럼은 구분별로 병합된 셀 (첫 행에만 값)
+    """
+    import openpyxl
+
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "Sheet1"
+    sheet.append(["관리번호", "고유번호"])
+    for subject in subjects:
+        sheet.append([subject['management_number'], subject['serial']])
+    workbook.save(directory / SERIAL_WORKBOOK)
+
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = str(year)
+    sheet.append(SUBJECT_COLUMNS)
+    sheet.append([None] * len(SUBJECT_COLUMNS) + ["착용일수", "일지 유무", "보정유무"])
+
+    division_rows: Dict[str, List[int]] = {}
+    for subject in subjects:
+        metadata = subject['metadata']
+        wear_date = datetime.datetime.strptime(subject['wear_date'], '%Y-%m-%d')
+        first = subject['division'] not in division_rows
+        sheet.append([
+            subject['division'] if first else None, subject['management_number'],
+            subject['id'], metadata['subjectname'],
+            "남" if metadata['sex'] == "Male" else "여", metadata['age'],
+            metadata['height'], metadata['mass'],
+            datetime.datetime.fromisoformat(metadata['dateOfBirth']), metadata['hand'],
+            wear_date - datetime.timedelta(days=1), wear_date,
+        ])
+        division_rows.setdefault(subject['division'], []).append(sheet.max_row)
+
+    for rows in division_rows.values():
+        if len(rows) > 1:
+            sheet.merge_cells(start_row=rows[0], start_column=1, end_row=rows[-1], end_column=1)
+    workbook.save(directory / SUBJECT_WORKBOOK)
+
+
+def generate_corpus(directory, count: int = DEFAULT_SUBJECT_COUNT, agd_rows: int = DEFAULT_AGD_ROWS,
+                    gt3x_seconds: int = DEFAULT_GT3X_SECONDS, sample_rate: int = DEFAULT_SAMPLE_RATE,
+                    divisions: int = 1, year: int = DEFAULT_YEAR, seed: int = 0,
+                    base_config: Optional[Dict] = None) -> Dict:
+    """합성 코퍼스 생성
+
+    Args:
+        directory: 코퍼스 디렉토리 (files/, 레지스트리 Excel, config.yaml, corpus.json 생성)
+        count: 대상자 수 (대상자마다 .agd 1개, .gt3x 1개)
+        agd_rows: .agd data 테이블 행 수 (60초 epoch)
+        gt3x_seconds: .gt3x 기록 길이 (초)
+        sample_rate: .gt3x 샘플링 주파수 (Hz)
+        divisions: 구분 수 (1주차부터, 대상자를 나눠 배정)
+        year: 레지스트리 연도 (시트 이름)
+        seed: 난수 시드
+        base_config: 기본 config.yaml 설정 (paths만 코퍼스 경로로 바꿔 저장)
+
+    Returns:
+        dict: 코퍼스 설명 (corpus.json과 동일)
+    """
+    import yaml
+
+    directory = Path(directory)
+    files_directory = directory / CORPUS_FILES_DIRECTORY
+    files_directory.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+
+    subjects = []
+    first_monday = datetime.datetime(year, 1, 6)
+    for i in range(count):
+        division_number = i * divisions // count + 1
+        wear_date = first_monday + datetime.timedelta(weeks=division_number - 1, days=int(i % 3))
+        serial = f"MOS2B{50000000 + i:08d}"
+        metadata = {
+            'subjectname': _korean_name(rng),
+            'sex': "Male" if rng.random() < 0.5 else "Female",
+            'height': int(rng.integers(150, 190)),
+            'mass': int(rng.integers(45, 95)),
+            'age': int(rng.integers(20, 70)),
+            'dateOfBirth': datetime.datetime(int(rng.integers(1955, 2005)), int(rng.integers(1, 13)),
+                                             int(rng.integers(1, 29))).isoformat(),
+            'hand': "오" if rng.random() < 0.85 else "왼",
+            'limb': "Waist",
+        }
+        subject = {
+            'serial': serial,
+            'management_number': i + 1,
+            'id': f"DB5{1000000 + i:07d}",
+            'division': f"{division_number}주차",
+            'wear_date': wear_date.strftime('%Y-%m-%d'),
+            'metadata': metadata,
+            'files': [f"{serial} ({wear_date:%Y-%m-%d})60sec.agd", f"{serial} ({wear_date:%Y-%m-%d}).gt3x"],
+        }
+        generate_agd(files_directory / subject['files'][0], serial, wear_date, agd_rows, rng)
+        generate_gt3x(files_directory / subject['files'][1], serial, wear_date, gt3x_seconds, sample_rate, rng)
+        subjects.append(subject)
+
+    generate_registry(directory, subjects, year)
+
+    config = json.loads(json.dumps(base_config or {}))
+    config.setdefault('paths', {}).update({
+        'serial_mapping': str((directory / SERIAL_WORKBOOK).resolve()),
+        'subject_info': str((directory / SUBJECT_WORKBOOK).resolve()),
+        'target_directory': str(files_directory.resolve()),
+    })
+    config.setdefault('defaults', {})['year'] = year
+    config['cache'] = dict(config.get('cache') or {}, directory=str((directory / "cache").resolve()))
+    with open(directory / "config.yaml", 'w', encoding='utf-8') as f:
+        yaml.safe_dump(config, f, allow_unicode=True, sort_keys=False)
+
+    description = {
+        'count': count, 'agd_rows': agd_rows, 'gt3x_seconds': gt3x_seconds,
+        'sample_rate': sample_rate, 'divisions': divisions, 'year': year, 'seed': seed,
+        'subjects': subjects,
+    }
+    with open(directory / CORPUS_DESCRIPTION, 'w', encoding='utf-8') as f:
+        json.dump(description, f, ensure_ascii=False, indent=2)
+    return description
+
+
+# ============================================================================
+# 측정
+# ============================================================================
+
+def _rss_status() -> Optional[Dict[str, int]]:
+    """현재 프로세스의 RSS와 최대 RSS (/proc/self/status VmRSS/VmHWM, bytes, 없으면 None)"""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            fields = dict(line.split(':', 1) for line in f if ':' in line)
+        return {key: int(fields[key].split()[0]) * 1024 for key in ('VmRSS', 'VmHWM')}
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _reset_peak_rss() -> Optional[int]:
+    """최대 RSS(VmHWM)를 현재 RSS로 초기화하고 기준 RSS 반환 (Linux 전용, 실패 시 None)
+
+    import/코퍼스 복사 등 준비 단계의 최대 RSS가 측정 구간에 섞이지 않도록
+    측정 직전에 호출합니다.
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        return None
+    status = _rss_status()
+    return None if status is None else status['VmRSS']
+
+
+def _peak_rss_delta(baseline: Optional[int]) -> Optional[int]:
+    """_reset_peak_rss 이후 측정 구간의 최대 RSS 증가량 (bytes, 측정 불가면 None)"""
+    status = _rss_status()
+    if baseline is None or status is None:
+        return None
+    return max(0, status['VmHWM'] - baseline)
+
+
+def latency_summary(latencies: List[float]) -> Optional[Dict[str, float]]:
+    """지연 시간 요약 (초 단위 mean/p50/p95/max)"""
+    if not latencies:
+        return None
+    values = np.asarray(latencies)
+    return {
+        'mean': float(values.mean()),
+        'p50': float(np.percentile(values, 50)),
+        'p95': float(np.percentile(values, 95)),
+        'max': float(values.max()),
+    }
+
+
+def _subject_metadata(subject: Dict) -> Dict:
+    metadata = dict(subject['metadata'])
+    metadata['dateOfBirth'] = datetime.datetime.fromisoformat(metadata['dateOfBirth'])
+    return metadata
+
+
+def _run_case(case: str, corpus_directory: str, work_directory: str, jobs: int) -> Dict:
+    """벤치마크 작업 1개 실행 (spawn된 프로세스에서 호출)
+
+    코퍼스를 작업 디렉토리로 복사한 뒤(측정 제외) 작업을 실행하고 측정값을 반환합니다.
+    """
+    import yaml
+    from modify import ActiGraphModifier
+
+    # 병렬 워커(run --jobs)의 출력이 결과 JSON(stdout)에 섞이지 않도록 fd 수준에서 버림
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+    os.close(devnull)
+
+    corpus_directory = Path(corpus_directory)
+    files_directory = Path(work_directory) / CORPUS_FILES_DIRECTORY
+    shutil.copytree(corpus_directory / CORPUS_FILES_DIRECTORY, files_directory)
+    with open(corpus_directory / CORPUS_DESCRIPTION, 'r', encoding='utf-8') as f:
+        subjects = json.load(f)['subjects']
+    with open(corpus_directory / "config.yaml", 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    config['paths']['target_directory'] = str(files_directory)
+    config['cache'] = dict(config.get('cache') or {}, directory=str(Path(work_directory) / "cache"))
+    config['manifest'] = dict(config.get('manifest') or {}, path=str(Path(work_directory) / "manifest.sqlite"))
+
+    modifier = ActiGraphModifier(config=config)
+    tasks = []
+    for subject in subjects:
+        metadata = _subject_metadata(subject)
+        agd_path, gt3x_path = (str(files_directory / name) for name in subject['files'])
+        if case == "agd":
+            tasks.append((lambda p=agd_path, m=metadata: modifier.modify_agd_file(p, m)))
+        elif case == "gt3x":
+            tasks.append((lambda p=gt3x_path, m=metadata: modifier.modify_gt3x_file(p, m)))
+        elif case == "validate":
+            side, dominance = modifier.map_handedness(metadata['hand'])
+            expected = {key: metadata[key] for key in
+                        ('subjectname', 'sex', 'height', 'mass', 'age', 'dateOfBirth', 'limb')}
+            expected.update(side=side, dominance=dominance)
+            with contextlib.redirect_stdout(io.StringIO()):
+                modifier.modify_agd_file(agd_path, metadata)
+                modifier.modify_gt3x_file(gt3x_path, metadata)
+            tasks.append((lambda p=agd_path, e=expected: modifier.validate_agd_modification(p, e)))
+            tasks.append((lambda p=gt3x_path, e=expected: modifier.validate_gt3x_modification(p, e)))
+
+    latencies = []
+    errors = 0
+    rss_baseline = _reset_peak_rss()
+    counters_before = io_counters()
+    started = time.perf_counter()
+
+    # 출력은 메모리로 버림 (stdout write가 기록 바이트에 포함되지 않도록)
+    with contextlib.redirect_stdout(io.StringIO()):
+        if case == "run":
+            from name import ActiGraphRenamer
+
+            config_path = Path(work_directory) / "config.yaml"
+            with open(config_path, 'w', encoding='utf-8') as f:
+                yaml.safe_dump(config, f, allow_unicode=True)
+            renamer = ActiGraphRenamer(str(config_path))
+
+            # 순차 처리일 때만 파일별 지연 시간 측정 (병렬 워커로는 전달 불가)
+            if jobs == 1:
+                process_file = renamer._process_file
+
+                def timed_process_file(*args, **kwargs):
+                    file_started = time.perf_counter()
+                    outcome = process_file(*args, **kwargs)
+                    latencies.append(time.perf_counter() - file_started)
+                    return outcome
+                renamer._process_file = timed_process_file
+
+            renamer.run(division=None, year=config['defaults']['year'], jobs=jobs)
+            files = sum(1 for path in files_directory.iterdir() if '_' in path.name)
+            errors = len(subjects) * 2 - files
+        else:
+            for task in tasks:
+                file_started = time.perf_counter()
+                if not task():
+                    errors += 1
+                latencies.append(time.perf_counter() - file_started)
+            files = len(tasks)
+
+    elapsed = time.perf_counter() - started
+    counters_after = io_counters()
+    peak_rss_delta = _peak_rss_delta(rss_baseline)
+
+    return {
+        'case': case,
+        'files': files,
+        'errors': errors,
+        'seconds': elapsed,
+        'files_per_sec': files / elapsed if elapsed > 0 else None,
+        'latency': latency_summary(latencies),
+        'peak_rss_delta_bytes': peak_rss_delta,
+        'bytes_written': (counters_after[1] - counters_before[1]
+                          if counters_before is not None and counters_after is not None else None),
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).resolve().parent,
+            capture_output=True, text=True, check=True
+        ).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(corpus_directory, cases: List[str], jobs: int = 1) -> Dict:
+    """코퍼스로 벤치마크 작업 실행
+
+    Args:
+        corpus_directory: generate_corpus로 만든 디렉토리
+        cases: 실행할 작업 (BENCH_CASES 중)
+        jobs: run 작업의 병렬 워커 수
+
+    Returns:
+        dict: 실행 환경과 작업별 측정값
+    """
+    corpus_directory = Path(corpus_directory)
+    with open(corpus_directory / CORPUS_DESCRIPTION, 'r', encoding='utf-8') as f:
+        description = json.load(f)
+
+    results = []
+    context = multiprocessing.get_context('spawn')
+    for case in cases:
+        print(f"⏱️  {case} 측정 중...", file=sys.stderr)
+        with tempfile.TemporaryDirectory(prefix=f"bench-{case}-") as work_directory:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                result = executor.submit(_run_case, case, str(corpus_directory),
+                                         work_directory, jobs).result()
+        results.append(result)
+        failed = f", 실패 {result['errors']}개" if result['errors'] else ""
+        print(f"  ✓ {case}: {result['files']}개, {result['files_per_sec']:.1f} files/s{failed}",
+              file=sys.stderr)
+
+    return {
+        'version': BENCH_FORMAT_VERSION,
+        'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'jobs': jobs,
+        'corpus': {key: value for key, value in description.items() if key != 'subjects'},
+        'results': results,
+    }
+
+
+def compare_results(current: Dict, baseline: Dict):
+    """이전 결과와 비교 출력 (files/s, p95 지연 시간 변화율)"""
+    previous = {result['case']: result for result in baseline.get('results', [])}
+    print(f"\n📊 기준 결과와 비교 ({baseline.get('revision') or '?'} → {current.get('revision') or '?'})",
+          file=sys.stderr)
+    for result in current['results']:
+        before = previous.get(result['case'])
+        if before is None or not before.get('files_per_sec') or not result.get('files_per_sec'):
+            print(f"  {result['case']}: 비교 대상 없음", file=sys.stderr)
+            continue
+        change = (result['files_per_sec'] / before['files_per_sec'] - 1) * 100
+        line = f"  {result['case']}: files/s {change:+.1f}%"
+        if result.get('latency') and before.get('latency'):
+            p95_change = (result['latency']['p95'] / before['latency']['p95'] - 1) * 100
+            line += f", p95 {p95_change:+.1f}%"
+        print(f"{'⚠️ ' if change < -10 else '✓'} {line}", file=sys.stderr)
+
+
+# ============================================================================
+# 시작 시간 (import) 예산
+# ============================================================================
+
+def measure_imports(arguments: List[str], repeat: int = 5) -> Dict:
+    """`python -X importtime`으로 import 측정 (repeat회 중 모듈별 최소 누적 시간)
+
+    Args:
+        arguments: python 인자 (예: ["-c", "import name"])
+        repeat: 반복 횟수 (디스크 캐시/잡음 영향을 줄이기 위해 최소값 사용)
+
+    Returns:
+        dict: {'cumulative_us': {모듈: 최소 누적 시간(us)}, 'wall_seconds': 최소 실행 시간}
+    """
+    cumulative: Dict[str, int] = {}
+    wall_seconds = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", *arguments],
+            cwd=Path(__file__).resolve().parent, capture_output=True, text=True
+        )
+        elapsed = time.perf_counter() - started
+        wall_seconds = elapsed if wall_seconds is None else min(wall_seconds, elapsed)
+
+        for line in completed.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative_us, module = line.split("|", 2)
+            module = module.strip()
+            value = int(cumulative_us)
+            cumulative[module] = min(cumulative.get(module, value), value)
+
+    return {'cumulative_us': cumulative, 'wall_seconds': wall_seconds}
+
+
+def check_import_budget(budget_ms: float = DEFAULT_IMPORT_BUDGET_MS, repeat: int = 5) -> bool:
+    """CLI 시작 비용 확인 (금지 모듈 import 여부와 모듈 import 예산)
+
+    Returns:
+        bool: 모든 항목이 통과하면 True
+    """
+    passed = True
+    for label, arguments, module in IMPORT_CHECKS:
+        measured = measure_imports(arguments, repeat)
+        imported = measured['cumulative_us']
+        forbidden = [name for name in STARTUP_FORBIDDEN_MODULES if name in imported]
+
+        problems = []
+        if forbidden:
+            problems.append(f"무거운 모듈 import: {', '.join(forbidden)}")
+        detail = f"실행 {measured['wall_seconds'] * 1000:.0f}ms"
+        if module is not None:
+            module_ms = imported.get(module, 0) / 1000
+            detail = f"{module} {module_ms:.1f}ms / 예산 {budget_ms:.0f}ms, {detail}"
+            if module_ms > budget_ms:
+                problems.append(f"예산 초과 ({module_ms:.1f}ms > {budget_ms:.0f}ms)")
+
+        if problems:
+            passed = False
+            print(f"❌ {label}: {'; '.join(problems)} ({detail})")
+        else:
+            print(f"✅ {label}: {detail}")
+    return passed
+
+
+def _load_base_config(path: str) -> Dict:
+    """코퍼스 config.yaml의 기반 설정 (columns/metadata 매핑 등) 읽기, 없으면 종료"""
+    import yaml
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f) or {}
+    except FileNotFoundError:
+        print(f"❌ 오류: 설정 파일을 찾을 수 없습니다: {path}", file=sys.stderr)
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="ActiGraph 파일 처리 벤치마크",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def add_corpus_arguments(subparser):
+        subparser.add_argument('--count', type=int, default=DEFAULT_SUBJECT_COUNT,
+                               help=f'대상자 수 (기본값: {DEFAULT_SUBJECT_COUNT}, 대상자마다 .agd/.gt3x 1개씩)')
+        subparser.add_argument('--agd-rows', type=int, default=DEFAULT_AGD_ROWS,
+                               help=f'.agd data 행 수 (기본값: {DEFAULT_AGD_ROWS}, 60초 epoch)')
+        subparser.add_argument('--gt3x-seconds', type=int, default=DEFAULT_GT3X_SECONDS,
+                               help=f'.gt3x 기록 길이 (초, 기본값: {DEFAULT_GT3X_SECONDS})')
+        subparser.add_argument('--sample-rate', type=int, default=DEFAULT_SAMPLE_RATE,
+                               help=f'.gt3x 샘플링 주파수 (기본값: {DEFAULT_SAMPLE_RATE})')
+        subparser.add_argument('--divisions', type=int, default=1,
+                               help='구분 수 (기본값: 1)')
+        subparser.add_argument('--seed', type=int, default=0, help='난수 시드 (기본값: 0)')
+        subparser.add_argument('--config', default='config.yaml',
+                               help='기본 설정 파일 (기본값: config.yaml)')
+
+    generate_parser = subparsers.add_parser('generate', help='합성 코퍼스만 생성')
+    generate_parser.add_argument('directory', help='코퍼스 디렉토리')
+    add_corpus_arguments(generate_parser)
+
+    run_parser = subparsers.add_parser('run', help='벤치마크 실행 (JSON 결과 출력)')
+    add_corpus_arguments(run_parser)
+    run_parser.add_argument('--corpus', help='기존 코퍼스 디렉토리 사용 (지정하지 않으면 임시 생성)')
+    run_parser.add_argument('--cases', nargs='+', choices=BENCH_CASES, default=BENCH_CASES,
+                            help='실행할 작업 (기본값: 전체)')
+    run_parser.add_argument('--jobs', '-j', type=int, default=1,
+                            help='run 작업의 병렬 워커 수 (기본값: 1)')
+    run_parser.add_argument('--output', '-o', help='결과 JSON 저장 경로 (기본값: stdout)')
+    run_parser.add_argument('--baseline', help='비교할 이전 결과 JSON')
+
+    importtime_parser = subparsers.add_parser('importtime', help='CLI 시작 시간(import) 예산 확인')
+    importtime_parser.add_argument('--budget-ms', type=float, default=DEFAULT_IMPORT_BUDGET_MS,
+                                   help=f'모듈 import 예산 (ms, 기본값: {DEFAULT_IMPORT_BUDGET_MS:.0f})')
+    importtime_parser.add_argument('--repeat', type=int, default=5,
+                                   help='반복 측정 횟수 (최소값 사용, 기본값: 5)')
+
+    args = parser.parse_args()
+    if args.command == 'importtime':
+        sys.exit(0 if check_import_budget(args.budget_ms, max(1, args.repeat)) else 1)
+
+    corpus_options = dict(count=args.count, agd_rows=args.agd_rows, gt3x_seconds=args.gt3x_seconds,
+                          sample_rate=args.sample_rate, divisions=args.divisions, seed=args.seed,
+                          base_config=_load_base_config(args.config))
+
+    if args.command == 'generate':
+        generate_corpus(args.directory, **corpus_options)
+        print(f"✅ 코퍼스 생성 완료: {args.directory} ({args.count * 2}개 파일)")
+        return
+
+    with contextlib.ExitStack() as stack:
+        corpus = args.corpus
+        if corpus is None:
+            corpus = stack.enter_context(tempfile.TemporaryDirectory(prefix="bench-corpus-"))
+            print(f"📦 코퍼스 생성 중... ({args.count * 2}개 파일)", file=sys.stderr)
+            generate_corpus(corpus, **corpus_options)
+
+        result = run_benchmarks(corpus, args.cases, jobs=max(1, args.jobs))
+
+    encoded = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(encoded + "\n")
+        print(f"✅ 결과 저장: {args.output}", file=sys.stderr)
+    else:
+        print(encoded)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            compare_results(result, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,564 @@
+#!/usr/bin/env python3
+"""
+두 .agd/.gt3x 파일 비교 (메타데이터 외 변경 여부 확인)
+
+수정 전/후 파일을 비교해 달라진 영역을 구간 단위로 보고합니다.
+파일 전체를 메모리에 올리지 않고 페이지/행/패킷/버퍼 단위로 스트리밍 비교합니다.
+
+.agd (SQLite):
+  - settings: 필드별 비교 (AGD_FIELDS 필드는 메타데이터)
+  - 페이지: 두 파일을 page_size 단위로 나란히 읽어 다른 페이지 구간과
+    소유 테이블/인덱스(dbstat) 보고 (파일 헤더만 다른 1번 페이지는 메타데이터로 취급)
+  - 테이블: settings 외 모든 테이블을 rowid 순 청크로 비교해 다른 rowid 구간 보고
+  - 스키마: sqlite_master의 테이블/인덱스 정의 비교
+.gt3x (ZIP):
+  - 엔트리: 중앙 디렉토리의 CRC32/크기가 같으면 압축 해제 없이 동일로 판단
+  - info.txt: 필드별 비교 (GT3X_FIELDS 필드는 메타데이터)
+  - log.bin: 패킷 단위 비교 (Bio METADATA 패킷은 JSON 키별, 나머지는 패킷 구간)
+  - 그 밖의 엔트리: 압축 해제 스트림을 버퍼 단위로 비교해 다른 바이트 구간 보고
+
+사용 예시:
+    # 수정 전/후 비교 (메타데이터 외 변경이 있으면 종료 코드 2)
+    python filediff.py "original.agd" "modified.agd"
+    python filediff.py before.gt3x after.gt3x --json diff.json
+
+    # 프로그래밍 방식 사용
+    from filediff import diff_files, only_metadata
+    differences = diff_files(before, after)
+    assert only_metadata(differences)
+"""
+
+import argparse
+import json
+import sqlite3
+import struct
+import sys
+import zipfile
+from itertools import zip_longest
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from gt3x_log import (CHECKSUM_SIZE, METADATA_TYPE, PACKET_HEADER, PACKET_SEPARATOR, PACKET_TYPES,
+                      parse_bio_metadata)
+from modify import AGD_FIELDS, GT3X_BIO_FIELDS, GT3X_FIELDS, parse_info_txt
+
+
+# 값이 한쪽에만 있을 때 표시
+MISSING = "<없음>"
+
+# 파일/엔트리 스트림 비교 버퍼 크기
+COMPARE_BUFFER_SIZE = 1024 * 1024
+
+# 바이트 구간 보고 단위 (버퍼가 다르면 이 크기 블록별로 첫/마지막 다른 바이트를 찾음)
+COMPARE_BLOCK_SIZE = 4096
+
+# 테이블 비교 시 한 번에 읽을 행 수
+DEFAULT_CHUNK_ROWS = 4096
+
+# SQLite 파일 헤더 (1번 페이지 앞부분, 쓰기마다 변경 카운터가 바뀜)
+SQLITE_HEADER_SIZE = 100
+SQLITE_PAGE_SIZE = struct.Struct('>H')
+SQLITE_PAGE_SIZE_OFFSET = 16
+
+# 메타데이터로 취급하는 필드/테이블
+AGD_METADATA_SETTINGS = frozenset(AGD_FIELDS.values())
+AGD_METADATA_TABLES = frozenset({"settings"})
+GT3X_METADATA_FIELDS = frozenset(GT3X_FIELDS.values())
+GT3X_BIO_METADATA_KEYS = frozenset(GT3X_BIO_FIELDS.values())
+
+PACKET_NAMES = {value: name for name, value in PACKET_TYPES.items()}
+
+
+class Difference(NamedTuple):
+    """비교 결과 한 건"""
+    region: str       # setting, schema, page, table, entry, info, bio, packet
+    location: str     # 필드명, 페이지/rowid/패킷/바이트 구간
+    a: str            # 첫 번째 파일 쪽 값 (없으면 MISSING)
+    b: str            # 두 번째 파일 쪽 값
+    metadata: bool    # 대상자 메타데이터 변경이면 True
+
+
+class _Ranges:
+    """연속된 번호를 (시작, 끝) 구간으로 모음 (같은 label끼리만 이어 붙임)"""
+
+    def __init__(self):
+        self.ranges: List[List] = []
+
+    def add(self, number: int, label=None, count: int = 1):
+        last = self.ranges[-1] if self.ranges else None
+        if last is not None and last[1] + 1 == number and last[2] == label:
+            last[1] = number + count - 1
+        else:
+            self.ranges.append([number, number + count - 1, label])
+
+    def __iter__(self) -> Iterator[Tuple[int, int, object]]:
+        return (tuple(item) for item in self.ranges)
+
+
+def _span(first: int, last: int) -> str:
+    return str(first) if first == last else f"{first}-{last}"
+
+
+def _dict_differences(region: str, values_a: Dict[str, str], values_b: Dict[str, str],
+                      metadata_keys: frozenset, prefix: str = "") -> List[Difference]:
+    """필드별 비교 (settings, info.txt, Bio METADATA)"""
+    differences = []
+    for key in sorted(set(values_a) | set(values_b)):
+        value_a, value_b = values_a.get(key, MISSING), values_b.get(key, MISSING)
+        if value_a != value_b:
+            differences.append(Difference(region, f"{prefix}{key}", str(value_a), str(value_b),
+                                          key in metadata_keys))
+    return differences
+
+
+# ============================================================================
+# .agd (SQLite)
+# ============================================================================
+
+def _connect(path) -> sqlite3.Connection:
+    """읽기 전용 연결 (immutable - 잠금/저널 확인 없음)"""
+    return sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro&immutable=1", uri=True)
+
+
+def read_page_size(path) -> int:
+    """SQLite 헤더의 페이지 크기 (1은 65536)"""
+    with open(path, 'rb') as f:
+        header = f.read(SQLITE_HEADER_SIZE)
+    if len(header) < SQLITE_HEADER_SIZE or not header.startswith(b"SQLite format 3\0"):
+        raise ValueError(f"Not a SQLite database: {path}")
+    page_size = SQLITE_PAGE_SIZE.unpack_from(header, SQLITE_PAGE_SIZE_OFFSET)[0]
+    return 65536 if page_size == 1 else page_size
+
+
+def diff_pages(path_a, path_b, page_size: int) -> Tuple[List[int], bool]:
+    """두 파일을 page_size 단위로 나란히 읽어 다른 페이지 번호 (1부터)
+
+    Returns:
+        (다른 페이지 번호 목록, 1번 페이지에서 파일 헤더 외 영역도 다른지)
+    """
+    pages_per_buffer = max(1, COMPARE_BUFFER_SIZE // page_size)
+    buffer_size = pages_per_buffer * page_size
+    differing = []
+    first_page_body_differs = False
+
+    with open(path_a, 'rb') as fa, open(path_b, 'rb') as fb:
+        page = 1
+        while True:
+            chunk_a, chunk_b = fa.read(buffer_size), fb.read(buffer_size)
+            if not chunk_a and not chunk_b:
+                break
+            if chunk_a != chunk_b:
+                for start in range(0, max(len(chunk_a), len(chunk_b)), page_size):
+                    end = start + page_size
+                    if chunk_a[start:end] != chunk_b[start:end]:
+                        differing.append(page + start // page_size)
+                if page == 1:
+                    first_page_body_differs = (chunk_a[SQLITE_HEADER_SIZE:page_size]
+                                               != chunk_b[SQLITE_HEADER_SIZE:page_size])
+            page += pages_per_buffer
+    return differing, first_page_body_differs
+
+
+def page_owners(conn: sqlite3.Connection, pages) -> Optional[Dict[int, str]]:
+    """페이지 번호 → 소유 테이블/인덱스 (dbstat, 사용할 수 없으면 None)
+
+    어느 테이블/인덱스에도 속하지 않는 페이지(freelist)는 결과에 없습니다.
+    """
+    pages = set(pages)
+    if not pages:
+        return {}
+    try:
+        return {pageno: name for name, pageno in conn.execute("SELECT name, pageno FROM dbstat")
+                if pageno in pages}
+    except sqlite3.Error:
+        return None
+
+
+def _schema(conn: sqlite3.Connection) -> Dict[Tuple[str, str], Tuple[Optional[str], int]]:
+    """(type, name) → (sql, rootpage)"""
+    return {(kind, name): (sql, rootpage) for kind, name, sql, rootpage in conn.execute(
+        "SELECT type, name, sql, rootpage FROM sqlite_master WHERE type IN ('table', 'index')")}
+
+
+def diff_rows(cursor_a: sqlite3.Cursor, cursor_b: sqlite3.Cursor,
+              chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Tuple[_Ranges, _Ranges, _Ranges]:
+    """rowid 순으로 정렬된 두 커서를 청크 단위로 병합 비교
+
+    청크가 통째로 같으면 행 단위 비교를 건너뛰고, 다르면 rowid로 병합해
+    값이 바뀐 행/한쪽에만 있는 행을 찾습니다. 병합 후 남은 행 수만큼만 다시 읽어
+    두 커서의 청크 경계를 다시 맞춥니다.
+
+    Returns:
+        (변경된 rowid 구간, A에만 있는 구간, B에만 있는 구간)
+    """
+    changed, only_a, only_b = _Ranges(), _Ranges(), _Ranges()
+    rows_a, rows_b = cursor_a.fetchmany(chunk_rows), cursor_b.fetchmany(chunk_rows)
+
+    while rows_a or rows_b:
+        if rows_a == rows_b:
+            rows_a, rows_b = cursor_a.fetchmany(chunk_rows), cursor_b.fetchmany(chunk_rows)
+            continue
+        if not rows_b:
+            for row in rows_a:
+                only_a.add(row[0])
+            rows_a = cursor_a.fetchmany(chunk_rows)
+            continue
+        if not rows_a:
+            for row in rows_b:
+                only_b.add(row[0])
+            rows_b = cursor_b.fetchmany(chunk_rows)
+            continue
+
+        i = j = 0
+        while i < len(rows_a) and j < len(rows_b):
+            row_a, row_b = rows_a[i], rows_b[j]
+            if row_a[0] == row_b[0]:
+                if row_a != row_b:
+                    changed.add(row_a[0])
+                i += 1
+                j += 1
+            elif row_a[0] < row_b[0]:
+                only_a.add(row_a[0])
+                i += 1
+            else:
+                only_b.add(row_b[0])
+                j += 1
+
+        rows_a, rows_b = rows_a[i:], rows_b[j:]
+        if not rows_a:
+            rows_a = cursor_a.fetchmany(len(rows_b) or chunk_rows)
+        if not rows_b:
+            rows_b = cursor_b.fetchmany(len(rows_a) or chunk_rows)
+
+    return changed, only_a, only_b
+
+
+def diff_agd(path_a, path_b, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> List[Difference]:
+    """두 .agd 파일 비교 (settings, 스키마, 페이지, 테이블 행)
+
+    페이지 비교 결과 루트 페이지가 같고 소유 페이지가 모두 같은 테이블은
+    B-tree가 바이트 단위로 같으므로 행 비교를 건너뜁니다 (dbstat을 쓸 수 있을 때).
+    """
+    differences = []
+    conn_a, conn_b = _connect(path_a), _connect(path_b)
+    try:
+        # settings (필드별)
+        settings = []
+        for conn in (conn_a, conn_b):
+            settings.append({
+                name: '' if value is None else str(value)
+                for name, value in conn.execute("SELECT settingName, settingValue FROM settings")
+            })
+        differences += _dict_differences('setting', settings[0], settings[1], AGD_METADATA_SETTINGS)
+
+        # 스키마 (테이블/인덱스 정의)
+        schema_a, schema_b = _schema(conn_a), _schema(conn_b)
+        for kind, name in sorted(set(schema_a) | set(schema_b)):
+            sql_a = schema_a.get((kind, name), (MISSING,))[0]
+            sql_b = schema_b.get((kind, name), (MISSING,))[0]
+            if sql_a != sql_b:
+                differences.append(Difference('schema', f"{kind} {name}", str(sql_a), str(sql_b), False))
+
+        # 페이지 (물리적 위치, 소유 테이블/인덱스)
+        page_differences = []
+        changed_owners = None
+        page_size_a, page_size_b = read_page_size(path_a), read_page_size(path_b)
+        if page_size_a != page_size_b:
+            page_differences.append(Difference('page', "page_size", str(page_size_a), str(page_size_b), False))
+        else:
+            pages, first_page_body_differs = diff_pages(path_a, path_b, page_size_a)
+            owners_a, owners_b = page_owners(conn_a, pages), page_owners(conn_b, pages)
+            if owners_a is not None and owners_b is not None:
+                changed_owners = set(owners_a.values()) | set(owners_b.values())
+
+            ranges = _Ranges()
+            for page in pages:
+                if page == 1 and not first_page_body_differs:
+                    label = ("파일 헤더", "파일 헤더")
+                else:
+                    label = ((owners_a or {}).get(page, MISSING), (owners_b or {}).get(page, MISSING))
+                ranges.add(page, label)
+            for first, last, (owner_a, owner_b) in ranges:
+                metadata = all(owner in AGD_METADATA_TABLES or owner == "파일 헤더"
+                               for owner in (owner_a, owner_b))
+                page_differences.append(Difference('page', f"page {_span(first, last)}",
+                                                   owner_a, owner_b, metadata))
+
+        # 테이블 행 (settings 외, 양쪽에 있는 테이블)
+        tables = sorted(name for kind, name in set(schema_a) & set(schema_b)
+                        if kind == 'table' and name not in AGD_METADATA_TABLES
+                        and not name.startswith('sqlite_'))
+        for table in tables:
+            if (changed_owners is not None and table not in changed_owners
+                    and schema_a[('table', table)][1] == schema_b[('table', table)][1]):
+                continue
+
+            query = f'SELECT rowid, * FROM "{table}" ORDER BY rowid'
+            changed, only_a, only_b = diff_rows(conn_a.execute(query), conn_b.execute(query), chunk_rows)
+            for first, last, _ in changed:
+                count = f"{last - first + 1}행"
+                differences.append(Difference('table', f"{table} rowid {_span(first, last)}",
+                                              count, count, False))
+            for first, last, _ in only_a:
+                differences.append(Difference('table', f"{table} rowid {_span(first, last)}",
+                                              f"{last - first + 1}행", MISSING, False))
+            for first, last, _ in only_b:
+                differences.append(Difference('table', f"{table} rowid {_span(first, last)}",
+                                              MISSING, f"{last - first + 1}행", False))
+
+        differences += page_differences
+    finally:
+        conn_a.close()
+        conn_b.close()
+
+    return differences
+
+
+# ============================================================================
+# .gt3x (ZIP)
+# ============================================================================
+
+def _read_full(stream: BinaryIO, size: int) -> bytes:
+    """size 바이트가 찰 때까지 읽기 (스트림 끝이면 더 짧을 수 있음)"""
+    chunks, remaining = [], size
+    while remaining > 0:
+        chunk = stream.read(remaining)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b''.join(chunks)
+
+
+def _block_span(block_a: bytes, block_b: bytes) -> Tuple[int, int]:
+    """두 블록에서 처음/마지막으로 다른 바이트 위치"""
+    length = max(len(block_a), len(block_b))
+    first = next(i for i in range(length) if block_a[i:i + 1] != block_b[i:i + 1])
+    last = next(i for i in range(length - 1, -1, -1) if block_a[i:i + 1] != block_b[i:i + 1])
+    return first, last
+
+
+def diff_streams(stream_a: BinaryIO, stream_b: BinaryIO) -> List[Tuple[int, int]]:
+    """두 스트림을 버퍼 단위로 비교해 다른 바이트 구간 [(시작, 끝)] (끝 포함)"""
+    ranges = _Ranges()
+    offset = 0
+    while True:
+        chunk_a = _read_full(stream_a, COMPARE_BUFFER_SIZE)
+        chunk_b = _read_full(stream_b, COMPARE_BUFFER_SIZE)
+        if not chunk_a and not chunk_b:
+            break
+        if chunk_a != chunk_b:
+            for start in range(0, max(len(chunk_a), len(chunk_b)), COMPARE_BLOCK_SIZE):
+                block_a = chunk_a[start:start + COMPARE_BLOCK_SIZE]
+                block_b = chunk_b[start:start + COMPARE_BLOCK_SIZE]
+                if block_a != block_b:
+                    first, last = _block_span(block_a, block_b)
+                    ranges.add(offset + start + first, count=last - first + 1)
+        offset += max(len(chunk_a), len(chunk_b))
+    return [(first, last) for first, last, _ in ranges]
+
+
+def _iter_packets(stream: BinaryIO) -> Iterator[Tuple[int, int, bytes]]:
+    """스트림을 버퍼 단위로 읽어 패킷 순회 (type, timestamp, 패킷 전체 바이트)"""
+    unpack_from = PACKET_HEADER.unpack_from
+    header_size = PACKET_HEADER.size
+    pending = b''
+    base = 0
+    while True:
+        chunk = stream.read(COMPARE_BUFFER_SIZE)
+        buffer = pending + chunk if pending else chunk
+        position, end = 0, len(buffer)
+        while position + header_size <= end:
+            separator, packet_type, timestamp, size = unpack_from(buffer, position)
+            if separator != PACKET_SEPARATOR:
+                raise ValueError(f"Invalid packet separator 0x{separator:02X} at offset {base + position}")
+            next_position = position + header_size + size + CHECKSUM_SIZE
+            if next_position > end:
+                break
+            yield packet_type, timestamp, buffer[position:next_position]
+            position = next_position
+
+        pending = buffer[position:]
+        base += position
+        if not chunk:
+            if pending:
+                raise EOFError(f"Truncated packet at offset {base}")
+            return
+
+
+def _packet_label(packet) -> str:
+    if packet is None:
+        return MISSING
+    return PACKET_NAMES.get(packet[0], f"0x{packet[0]:02X}")
+
+
+def diff_log(stream_a: BinaryIO, stream_b: BinaryIO) -> List[Difference]:
+    """log.bin 패킷 단위 비교 (같은 순번의 패킷끼리)
+
+    Bio METADATA 패킷은 JSON 키별로, 나머지는 패킷 종류가 같은 연속 구간으로 보고합니다.
+    """
+    differences = []
+    ranges = _Ranges()
+    for index, (packet_a, packet_b) in enumerate(zip_longest(_iter_packets(stream_a), _iter_packets(stream_b))):
+        if packet_a == packet_b:
+            continue
+        if (packet_a is not None and packet_b is not None
+                and packet_a[0] == packet_b[0] == METADATA_TYPE and packet_a[1] == packet_b[1]):
+            bio_a = parse_bio_metadata(packet_a[2][PACKET_HEADER.size:-CHECKSUM_SIZE])
+            bio_b = parse_bio_metadata(packet_b[2][PACKET_HEADER.size:-CHECKSUM_SIZE])
+            if bio_a is not None and bio_b is not None:
+                differences += _dict_differences('bio', bio_a, bio_b, GT3X_BIO_METADATA_KEYS,
+                                                 prefix=f"log.bin #{index} ")
+                continue
+        ranges.add(index, (_packet_label(packet_a), _packet_label(packet_b)))
+
+    for first, last, (label_a, label_b) in ranges:
+        count = last - first + 1
+        differences.append(Difference(
+            'packet', f"log.bin #{_span(first, last)}",
+            label_a if label_a == MISSING else f"{label_a} {count}개",
+            label_b if label_b == MISSING else f"{label_b} {count}개",
+            False))
+    return differences
+
+
+def diff_gt3x(path_a, path_b) -> List[Difference]:
+    """두 .gt3x 파일 비교 (중앙 디렉토리 CRC가 같은 엔트리는 압축 해제하지 않음)"""
+    differences = []
+    with zipfile.ZipFile(path_a, 'r') as zf_a, zipfile.ZipFile(path_b, 'r') as zf_b:
+        entries_a = {info.filename: info for info in zf_a.infolist()}
+        entries_b = {info.filename: info for info in zf_b.infolist()}
+
+        for name in sorted(set(entries_a) | set(entries_b)):
+            info_a, info_b = entries_a.get(name), entries_b.get(name)
+            if info_a is None or info_b is None:
+                differences.append(Difference(
+                    'entry', name,
+                    MISSING if info_a is None else f"{info_a.file_size}B",
+                    MISSING if info_b is None else f"{info_b.file_size}B",
+                    False))
+                continue
+            if info_a.CRC == info_b.CRC and info_a.file_size == info_b.file_size:
+                continue
+
+            found = []
+            if name == 'info.txt':
+                info_txt = [parse_info_txt(zf.read(name).decode('utf-8')) for zf in (zf_a, zf_b)]
+                found = _dict_differences('info', info_txt[0], info_txt[1], GT3X_METADATA_FIELDS)
+            else:
+                with zf_a.open(name) as stream_a, zf_b.open(name) as stream_b:
+                    if name == 'log.bin':
+                        found = diff_log(stream_a, stream_b)
+                    else:
+                        found = [Difference('entry', f"{name} bytes {_span(first, last)}",
+                                            f"{info_a.file_size}B", f"{info_b.file_size}B", False)
+                                 for first, last in diff_streams(stream_a, stream_b)]
+
+            # 필드는 같고 바이트만 다른 경우 (info.txt 줄바꿈 등)
+            if not found:
+                found = [Difference('entry', name, f"CRC {info_a.CRC:08X}", f"CRC {info_b.CRC:08X}",
+                                    name == 'info.txt')]
+            differences += found
+
+    return differences
+
+
+# ============================================================================
+# 공통
+# ============================================================================
+
+def diff_files(path_a, path_b, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> List[Difference]:
+    """두 파일 비교 (같은 확장자의 .agd 또는 .gt3x)
+
+    Args:
+        path_a: 첫 번째 파일 (예: 수정 전)
+        path_b: 두 번째 파일 (예: 수정 후)
+        chunk_rows: .agd 테이블 비교 시 한 번에 읽을 행 수
+
+    Returns:
+        list: Difference 목록 (같으면 빈 목록)
+    """
+    suffix_a, suffix_b = Path(path_a).suffix.lower(), Path(path_b).suffix.lower()
+    if suffix_a != suffix_b:
+        raise ValueError(f"File types differ: {suffix_a} vs {suffix_b}")
+    for path in (path_a, path_b):
+        if not Path(path).is_file():
+            raise FileNotFoundError(path)
+
+    if suffix_a == '.agd':
+        return diff_agd(path_a, path_b, chunk_rows=chunk_rows)
+    if suffix_a == '.gt3x':
+        return diff_gt3x(path_a, path_b)
+    raise ValueError(f"Unsupported file type: {suffix_a}")
+
+
+def only_metadata(differences: List[Difference]) -> bool:
+    """모든 차이가 대상자 메타데이터 변경인지 (차이가 없으면 True)"""
+    return all(difference.metadata for difference in differences)
+
+
+def print_differences(differences: List[Difference], limit: Optional[int] = None):
+    """비교 결과 출력 (메타데이터 변경은 📝, 그 외는 ❌)"""
+    shown = differences if limit is None else differences[:limit]
+    for difference in shown:
+        marker = "📝" if difference.metadata else "❌"
+        print(f"  {marker} {difference.region:<8} {difference.location}: "
+              f"'{difference.a}' → '{difference.b}'")
+    if len(shown) < len(differences):
+        print(f"  ... 외 {len(differences) - len(shown)}건")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="두 .agd/.gt3x 파일 비교 (메타데이터 외 변경 여부 확인)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python filediff.py "Archive/original.agd" "Archive/modified.agd"
+  python filediff.py before.gt3x after.gt3x --json diff.json
+
+종료 코드: 0 = 차이 없음 또는 메타데이터만 변경, 1 = 오류, 2 = 메타데이터 외 변경 있음
+        """
+    )
+    parser.add_argument('file_a', help='첫 번째 파일 (예: 수정 전)')
+    parser.add_argument('file_b', help='두 번째 파일 (예: 수정 후)')
+    parser.add_argument('--json', dest='json_path', help='비교 결과를 JSON으로 저장')
+    parser.add_argument('--limit', type=int, default=50, help='출력할 최대 차이 수 (기본값: 50, 0이면 전체)')
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS,
+                        help=f'.agd 테이블 비교 청크 행 수 (기본값: {DEFAULT_CHUNK_ROWS})')
+    args = parser.parse_args()
+
+    try:
+        differences = diff_files(args.file_a, args.file_b, chunk_rows=args.chunk_rows)
+    except FileNotFoundError as e:
+        print(f"❌ 오류: 파일을 찾을 수 없습니다: {e}")
+        sys.exit(1)
+    except (ValueError, EOFError, sqlite3.Error, zipfile.BadZipFile) as e:
+        print(f"❌ 오류: {e}")
+        sys.exit(1)
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump([difference._asdict() for difference in differences], f, ensure_ascii=False, indent=2)
+
+    print(f"📄 A: {args.file_a}")
+    print(f"📄 B: {args.file_b}")
+    metadata_count = sum(difference.metadata for difference in differences)
+    other_count = len(differences) - metadata_count
+    if not differences:
+        print("✅ 두 파일의 내용이 같습니다.")
+        return
+
+    print(f"📊 차이 {len(differences)}건 (메타데이터 {metadata_count}건, 그 외 {other_count}건)")
+    print_differences(differences, limit=args.limit or None)
+    if args.json_path:
+        print(f"📝 결과 저장: {args.json_path}")
+
+    if other_count:
+        print(f"❌ 메타데이터 외 변경 {other_count}건")
+        sys.exit(2)
+    print("✅ 메타데이터 외 변경 없음")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,554 @@
+#!/usr/bin/env python3
+"""
+.gt3x (ZIP) 아카이브 저수준 처리 모듈
+
+변경하지 않는 엔트리(log.bin, calibration.json 등)는 압축된 바이트를
+그대로 복사하고, 교체할 엔트리(info.txt)만 다시 인코딩합니다.
+압축 해제/재압축 없이 CRC, 압축 방식, 순서, 타임스탬프가 유지됩니다.
+
+추가(in-place) 모드에서는 새 엔트리를 아카이브 끝에 덧붙이고 중앙 디렉토리만
+다시 기록합니다. 이전 엔트리는 고아(orphan) 데이터로 남으며 compact_archive로
+정리합니다.
+
+사용 예시:
+    from gt3x_archive import replace_entries, append_entries, compact_archive
+    replace_entries(path, {'info.txt': new_info_bytes})   # 전체 재작성 (raw copy)
+    append_entries(path, {'info.txt': new_info_bytes})    # 끝에 추가 (in-place)
+    compact_archive(path)                                 # 고아 엔트리 제거
+"""
+
+import os
+import shutil
+import struct
+import tempfile
+import zipfile
+import zlib
+from typing import BinaryIO, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+
+# ============================================================================
+# ZIP 구조 상수 (PKWARE APPNOTE)
+# ============================================================================
+
+# 로컬 파일 헤더
+LOCAL_HEADER = struct.Struct('<4s2B4HL2L2H')
+LOCAL_HEADER_SIGNATURE = b'PK\x03\x04'
+
+# 중앙 디렉토리 엔트리
+CENTRAL_DIR = struct.Struct('<4s4B4HL2L5H2L')
+CENTRAL_DIR_SIGNATURE = b'PK\x01\x02'
+
+# 중앙 디렉토리 끝 레코드 (EOCD)
+END_RECORD = struct.Struct('<4s4H2LH')
+END_RECORD_SIGNATURE = b'PK\x05\x06'
+
+# ZIP64 EOCD 레코드 / 로케이터
+END_RECORD64 = struct.Struct('<4sQ2H2L4Q')
+END_RECORD64_SIGNATURE = b'PK\x06\x06'
+END_LOCATOR64 = struct.Struct('<4sLQL')
+END_LOCATOR64_SIGNATURE = b'PK\x06\x07'
+
+DATA_DESCRIPTOR_SIGNATURE = b'PK\x07\x08'
+
+ZIP64_EXTRA_ID = 0x0001
+ZIP64_LIMIT = 0xFFFFFFFF
+ZIP64_COUNT_LIMIT = 0xFFFF
+
+FLAG_DATA_DESCRIPTOR = 0x08
+FLAG_UTF8 = 0x800
+
+# 기록 직후 검증 함수 (같은 핸들로 연 ZipFile을 받아 True/False 반환)
+Verifier = Callable[[zipfile.ZipFile], bool]
+
+# 스트리밍 교체 함수 (원본 엔트리의 압축 해제 스트림을 받아 새 내용을 청크로 반환)
+Transform = Callable[[BinaryIO], Iterable[bytes]]
+
+# 교체 내용: 새 바이트 또는 스트리밍 교체 함수
+Replacement = Union[bytes, Transform]
+
+# 스트리밍 복사 버퍼 크기
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# 스트리밍 기록 시 크기가 이 여유 안에서 ZIP64 경계에 가까우면 ZIP64 extra 자리 확보
+ZIP64_RESERVE_MARGIN = 64 * 1024 * 1024
+
+
+def _encode_filename(info: zipfile.ZipInfo) -> Tuple[bytes, int]:
+    """파일명 인코딩 (로컬 헤더와 같은 바이트가 되도록 원본 플래그 기준)"""
+    if info.flag_bits & FLAG_UTF8:
+        return info.filename.encode('utf-8'), info.flag_bits
+    try:
+        return info.filename.encode('cp437'), info.flag_bits
+    except UnicodeEncodeError:
+        return info.filename.encode('utf-8'), info.flag_bits | FLAG_UTF8
+
+
+def _strip_zip64_extra(extra: bytes) -> bytes:
+    """extra 필드에서 ZIP64 블록 제거 (다시 계산하여 기록)"""
+    result = b''
+    i = 0
+    while i + 4 <= len(extra):
+        header_id, size = struct.unpack('<2H', extra[i:i + 4])
+        if header_id != ZIP64_EXTRA_ID:
+            result += extra[i:i + 4 + size]
+        i += 4 + size
+    return result
+
+
+def _dos_datetime(date_time: Tuple[int, ...]) -> Tuple[int, int]:
+    """(년, 월, 일, 시, 분, 초) → DOS (date, time)"""
+    year, month, day, hour, minute, second = date_time[:6]
+    dos_date = (year - 1980) << 9 | month << 5 | day
+    dos_time = hour << 11 | minute << 5 | (second // 2)
+    return dos_date, dos_time
+
+
+def copy_range(src: BinaryIO, dst: BinaryIO, offset: int, length: int):
+    """src의 [offset, offset+length) 구간을 dst 현재 위치로 스트리밍 복사"""
+    src.seek(offset)
+    remaining = length
+    while remaining > 0:
+        chunk = src.read(min(COPY_BUFFER_SIZE, remaining))
+        if not chunk:
+            raise EOFError("Unexpected end of archive while copying entry data")
+        dst.write(chunk)
+        remaining -= len(chunk)
+
+
+def local_entry_span(fp: BinaryIO, info: zipfile.ZipInfo) -> int:
+    """로컬 헤더부터 데이터(및 data descriptor) 끝까지의 바이트 길이
+
+    Args:
+        fp: 원본 아카이브 파일 객체
+        info: 중앙 디렉토리의 ZipInfo
+
+    Returns:
+        int: info.header_offset부터 복사해야 할 바이트 수
+    """
+    fp.seek(info.header_offset)
+    header = fp.read(LOCAL_HEADER.size)
+    if len(header) != LOCAL_HEADER.size or header[:4] != LOCAL_HEADER_SIGNATURE:
+        raise zipfile.BadZipFile(f"Bad local file header: {info.filename}")
+
+    fields = LOCAL_HEADER.unpack(header)
+    name_length, extra_length = fields[10], fields[11]
+    span = LOCAL_HEADER.size + name_length + extra_length + info.compress_size
+
+    if info.flag_bits & FLAG_DATA_DESCRIPTOR:
+        fp.seek(info.header_offset + span)
+        signature = fp.read(4)
+        if signature == DATA_DESCRIPTOR_SIGNATURE:
+            span += 4
+        zip64 = info.file_size >= ZIP64_LIMIT or info.compress_size >= ZIP64_LIMIT
+        span += 4 + (16 if zip64 else 8)
+
+    return span
+
+
+def encode_entry(info: zipfile.ZipInfo, data: bytes) -> Tuple[zipfile.ZipInfo, bytes]:
+    """새 내용으로 엔트리 인코딩 (로컬 헤더 + 압축 데이터)
+
+    원본 엔트리의 압축 방식, 타임스탬프, 속성을 그대로 사용합니다.
+
+    Args:
+        info: 원본 엔트리 ZipInfo
+        data: 새 엔트리 내용 (압축 전)
+
+    Returns:
+        (새 ZipInfo, 기록할 바이트) 튜플 - header_offset은 호출자가 설정
+    """
+    compressor = _compressor(info)
+    compressed = compressor.compress(data) + compressor.flush() if compressor else data
+
+    new_info = _new_entry_info(info)
+    new_info.CRC = zlib.crc32(data)
+    new_info.compress_size = len(compressed)
+    new_info.file_size = len(data)
+
+    filename, new_info.flag_bits = _encode_filename(new_info)
+    dos_date, dos_time = _dos_datetime(new_info.date_time)
+    header = LOCAL_HEADER.pack(
+        LOCAL_HEADER_SIGNATURE, new_info.extract_version, 0,
+        new_info.flag_bits, new_info.compress_type, dos_time, dos_date,
+        new_info.CRC, new_info.compress_size, new_info.file_size,
+        len(filename), len(new_info.extra)
+    )
+    return new_info, header + filename + new_info.extra + compressed
+
+
+def _compressor(info: zipfile.ZipInfo):
+    """원본 압축 방식의 압축기 (STORED이면 None)"""
+    if info.compress_type == zipfile.ZIP_DEFLATED:
+        return zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    if info.compress_type == zipfile.ZIP_STORED:
+        return None
+    raise NotImplementedError(f"Unsupported compression method: {info.compress_type}")
+
+
+def _new_entry_info(info: zipfile.ZipInfo) -> zipfile.ZipInfo:
+    """원본 엔트리의 이름, 압축 방식, 타임스탬프, 속성을 가진 새 ZipInfo"""
+    new_info = zipfile.ZipInfo(info.filename, info.date_time)
+    new_info.compress_type = info.compress_type
+    new_info.create_system = info.create_system
+    new_info.create_version = info.create_version
+    new_info.extract_version = info.extract_version
+    new_info.external_attr = info.external_attr
+    new_info.internal_attr = info.internal_attr
+    new_info.comment = info.comment
+    new_info.extra = _strip_zip64_extra(info.extra)
+    new_info.flag_bits = info.flag_bits & ~FLAG_DATA_DESCRIPTOR
+    return new_info
+
+
+def stream_entry(fp: BinaryIO, info: zipfile.ZipInfo, chunks: Iterable[bytes]) -> zipfile.ZipInfo:
+    """새 내용을 청크 단위로 압축하며 현재 위치에 엔트리 기록
+
+    로컬 헤더를 먼저 쓰고 데이터를 기록한 뒤, 되돌아가 CRC와 크기를 채웁니다.
+    메모리 사용량은 청크 크기로 제한되므로 수 GB 엔트리(log.bin)에도 사용할 수 있습니다.
+
+    Args:
+        fp: 대상 파일 객체 (seek 가능, 기록할 위치)
+        info: 원본 엔트리 ZipInfo (압축 방식, 타임스탬프, 속성 유지)
+        chunks: 새 엔트리 내용 (압축 전) 청크
+
+    Returns:
+        zipfile.ZipInfo: 기록한 엔트리 (header_offset 설정됨)
+    """
+    new_info = _new_entry_info(info)
+    new_info.header_offset = fp.tell()
+
+    # 원본이 ZIP64 경계 근처이면 로컬 헤더에 ZIP64 크기 자리 확보
+    zip64 = max(info.file_size, info.compress_size) >= ZIP64_LIMIT - ZIP64_RESERVE_MARGIN
+    extra = new_info.extra
+    if zip64:
+        extra = struct.pack('<2H2Q', ZIP64_EXTRA_ID, 16, 0, 0) + extra
+        new_info.extract_version = max(new_info.extract_version, 45)
+
+    filename, new_info.flag_bits = _encode_filename(new_info)
+    dos_date, dos_time = _dos_datetime(new_info.date_time)
+    fp.write(LOCAL_HEADER.pack(
+        LOCAL_HEADER_SIGNATURE, new_info.extract_version, 0,
+        new_info.flag_bits, new_info.compress_type, dos_time, dos_date,
+        0, 0, 0, len(filename), len(extra)
+    ))
+    fp.write(filename)
+    fp.write(extra)
+
+    compressor = _compressor(info)
+    crc = file_size = compress_size = 0
+    for chunk in chunks:
+        crc = zlib.crc32(chunk, crc)
+        file_size += len(chunk)
+        if compressor:
+            chunk = compressor.compress(chunk)
+        fp.write(chunk)
+        compress_size += len(chunk)
+    if compressor:
+        chunk = compressor.flush()
+        fp.write(chunk)
+        compress_size += len(chunk)
+
+    if not zip64 and max(file_size, compress_size) >= ZIP64_LIMIT:
+        raise zipfile.LargeZipFile(f"Entry grew past the ZIP64 limit: {info.filename}")
+
+    # CRC/크기 채우기 (로컬 헤더의 CRC 필드는 시작 위치 + 14)
+    end = fp.tell()
+    fp.seek(new_info.header_offset + 14)
+    if zip64:
+        fp.write(struct.pack('<3L', crc, ZIP64_LIMIT, ZIP64_LIMIT))
+        fp.seek(new_info.header_offset + LOCAL_HEADER.size + len(filename) + 4)
+        fp.write(struct.pack('<2Q', file_size, compress_size))
+    else:
+        fp.write(struct.pack('<3L', crc, compress_size, file_size))
+    fp.seek(end)
+
+    new_info.CRC = crc
+    new_info.file_size = file_size
+    new_info.compress_size = compress_size
+    return new_info
+
+
+def _write_replacement(zf: zipfile.ZipFile, fp: BinaryIO, info: zipfile.ZipInfo,
+                       replacement: Replacement) -> zipfile.ZipInfo:
+    """교체 내용(바이트 또는 스트리밍 교체 함수)으로 현재 위치에 엔트리 기록"""
+    if isinstance(replacement, (bytes, bytearray)):
+        offset = fp.tell()
+        new_info, payload = encode_entry(info, bytes(replacement))
+        fp.write(payload)
+        new_info.header_offset = offset
+        return new_info
+
+    with zf.open(info) as stream:
+        return stream_entry(fp, info, replacement(stream))
+
+
+def write_central_directory(fp: BinaryIO, entries: List[zipfile.ZipInfo], comment: bytes = b''):
+    """현재 위치에 중앙 디렉토리와 EOCD 기록
+
+    Args:
+        fp: 대상 파일 객체 (중앙 디렉토리를 쓸 위치)
+        entries: header_offset이 새 위치로 설정된 ZipInfo 리스트
+        comment: 아카이브 주석
+    """
+    start = fp.tell()
+
+    for info in entries:
+        zip64_fields = []
+        file_size, compress_size, header_offset = info.file_size, info.compress_size, info.header_offset
+        if file_size >= ZIP64_LIMIT:
+            zip64_fields.append(file_size)
+            file_size = ZIP64_LIMIT
+        if compress_size >= ZIP64_LIMIT:
+            zip64_fields.append(compress_size)
+            compress_size = ZIP64_LIMIT
+        if header_offset >= ZIP64_LIMIT:
+            zip64_fields.append(header_offset)
+            header_offset = ZIP64_LIMIT
+
+        extra = _strip_zip64_extra(info.extra)
+        extract_version = info.extract_version
+        if zip64_fields:
+            extra = struct.pack(f'<2H{len(zip64_fields)}Q', ZIP64_EXTRA_ID, 8 * len(zip64_fields),
+                                *zip64_fields) + extra
+            extract_version = max(extract_version, 45)
+
+        filename, flag_bits = _encode_filename(info)
+        dos_date, dos_time = _dos_datetime(info.date_time)
+        fp.write(CENTRAL_DIR.pack(
+            CENTRAL_DIR_SIGNATURE, info.create_version, info.create_system,
+            extract_version, info.reserved, flag_bits, info.compress_type,
+            dos_time, dos_date, info.CRC, compress_size, file_size,
+            len(filename), len(extra), len(info.comment),
+            0, info.internal_attr, info.external_attr, header_offset
+        ))
+        fp.write(filename)
+        fp.write(extra)
+        fp.write(info.comment)
+
+    end = fp.tell()
+    count, size, offset = len(entries), end - start, start
+
+    if count >= ZIP64_COUNT_LIMIT or size >= ZIP64_LIMIT or offset >= ZIP64_LIMIT:
+        fp.write(END_RECORD64.pack(
+            END_RECORD64_SIGNATURE, END_RECORD64.size - 12, 45, 45, 0, 0,
+            count, count, size, offset
+        ))
+        fp.write(END_LOCATOR64.pack(END_LOCATOR64_SIGNATURE, 0, end, 1))
+        count = min(count, ZIP64_COUNT_LIMIT)
+        size = min(size, ZIP64_LIMIT)
+        offset = min(offset, ZIP64_LIMIT)
+
+    fp.write(END_RECORD.pack(END_RECORD_SIGNATURE, 0, 0, count, count, size, offset, len(comment)))
+    fp.write(comment)
+
+
+def read_end_record(fp: BinaryIO) -> Tuple[int, int]:
+    """EOCD(및 ZIP64 EOCD)에서 중앙 디렉토리 위치 조회
+
+    Args:
+        fp: 아카이브 파일 객체
+
+    Returns:
+        (중앙 디렉토리 시작 오프셋, 중앙 디렉토리 크기) 튜플
+    """
+    fp.seek(0, os.SEEK_END)
+    file_size = fp.tell()
+
+    # EOCD는 파일 끝에서 최대 (22 + 65535) 바이트 안에 있음
+    search_size = min(file_size, END_RECORD.size + 0xFFFF)
+    fp.seek(file_size - search_size)
+    tail = fp.read(search_size)
+    position = tail.rfind(END_RECORD_SIGNATURE)
+    if position < 0 or position + END_RECORD.size > len(tail):
+        raise zipfile.BadZipFile("End of central directory record not found")
+
+    fields = END_RECORD.unpack(tail[position:position + END_RECORD.size])
+    cd_size, cd_offset = fields[5], fields[6]
+
+    # ZIP64 로케이터가 바로 앞에 있으면 ZIP64 EOCD 값 사용
+    locator_start = position - END_LOCATOR64.size
+    if locator_start >= 0 and tail[locator_start:locator_start + 4] == END_LOCATOR64_SIGNATURE:
+        _, _, record64_offset, _ = END_LOCATOR64.unpack(tail[locator_start:position])
+        fp.seek(record64_offset)
+        record64 = END_RECORD64.unpack(fp.read(END_RECORD64.size))
+        if record64[0] == END_RECORD64_SIGNATURE:
+            cd_size, cd_offset = record64[8], record64[9]
+
+    return cd_offset, cd_size
+
+
+def archive_slack(path: str) -> int:
+    """중앙 디렉토리가 참조하지 않는 고아 데이터 바이트 수
+
+    in-place 추가로 대체된 이전 엔트리와 이전 중앙 디렉토리 크기의 합입니다.
+
+    Args:
+        path: .gt3x 파일 경로
+
+    Returns:
+        int: 압축(compact)으로 회수 가능한 바이트 수
+    """
+    with zipfile.ZipFile(path, 'r') as zf:
+        infos = zf.infolist()
+
+    with open(path, 'rb') as fp:
+        cd_offset, _ = read_end_record(fp)
+        referenced = sum(local_entry_span(fp, info) for info in infos)
+
+    return max(0, cd_offset - referenced)
+
+
+def rewrite_archive(src_path: str, dst_path: str, replacements: Dict[str, Replacement],
+                    verify: Optional[Verifier] = None) -> bool:
+    """엔트리 일부만 교체하여 새 아카이브 작성
+
+    교체 대상이 아닌 엔트리는 압축된 바이트를 그대로 복사합니다
+    (압축 해제 없음, 메모리 사용량은 COPY_BUFFER_SIZE로 제한).
+    교체 내용이 함수이면 원본 엔트리를 스트리밍으로 읽어 변환한 청크를 기록합니다.
+
+    Args:
+        src_path: 원본 .gt3x 경로
+        dst_path: 새 아카이브를 쓸 경로
+        replacements: {엔트리 이름: 새 내용 또는 스트리밍 교체 함수}
+        verify: 기록 직후 같은 핸들로 새 아카이브를 검증할 함수 (선택)
+
+    Returns:
+        bool: 검증 통과 여부 (verify가 없으면 항상 True)
+    """
+    entries = []
+    with zipfile.ZipFile(src_path, 'r') as zf, open(src_path, 'rb') as src, open(dst_path, 'w+b') as dst:
+        infos = zf.infolist()
+        comment = zf.comment
+
+        missing = set(replacements) - {info.filename for info in infos}
+        if missing:
+            raise FileNotFoundError(f"{', '.join(sorted(missing))} not found in archive")
+
+        for info in infos:
+            if info.filename in replacements:
+                new_info = _write_replacement(zf, dst, info, replacements[info.filename])
+            else:
+                new_info = info
+                offset = dst.tell()
+                copy_range(src, dst, info.header_offset, local_entry_span(src, info))
+                new_info.header_offset = offset
+            entries.append(new_info)
+
+        write_central_directory(dst, entries, comment)
+        dst.flush()
+
+        if verify is not None and not _verify_handle(dst, verify):
+            return False
+
+        os.fsync(dst.fileno())
+    return True
+
+
+def _verify_handle(fp: BinaryIO, verify: Verifier) -> bool:
+    """기록한 핸들을 다시 열지 않고 ZipFile로 읽어 검증"""
+    with zipfile.ZipFile(fp, 'r') as zf:
+        return bool(verify(zf))
+
+
+def replace_entries(path: str, replacements: Dict[str, Replacement],
+                    verify: Optional[Verifier] = None) -> bool:
+    """같은 디렉토리의 임시 파일에 새 아카이브를 작성한 뒤 원본을 교체
+
+    verify가 주어지면 임시 파일을 쓴 핸들로 교체 전에 검증하고,
+    실패하면 임시 파일을 지우고 원본을 그대로 둡니다.
+
+    Args:
+        path: .gt3x 파일 경로
+        replacements: {엔트리 이름: 새 내용 또는 스트리밍 교체 함수}
+        verify: 교체 전 새 아카이브 검증 함수 (선택)
+
+    Returns:
+        bool: True이면 교체 완료, False이면 검증 실패 (원본 유지)
+    """
+    directory, filename = os.path.split(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=f".{filename}.", suffix=".tmp", dir=directory)
+    os.close(fd)
+    try:
+        if not rewrite_archive(path, temp_path, replacements, verify):
+            os.remove(temp_path)
+            return False
+        shutil.copymode(path, temp_path)
+        os.replace(temp_path, path)
+        return True
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def append_entries(path: str, replacements: Dict[str, Replacement],
+                   verify: Optional[Verifier] = None) -> bool:
+    """새 엔트리를 아카이브 끝에 추가하고 중앙 디렉토리만 다시 기록 (in-place)
+
+    기존 바이트는 수정하지 않으므로 비용은 교체할 엔트리 크기에 비례합니다.
+    새 중앙 디렉토리는 기존 EOCD 뒤에 기록되므로, 기록 도중 중단되어도
+    기존 EOCD가 파일 끝 근처에 남아 이전 상태로 읽을 수 있습니다.
+    기록 중 오류가 나면 추가한 바이트를 잘라내어 원본 크기로 되돌립니다.
+    대체된 이전 엔트리는 고아 데이터로 남으며 compact_archive로 제거합니다.
+    verify가 실패해도 추가한 바이트를 잘라내어 원본으로 되돌립니다.
+
+    Args:
+        path: .gt3x 파일 경로
+        replacements: {엔트리 이름: 새 내용 또는 스트리밍 교체 함수}
+        verify: 기록 직후 같은 핸들로 검증할 함수 (선택)
+
+    Returns:
+        bool: True이면 추가 완료, False이면 검증 실패 (원본 유지)
+    """
+    with zipfile.ZipFile(path, 'r') as zf, open(path, 'r+b') as fp:
+        infos = zf.infolist()
+        comment = zf.comment
+
+        missing = set(replacements) - {info.filename for info in infos}
+        if missing:
+            raise FileNotFoundError(f"{', '.join(sorted(missing))} not found in archive")
+
+        original_size = fp.seek(0, os.SEEK_END)
+
+        try:
+            entries = []
+            for info in infos:
+                if info.filename in replacements:
+                    fp.seek(0, os.SEEK_END)
+                    entries.append(_write_replacement(zf, fp, info, replacements[info.filename]))
+                else:
+                    entries.append(info)
+
+            write_central_directory(fp, entries, comment)
+            fp.flush()
+
+            if verify is not None and not _verify_handle(fp, verify):
+                fp.truncate(original_size)
+                return False
+
+            os.fsync(fp.fileno())
+            return True
+        except BaseException:
+            # 추가한 바이트만 잘라내면 원본 상태로 복원됨
+            fp.truncate(original_size)
+            raise
+
+
+def compact_archive(path: str) -> int:
+    """고아 엔트리를 제거하여 아카이브 재작성
+
+    참조되는 엔트리만 raw copy로 임시 파일에 옮긴 뒤 원본을 교체합니다.
+
+    Args:
+        path: .gt3x 파일 경로
+
+    Returns:
+        int: 회수한 바이트 수 (고아 데이터가 없으면 0, 파일 변경 없음)
+    """
+    slack = archive_slack(path)
+    if slack == 0:
+        return 0
+
+    size_before = os.path.getsize(path)
+    replace_entries(path, {})
+    return size_before - os.path.getsize(path)
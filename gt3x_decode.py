@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+.gt3x 원시 가속도 디코더 (NumPy 벡터 연산)
+
+log.bin의 ACTIVITY(0x00, 12-bit 패킹, Y/X/Z 순서)와 ACTIVITY2(0x1A, int16 LE,
+X/Y/Z 순서) 패킷을 샘플 단위 Python 루프 없이 디코딩하여 (샘플 수, 3) float32
+배열(단위 g)로 반환합니다. 출력 경로를 지정하면 np.memmap에 기록하므로
+100Hz 1주일(약 1.8억 샘플) 파일도 메모리에 올리지 않고 처리할 수 있습니다.
+
+  1. gt3x_index.PacketIndex로 패킷 위치를 구함 (사이드카 재사용 가능)
+  2. log.bin을 버퍼 단위로 읽으며 같은 크기의 패킷을 묶어 한 번에 디코딩
+  3. 스케일 적용: info.txt "Acceleration Scale" → calibration.json → 기본값
+  4. idle sleep(빈 패킷 또는 누락된 초)은 직전 샘플로 채움 (gap_fill 옵션)
+
+사용 예시:
+    from gt3x_decode import decode_gt3x
+    result = decode_gt3x(path)                       # 메모리 배열
+    result = decode_gt3x(path, out_path="acc.f32")   # 디스크 memmap
+    result['acceleration']  # (N, 3) float32, X/Y/Z
+"""
+
+import json
+import zipfile
+from typing import Dict, Optional
+
+import numpy as np
+
+from gt3x_index import PacketIndex
+from gt3x_log import CHECKSUM_SIZE, PACKET_HEADER, PACKET_TYPES
+
+
+ACTIVITY_TYPE = PACKET_TYPES["ACTIVITY"]
+ACTIVITY2_TYPE = PACKET_TYPES["ACTIVITY2"]
+
+# 샘플당 바이트 (ACTIVITY: 12-bit x 3축 = 4.5바이트, ACTIVITY2: int16 x 3축)
+ACTIVITY_BITS_PER_SAMPLE = 36
+ACTIVITY2_BYTES_PER_SAMPLE = 6
+
+# 스케일 기본값 (info.txt/calibration.json에 없을 때, 시리얼 접두어 기준)
+DEFAULT_ACCELERATION_SCALE = 341.0
+SERIAL_PREFIX_SCALES = {
+    "MOS": 256.0,
+}
+
+# calibration.json에서 스케일을 찾을 키
+CALIBRATION_SCALE_KEYS = ("accelerationScale", "AccelerationScale", "scale")
+
+# idle sleep 채우기 방식
+GAP_FILL_MODES = ("last", "zero", "nan")
+
+# 디코딩 시 log.bin 읽기 버퍼 크기
+DECODE_BUFFER_SIZE = 16 * 1024 * 1024
+
+# 누락 구간 채우기 블록 크기 (초)
+GAP_FILL_BLOCK_SECONDS = 86400
+
+
+def parse_info_txt(content: str) -> Dict[str, str]:
+    """info.txt 파싱 (Key: Value)"""
+    info = {}
+    for line in content.splitlines():
+        if ':' in line:
+            key, value = line.split(':', 1)
+            info[key.strip()] = value.strip()
+    return info
+
+
+def acceleration_scale(info: Dict[str, str], calibration: Optional[Dict] = None) -> float:
+    """가속도 스케일 (raw 값 / 스케일 = g)
+
+    info.txt의 "Acceleration Scale" → calibration.json의 스케일 키 → 시리얼 접두어 기본값 순
+    """
+    try:
+        return float(info["Acceleration Scale"])
+    except (KeyError, ValueError):
+        pass
+
+    for key in CALIBRATION_SCALE_KEYS:
+        try:
+            return float((calibration or {})[key])
+        except (KeyError, TypeError, ValueError):
+            continue
+
+    serial = info.get("Serial Number", "")
+    for prefix, scale in SERIAL_PREFIX_SCALES.items():
+        if serial.startswith(prefix):
+            return scale
+    return DEFAULT_ACCELERATION_SCALE
+
+
+def unpack_activity(payloads: np.ndarray, samples: int) -> np.ndarray:
+    """ACTIVITY 12-bit 패킹 payload 디코딩 (벡터 연산)
+
+    3바이트마다 12-bit 값 2개 (big-endian 비트 순서), 2의 보수 부호.
+
+    Args:
+        payloads: (패킷 수, payload 바이트) uint8 배열
+        samples: 패킷당 샘플 수
+
+    Returns:
+        np.ndarray: (패킷 수, samples, 3) int16 배열 (X/Y/Z 순서)
+    """
+    values_needed = samples * 3
+    packets, width = payloads.shape
+    padded_width = -(-width // 3) * 3
+    if padded_width != width:
+        payloads = np.concatenate(
+            [payloads, np.zeros((packets, padded_width - width), dtype=np.uint8)], axis=1)
+
+    triples = payloads.reshape(packets, -1, 3).astype(np.uint16)
+    values = np.empty((packets, triples.shape[1] * 2), dtype=np.int16)
+    values[:, 0::2] = (triples[:, :, 0] << 4) | (triples[:, :, 1] >> 4)
+    values[:, 1::2] = ((triples[:, :, 1] & 0x0F) << 8) | triples[:, :, 2]
+    values = values[:, :values_needed]
+    values[values > 2047] -= 4096
+
+    # 저장 순서 Y, X, Z → X, Y, Z
+    return values.reshape(packets, samples, 3)[:, :, [1, 0, 2]]
+
+
+def unpack_activity2(payloads: np.ndarray, samples: int) -> np.ndarray:
+    """ACTIVITY2 int16 LE payload 디코딩 (X/Y/Z 순서)
+
+    Returns:
+        np.ndarray: (패킷 수, samples, 3) int16 배열
+    """
+    packets = payloads.shape[0]
+    values = np.ascontiguousarray(payloads[:, :samples * ACTIVITY2_BYTES_PER_SAMPLE]).view('<i2')
+    return values.reshape(packets, samples, 3)
+
+
+def _packet_samples(packet_type: int, size: int) -> int:
+    """payload 크기로 샘플 수 계산 (idle sleep 패킷은 0)"""
+    if packet_type == ACTIVITY2_TYPE:
+        return size // ACTIVITY2_BYTES_PER_SAMPLE
+    if size <= 1:
+        return 0
+    return size * 8 // ACTIVITY_BITS_PER_SAMPLE
+
+
+def _unpack(packet_type: int, payloads: np.ndarray, samples: int) -> np.ndarray:
+    if packet_type == ACTIVITY2_TYPE:
+        return unpack_activity2(payloads, samples)
+    return unpack_activity(payloads, samples)
+
+
+def decode_gt3x(path: str, out_path: Optional[str] = None, gap_fill: str = "last",
+                sidecar: bool = False) -> Dict:
+    """.gt3x 원시 가속도 디코딩
+
+    Args:
+        path: .gt3x 파일 경로
+        out_path: 지정 시 결과를 np.memmap(float32, (N, 3))으로 이 경로에 기록
+        gap_fill: idle sleep/누락 초 채우기 - "last"(직전 샘플), "zero", "nan"
+        sidecar: True이면 패킷 인덱스 사이드카 사용 (gt3x_index 참고)
+
+    Returns:
+        dict:
+            - acceleration: (N, 3) float32 배열 또는 memmap (g 단위, X/Y/Z)
+            - sample_rate: 샘플링 주파수 (Hz)
+            - start_timestamp: 첫 샘플의 timestamp (초, 패킷 기준)
+            - scale: 적용한 스케일
+            - idle_seconds: 채워진 idle sleep/누락 초 수
+    """
+    if gap_fill not in GAP_FILL_MODES:
+        raise ValueError(f"gap_fill must be one of {', '.join(GAP_FILL_MODES)}")
+
+    index = PacketIndex.from_gt3x(path, sidecar=sidecar)
+
+    with zipfile.ZipFile(path, 'r') as zf:
+        info = parse_info_txt(zf.read('info.txt').decode('utf-8'))
+        calibration = None
+        if 'calibration.json' in zf.namelist():
+            try:
+                calibration = json.loads(zf.read('calibration.json').decode('utf-8'))
+            except ValueError:
+                calibration = None
+
+        sample_rate = int(float(info["Sample Rate"]))
+        scale = acceleration_scale(info, calibration)
+
+        # 가속도 패킷만 선택
+        positions = np.flatnonzero((index.types == ACTIVITY_TYPE) | (index.types == ACTIVITY2_TYPE))
+        if len(positions) == 0:
+            raise ValueError("No ACTIVITY/ACTIVITY2 packets found in log.bin")
+
+        types = index.types[positions]
+        timestamps = index.timestamps[positions].astype(np.int64)
+        offsets = index.offsets[positions].astype(np.int64)
+        sizes = index.sizes[positions].astype(np.int64)
+        ends = offsets + PACKET_HEADER.size + sizes + CHECKSUM_SIZE
+
+        start_timestamp = int(timestamps.min())
+        seconds = int(timestamps.max()) - start_timestamp + 1
+        shape = (seconds * sample_rate, 3)
+
+        if out_path is not None:
+            acceleration = np.memmap(out_path, dtype=np.float32, mode='w+', shape=shape)
+        else:
+            acceleration = np.zeros(shape, dtype=np.float32)
+        per_second = acceleration.reshape(seconds, sample_rate, 3)
+        present = np.zeros(seconds, dtype=bool)
+
+        # log.bin을 버퍼 단위로 읽으며 버퍼 안에 완전히 들어온 패킷을 한 번에 디코딩
+        with zf.open('log.bin') as stream:
+            base = 0
+            data = b''
+            first = 0
+            while first < len(positions):
+                chunk = stream.read(DECODE_BUFFER_SIZE)
+                data = data + chunk if data else chunk
+                last = int(np.searchsorted(ends, base + len(data), side='right'))
+                if last == first and not chunk:
+                    raise EOFError(f"Truncated packet at offset {offsets[first]}")
+
+                buffer = np.frombuffer(data, dtype=np.uint8)
+                batch = slice(first, last)
+                _decode_batch(buffer, base, types[batch], timestamps[batch] - start_timestamp,
+                              offsets[batch], sizes[batch], sample_rate, scale, per_second, present)
+
+                first = last
+                if first < len(positions):
+                    cut = int(offsets[first]) - base
+                    data = data[cut:]
+                    base += cut
+                else:
+                    data = b''
+
+    idle_seconds = int(np.count_nonzero(~present))
+    if idle_seconds:
+        _fill_gaps(per_second, present, gap_fill)
+    if isinstance(acceleration, np.memmap):
+        acceleration.flush()
+
+    return {
+        'acceleration': acceleration,
+        'sample_rate': sample_rate,
+        'start_timestamp': start_timestamp,
+        'scale': scale,
+        'idle_seconds': idle_seconds,
+    }
+
+
+def _decode_batch(buffer: np.ndarray, base: int, types: np.ndarray, seconds: np.ndarray,
+                  offsets: np.ndarray, sizes: np.ndarray, sample_rate: int, scale: float,
+                  per_second: np.ndarray, present: np.ndarray):
+    """버퍼 안 패킷들을 (종류, 크기)별로 묶어 디코딩 후 초 단위 위치에 기록"""
+    payload_starts = offsets - base + PACKET_HEADER.size
+
+    for packet_type in np.unique(types):
+        of_type = types == packet_type
+        for size in np.unique(sizes[of_type]):
+            group = np.flatnonzero(of_type & (sizes == size))
+            samples = min(_packet_samples(int(packet_type), int(size)), sample_rate)
+            if samples == 0:
+                # idle sleep 패킷 - 누락 초로 남겨 gap_fill로 채움
+                continue
+
+            gather = payload_starts[group, None] + np.arange(int(size))
+            values = _unpack(int(packet_type), buffer[gather], samples).astype(np.float32)
+            values /= scale
+
+            rows = seconds[group]
+            per_second[rows, :samples] = values
+            if samples < sample_rate:
+                # 1초보다 짧은 패킷은 마지막 샘플로 나머지 채움
+                per_second[rows, samples:] = values[:, -1:, :]
+            present[rows] = True
+
+
+def _fill_gaps(per_second: np.ndarray, present: np.ndarray, gap_fill: str):
+    """idle sleep/누락 초 채우기 (블록 단위 벡터 연산)"""
+    seconds = len(present)
+    if gap_fill == "zero":
+        missing = np.flatnonzero(~present)
+        for start in range(0, len(missing), GAP_FILL_BLOCK_SECONDS):
+            per_second[missing[start:start + GAP_FILL_BLOCK_SECONDS]] = 0.0
+        return
+    if gap_fill == "nan":
+        missing = np.flatnonzero(~present)
+        for start in range(0, len(missing), GAP_FILL_BLOCK_SECONDS):
+            per_second[missing[start:start + GAP_FILL_BLOCK_SECONDS]] = np.nan
+        return
+
+    # 직전에 기록된 초의 마지막 샘플로 채움 (앞쪽 누락은 0)
+    last_present = np.where(present, np.arange(seconds), -1)
+    np.maximum.accumulate(last_present, out=last_present)
+    missing = np.flatnonzero(~present & (last_present >= 0))
+    for start in range(0, len(missing), GAP_FILL_BLOCK_SECONDS):
+        block = missing[start:start + GAP_FILL_BLOCK_SECONDS]
+        per_second[block] = per_second[last_present[block], -1:, :]
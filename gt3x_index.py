@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+.gt3x log.bin 패킷 인덱스
+
+log.bin 패킷 헤더를 한 번만 순회하여 패킷별 (type, timestamp, offset, size)를
+NumPy 배열로 기록합니다. 순회는 버퍼 단위로 읽으며 payload는 해석하지 않으므로
+압축된 ZIP 엔트리 스트림이나 mmap한 log.bin 모두에 사용할 수 있습니다.
+
+인덱스를 만든 뒤에는 메타데이터/이벤트 조회와 시간 구간 탐색이 이진 탐색(O(log n))으로
+처리됩니다. 선택적으로 .gt3x 옆에 사이드카 파일(.npz)로 저장해 다음 실행에서
+다시 순회하지 않을 수 있습니다 (log.bin CRC/크기가 같을 때만 사용).
+
+사용 예시:
+    from gt3x_index import PacketIndex, METADATA_TYPE
+    index = PacketIndex.from_gt3x(path, sidecar=True)
+    for i in index.positions(METADATA_TYPE):
+        payload = index.read_payload(stream, i)
+    lo, hi = index.time_range(start_ts, end_ts)
+"""
+
+import mmap
+import os
+import zipfile
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+import numpy as np
+
+from gt3x_log import CHECKSUM_SIZE, METADATA_TYPE, PACKET_HEADER, PACKET_SEPARATOR, PACKET_TYPES
+
+
+# 사이드카 인덱스 형식 버전
+INDEX_VERSION = 1
+
+# 헤더 순회 시 읽기 버퍼 크기
+SCAN_BUFFER_SIZE = 4 * 1024 * 1024
+
+EVENT_TYPE = PACKET_TYPES["EVENT"]
+
+
+def sidecar_path(gt3x_path: str) -> str:
+    """사이드카 인덱스 경로 (.gt3x와 같은 디렉토리의 숨김 파일)"""
+    directory, filename = os.path.split(os.path.abspath(gt3x_path))
+    return os.path.join(directory, f".{filename}.pktidx.npz")
+
+
+def _iter_headers(buffer, base: int, end: int) -> Iterator[Tuple[int, int, int, int]]:
+    """버퍼 안의 완전한 패킷 헤더 순회 (type, timestamp, offset, size)"""
+    position = 0
+    unpack_from = PACKET_HEADER.unpack_from
+    header_size = PACKET_HEADER.size
+    while position + header_size <= end:
+        separator, packet_type, timestamp, size = unpack_from(buffer, position)
+        if separator != PACKET_SEPARATOR:
+            raise ValueError(f"Invalid packet separator 0x{separator:02X} at offset {base + position}")
+        next_position = position + header_size + size + CHECKSUM_SIZE
+        if next_position > end:
+            return
+        yield packet_type, timestamp, base + position, size
+        position = next_position
+
+
+class PacketIndex:
+    """log.bin 패킷 인덱스 (type, timestamp, offset, size 배열)"""
+
+    def __init__(self, types: np.ndarray, timestamps: np.ndarray,
+                 offsets: np.ndarray, sizes: np.ndarray):
+        self.types = types
+        self.timestamps = timestamps
+        self.offsets = offsets
+        self.sizes = sizes
+
+        # 시간 구간 탐색용 정렬 순서 (이미 정렬되어 있으면 None)
+        self._order = None
+        if len(timestamps) > 1 and np.any(np.diff(timestamps.astype(np.int64)) < 0):
+            self._order = np.argsort(timestamps, kind='stable')
+        self._positions = {}
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    # ------------------------------------------------------------------
+    # 인덱스 생성
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build(cls, stream: BinaryIO) -> 'PacketIndex':
+        """스트림을 한 번 순회하여 인덱스 생성 (payload는 건너뜀)
+
+        Args:
+            stream: log.bin 스트림 (ZipExtFile 등, 앞에서부터 읽음)
+
+        Returns:
+            PacketIndex
+        """
+        types, timestamps, offsets, sizes = [], [], [], []
+        pending = b''
+        base = 0
+        while True:
+            chunk = stream.read(SCAN_BUFFER_SIZE)
+            buffer = pending + chunk if pending else chunk
+            consumed = 0
+            for packet_type, timestamp, offset, size in _iter_headers(buffer, base, len(buffer)):
+                types.append(packet_type)
+                timestamps.append(timestamp)
+                offsets.append(offset)
+                sizes.append(size)
+                consumed = offset - base + PACKET_HEADER.size + size + CHECKSUM_SIZE
+
+            pending = buffer[consumed:]
+            base += consumed
+            if not chunk:
+                if pending:
+                    raise EOFError(f"Truncated packet at offset {base}")
+                break
+
+        return cls._from_lists(types, timestamps, offsets, sizes)
+
+    @classmethod
+    def build_from_file(cls, log_path: str) -> 'PacketIndex':
+        """압축 해제된 log.bin 파일을 mmap으로 순회하여 인덱스 생성"""
+        with open(log_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return cls._from_lists([], [], [], [])
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                records = list(_iter_headers(mapped, 0, len(mapped)))
+                end = records[-1][2] + PACKET_HEADER.size + records[-1][3] + CHECKSUM_SIZE if records else 0
+                if end != len(mapped):
+                    raise EOFError(f"Truncated packet at offset {end}")
+        if not records:
+            return cls._from_lists([], [], [], [])
+        types, timestamps, offsets, sizes = zip(*records)
+        return cls._from_lists(types, timestamps, offsets, sizes)
+
+    @classmethod
+    def _from_lists(cls, types, timestamps, offsets, sizes) -> 'PacketIndex':
+        return cls(
+            np.asarray(types, dtype=np.uint8),
+            np.asarray(timestamps, dtype=np.uint32),
+            np.asarray(offsets, dtype=np.uint64),
+            np.asarray(sizes, dtype=np.uint16),
+        )
+
+    @classmethod
+    def from_gt3x(cls, gt3x_path: str, sidecar: bool = False) -> 'PacketIndex':
+        """.gt3x의 log.bin 인덱스 (사이드카가 유효하면 재사용)
+
+        Args:
+            gt3x_path: .gt3x 파일 경로
+            sidecar: True이면 사이드카 인덱스를 읽고, 없거나 오래되었으면 새로 저장
+
+        Returns:
+            PacketIndex
+        """
+        with zipfile.ZipFile(gt3x_path, 'r') as zf:
+            info = zf.getinfo('log.bin')
+            signature = np.array([INDEX_VERSION, info.CRC, info.file_size], dtype=np.uint64)
+
+            if sidecar:
+                index = cls.load(sidecar_path(gt3x_path), signature)
+                if index is not None:
+                    return index
+
+            with zf.open(info) as stream:
+                index = cls.build(stream)
+
+        if sidecar:
+            index.save(sidecar_path(gt3x_path), signature)
+        return index
+
+    # ------------------------------------------------------------------
+    # 사이드카 저장/로드
+    # ------------------------------------------------------------------
+
+    def save(self, path: str, signature: np.ndarray):
+        """사이드카 인덱스 저장 (임시 파일 + os.replace)"""
+        temp_path = f"{path}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                np.savez(f, signature=signature, types=self.types, timestamps=self.timestamps,
+                         offsets=self.offsets, sizes=self.sizes)
+            os.replace(temp_path, path)
+        except OSError as e:
+            # 사이드카 저장 실패는 조회 결과에 영향 없음
+            print(f"  ⚠️  경고: 패킷 인덱스 저장 실패 ({e})")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    @classmethod
+    def load(cls, path: str, signature: np.ndarray) -> Optional['PacketIndex']:
+        """사이드카 인덱스 로드 (없거나 log.bin이 바뀌었으면 None)"""
+        try:
+            with np.load(path) as data:
+                if not np.array_equal(data['signature'], signature):
+                    return None
+                return cls(data['types'], data['timestamps'], data['offsets'], data['sizes'])
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"  ⚠️  경고: 패킷 인덱스 손상, 다시 생성합니다 ({e})")
+            return None
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def positions(self, packet_type: int) -> np.ndarray:
+        """해당 종류 패킷의 인덱스 위치 (오프셋 순)"""
+        if packet_type not in self._positions:
+            self._positions[packet_type] = np.flatnonzero(self.types == packet_type)
+        return self._positions[packet_type]
+
+    def first(self, packet_type: int) -> Optional[int]:
+        """해당 종류의 첫 번째 패킷 위치 (없으면 None)"""
+        positions = self.positions(packet_type)
+        return int(positions[0]) if len(positions) else None
+
+    def metadata_positions(self) -> np.ndarray:
+        """METADATA 패킷 위치"""
+        return self.positions(METADATA_TYPE)
+
+    def event_positions(self, start: Optional[int] = None, end: Optional[int] = None) -> np.ndarray:
+        """EVENT 패킷 위치 (timestamp 구간 [start, end) 지정 가능)"""
+        positions = self.positions(EVENT_TYPE)
+        if start is None and end is None:
+            return positions
+        times = self.timestamps[positions]
+        lo = 0 if start is None else np.searchsorted(times, start, side='left')
+        hi = len(times) if end is None else np.searchsorted(times, end, side='left')
+        return positions[lo:hi]
+
+    def time_range(self, start: int, end: int) -> np.ndarray:
+        """timestamp가 [start, end)인 패킷 위치 (이진 탐색)
+
+        Args:
+            start: 시작 Unix timestamp (포함)
+            end: 끝 Unix timestamp (제외)
+
+        Returns:
+            np.ndarray: 패킷 위치 (오프셋 순)
+        """
+        if self._order is None:
+            lo = np.searchsorted(self.timestamps, start, side='left')
+            hi = np.searchsorted(self.timestamps, end, side='left')
+            return np.arange(lo, hi)
+
+        sorted_times = self.timestamps[self._order]
+        lo = np.searchsorted(sorted_times, start, side='left')
+        hi = np.searchsorted(sorted_times, end, side='left')
+        return np.sort(self._order[lo:hi])
+
+    def seek_time(self, timestamp: int) -> Optional[int]:
+        """timestamp 이상인 첫 패킷의 log.bin 오프셋 (없으면 None)"""
+        positions = self.time_range(timestamp, np.iinfo(np.uint32).max)
+        return int(self.offsets[positions[0]]) if len(positions) else None
+
+    def read_payload(self, stream: BinaryIO, position: int) -> bytes:
+        """인덱스 위치의 패킷 payload 읽기
+
+        Args:
+            stream: seek 가능한 log.bin 스트림 (ZipExtFile은 뒤로 seek 시 다시 압축 해제)
+            position: 패킷 인덱스 위치
+
+        Returns:
+            bytes: payload (체크섬 제외)
+        """
+        stream.seek(int(self.offsets[position]) + PACKET_HEADER.size)
+        return stream.read(int(self.sizes[position]))
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+.gt3x log.bin 패킷 처리 모듈
+
+log.bin은 다음 형식의 패킷이 연속된 바이너리입니다.
+  [0x1E][type 1B][timestamp uint32 LE][size uint16 LE][payload size B][checksum 1B]
+  checksum = ~(header + payload 전체 XOR) & 0xFF
+
+METADATA 패킷(type 0x06)의 payload는 UTF-8 JSON이며, "MetadataType": "Bio"
+패킷에 SubjectName, Limb, Side, Dominance 등 대상자 정보가 들어 있습니다.
+
+BioMetadataRewriter는 log.bin을 스트리밍으로 읽어 Bio METADATA 패킷의 JSON만
+바꾸고(크기/체크섬 재계산), 나머지 바이트는 그대로 흘려보냅니다.
+메모리 사용량은 패킷 하나 또는 복사 버퍼 크기로 제한됩니다.
+
+사용 예시:
+    from gt3x_archive import replace_entries
+    from gt3x_log import BioMetadataRewriter
+    replace_entries(path, {'log.bin': BioMetadataRewriter({'SubjectName': '조민석'})})
+"""
+
+import json
+import struct
+import zlib
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
+
+
+# ============================================================================
+# log.bin 패킷 상수 (ActiGraph GT3X 파일 형식)
+# ============================================================================
+
+# 패킷 헤더: separator, type, timestamp(초), payload 크기
+PACKET_HEADER = struct.Struct('<BBIH')
+PACKET_SEPARATOR = 0x1E
+CHECKSUM_SIZE = 1
+MAX_PAYLOAD_SIZE = 0xFFFF
+
+# 패킷 종류
+PACKET_TYPES = {
+    "ACTIVITY": 0x00,
+    "BATTERY": 0x02,
+    "EVENT": 0x03,
+    "HEART_RATE_BPM": 0x04,
+    "LUX": 0x05,
+    "METADATA": 0x06,
+    "TAG": 0x07,
+    "EPOCH": 0x09,
+    "HEART_RATE_ANT": 0x0B,
+    "EPOCH2": 0x0C,
+    "CAPSENSE": 0x0D,
+    "HEART_RATE_BLE": 0x0E,
+    "EPOCH3": 0x0F,
+    "EPOCH4": 0x10,
+    "PARAMETERS": 0x15,
+    "SENSOR_SCHEMA": 0x18,
+    "SENSOR_DATA": 0x19,
+    "ACTIVITY2": 0x1A,
+}
+
+METADATA_TYPE = PACKET_TYPES["METADATA"]
+
+# Bio METADATA JSON 구분 값
+BIO_METADATA_TYPE = "Bio"
+
+# 스트리밍 복사 버퍼 크기
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+def packet_checksum(header: bytes, payload: bytes) -> int:
+    """패킷 체크섬 (헤더 + payload XOR의 1의 보수)"""
+    checksum = 0
+    for byte in header:
+        checksum ^= byte
+    for byte in payload:
+        checksum ^= byte
+    return ~checksum & 0xFF
+
+
+def build_packet(packet_type: int, timestamp: int, payload: bytes) -> bytes:
+    """패킷 인코딩 (헤더 + payload + 체크섬)
+
+    Args:
+        packet_type: 패킷 종류 (PACKET_TYPES)
+        timestamp: Unix timestamp (초)
+        payload: 패킷 내용
+
+    Returns:
+        bytes: 인코딩된 패킷
+    """
+    if len(payload) > MAX_PAYLOAD_SIZE:
+        raise ValueError(f"Packet payload too large: {len(payload)} bytes (max {MAX_PAYLOAD_SIZE})")
+    header = PACKET_HEADER.pack(PACKET_SEPARATOR, packet_type, timestamp, len(payload))
+    return header + payload + bytes([packet_checksum(header, payload)])
+
+
+def read_packet(stream: BinaryIO, offset: int = 0) -> Optional[Tuple[int, int, bytes, bytes]]:
+    """스트림 현재 위치에서 패킷 하나 읽기
+
+    Args:
+        stream: log.bin 스트림
+        offset: 현재 위치 (오류 메시지용)
+
+    Returns:
+        (type, timestamp, header, payload + checksum) 튜플 또는 None (스트림 끝)
+    """
+    header = stream.read(PACKET_HEADER.size)
+    if not header:
+        return None
+    if len(header) < PACKET_HEADER.size:
+        raise EOFError(f"Truncated packet header at offset {offset}")
+
+    separator, packet_type, timestamp, size = PACKET_HEADER.unpack(header)
+    if separator != PACKET_SEPARATOR:
+        raise ValueError(f"Invalid packet separator 0x{separator:02X} at offset {offset}")
+
+    body = stream.read(size + CHECKSUM_SIZE)
+    if len(body) < size + CHECKSUM_SIZE:
+        raise EOFError(f"Truncated packet at offset {offset}")
+    return packet_type, timestamp, header, body
+
+
+def parse_bio_metadata(payload: bytes) -> Optional[Dict]:
+    """METADATA payload가 Bio JSON이면 dict로 반환"""
+    try:
+        document = json.loads(payload.decode('utf-8'))
+    except (UnicodeDecodeError, ValueError):
+        return None
+    if isinstance(document, dict) and document.get('MetadataType') == BIO_METADATA_TYPE:
+        return document
+    return None
+
+
+def find_bio_metadata(stream: BinaryIO) -> Optional[Dict]:
+    """log.bin에서 첫 번째 Bio METADATA JSON 찾기 (찾으면 즉시 중단)
+
+    Args:
+        stream: log.bin 스트림 (압축 해제된 ZipExtFile 등)
+
+    Returns:
+        dict: Bio METADATA JSON 또는 None
+    """
+    offset = 0
+    while True:
+        packet = read_packet(stream, offset)
+        if packet is None:
+            return None
+        packet_type, _, header, body = packet
+        if packet_type == METADATA_TYPE:
+            document = parse_bio_metadata(body[:-CHECKSUM_SIZE])
+            if document is not None:
+                return document
+        offset += len(header) + len(body)
+
+
+class BioMetadataRewriter:
+    """Bio METADATA 패킷 JSON 교체 (gt3x_archive 스트리밍 교체 함수)
+
+    첫 번째 Bio METADATA 패킷까지만 패킷 단위로 읽고, 그 뒤는 버퍼 단위로
+    그대로 복사합니다. 다른 JSON 키(MetadataType, Race 등)와 순서는 유지되며,
+    원본 JSON에 있는 키만 바꿉니다 (장치가 기록하지 않는 키는 추가하지 않음).
+
+    교체 후 replaced에 (패킷 위치, 앞부분 CRC32, 원본 패킷, 새 패킷)을 기록하므로
+    원본 CRC32에서 새 log.bin의 CRC32를 계산할 수 있습니다 (integrity 모듈).
+    """
+
+    def __init__(self, updates: Dict[str, str]):
+        """
+        Args:
+            updates: {JSON 키: 값} (예: {'SubjectName': '조민석', 'Sex': 'Male'})
+        """
+        self.updates = updates
+        self.original: Optional[Dict] = None
+        self.updated: Optional[Dict] = None
+        self.replaced: Optional[Tuple[int, int, bytes, bytes]] = None
+
+    def __call__(self, stream: BinaryIO) -> Iterator[bytes]:
+        """원본 log.bin 스트림을 받아 새 log.bin 청크 반환"""
+        offset = 0
+        prefix_crc = 0
+        while True:
+            packet = read_packet(stream, offset)
+            if packet is None:
+                return
+            packet_type, timestamp, header, body = packet
+
+            if packet_type == METADATA_TYPE:
+                document = parse_bio_metadata(body[:-CHECKSUM_SIZE])
+                if document is not None:
+                    self.original = dict(document)
+                    document.update((key, value) for key, value in self.updates.items() if key in document)
+                    self.updated = document
+                    payload = json.dumps(document, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+                    packet = build_packet(packet_type, timestamp, payload)
+                    self.replaced = (offset, prefix_crc, header + body, packet)
+                    yield packet
+                    break
+
+            offset += len(header) + len(body)
+            prefix_crc = zlib.crc32(body, zlib.crc32(header, prefix_crc))
+            yield header + body
+
+        # 나머지는 패킷 해석 없이 그대로 복사
+        while True:
+            chunk = stream.read(COPY_BUFFER_SIZE)
+            if not chunk:
+                return
+            yield chunk
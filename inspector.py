@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+ActiGraph 파일 메타데이터 일괄 조회 (읽기 전용)
+
+디렉토리의 .agd/.gt3x 파일에서 헤더 메타데이터만 읽어 파일당 한 행으로
+CSV 또는 Parquet에 기록합니다.
+  - .agd: settings 테이블만 조회 (SQLite mode=ro&immutable=1 - 잠금/저널 확인 없음)
+  - .gt3x: 중앙 디렉토리와 info.txt 엔트리만 읽음 (log.bin은 읽지 않음)
+파일은 여러 프로세스에서 병렬로 읽으며 원본은 수정하지 않습니다.
+
+사용 예시:
+    # config.yaml의 target_directory 전체 → metadata.csv
+    python inspector.py -o metadata.csv
+
+    # 여러 디렉토리, Parquet 출력, 워커 8개
+    python inspector.py D:/site1 D:/site2 -o metadata.parquet --jobs 8
+
+    # 프로그래밍 방식 사용
+    from inspector import inspect_files
+    rows = inspect_files(paths)   # [{'path', 'serial', 'subjectname', ...}, ...]
+"""
+
+import argparse
+import csv
+import datetime
+import os
+import sqlite3
+import sys
+import time
+import zipfile
+from itertools import chain
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from modify import AGD_FIELDS, FILE_EXTENSIONS, GT3X_FIELDS, parse_info_txt
+from scanner import scan_files
+
+
+# 장치/기록 정보 컬럼 → 파일 필드명
+AGD_HEADER_FIELDS = {
+    "serial": "deviceserial",
+    "device": "devicename",
+    "firmware": "deviceversion",
+    "sample_rate": "original sample rate",
+    "epoch_length": "epochlength",
+    "start": "startdatetime",
+    "stop": "stopdatetime",
+    "download": "downloaddatetime",
+}
+
+GT3X_HEADER_FIELDS = {
+    "serial": "Serial Number",
+    "device": "Device Type",
+    "firmware": "Firmware",
+    "sample_rate": "Sample Rate",
+    "start": "Start Date",
+    "stop": "Stop Date",
+    "download": "Download Date",
+}
+
+# 출력 컬럼 (메타데이터 컬럼은 AGD_FIELDS/GT3X_FIELDS의 키)
+INSPECT_COLUMNS = (
+    ["path", "filename", "format", "size", "mtime"]
+    + list(AGD_HEADER_FIELDS)
+    + list(AGD_FIELDS)
+    + ["error"]
+)
+
+# 병렬 조회 시 워커에 한 번에 넘길 파일 수
+DEFAULT_CHUNKSIZE = 64
+
+
+def read_agd_settings(path) -> Dict[str, str]:
+    """.agd settings 테이블 읽기 (immutable 읽기 전용 - 잠금/저널 파일 없음)"""
+    uri = f"{Path(path).resolve().as_uri()}?mode=ro&immutable=1"
+    conn = sqlite3.connect(uri, uri=True)
+    try:
+        return {
+            name: '' if value is None else str(value)
+            for name, value in conn.execute("SELECT settingName, settingValue FROM settings")
+        }
+    finally:
+        conn.close()
+
+
+def read_gt3x_info(path) -> Dict[str, str]:
+    """.gt3x info.txt 엔트리만 읽기"""
+    with zipfile.ZipFile(path, 'r') as zf:
+        return parse_info_txt(zf.read('info.txt').decode('utf-8'))
+
+
+def inspect_file(path) -> Dict:
+    """파일 1개의 헤더 메타데이터 (INSPECT_COLUMNS 키, 읽기 실패 시 error에 기록)"""
+    path = Path(path)
+    row = dict.fromkeys(INSPECT_COLUMNS, '')
+    row.update(path=str(path), filename=path.name, format=path.suffix.lower().lstrip('.'))
+
+    try:
+        stat = path.stat()
+        row['size'] = stat.st_size
+        row['mtime'] = datetime.datetime.fromtimestamp(stat.st_mtime).isoformat(timespec='seconds')
+
+        if row['format'] == 'agd':
+            fields, header_fields, metadata_fields = read_agd_settings(path), AGD_HEADER_FIELDS, AGD_FIELDS
+        elif row['format'] == 'gt3x':
+            fields, header_fields, metadata_fields = read_gt3x_info(path), GT3X_HEADER_FIELDS, GT3X_FIELDS
+        else:
+            raise ValueError(f"Unsupported file type: {path.suffix}")
+
+        for column, field_name in chain(header_fields.items(), metadata_fields.items()):
+            row[column] = fields.get(field_name, '')
+    except Exception as e:
+        row['error'] = f"{type(e).__name__}: {e}"
+
+    return row
+
+
+def inspect_files(paths: Iterable, jobs: Optional[int] = None,
+                  chunksize: int = DEFAULT_CHUNKSIZE) -> List[Dict]:
+    """여러 파일의 헤더 메타데이터 (입력 순서 유지)
+
+    Args:
+        paths: 파일 경로들
+        jobs: 워커 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 순차 처리)
+        chunksize: 워커에 한 번에 넘길 파일 수
+
+    Returns:
+        list: 파일별 dict (INSPECT_COLUMNS 키)
+    """
+    paths = [str(path) for path in paths]
+    jobs = jobs or os.cpu_count() or 1
+    if jobs <= 1 or len(paths) <= chunksize:
+        return [inspect_file(path) for path in paths]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(inspect_file, paths, chunksize=chunksize))
+
+
+def write_csv(rows: List[Dict], output_path):
+    """CSV 저장 (Excel에서 한글이 깨지지 않도록 UTF-8 BOM)"""
+    with open(output_path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=INSPECT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_parquet(rows: List[Dict], output_path):
+    """Parquet 저장 (pandas + pyarrow 필요)"""
+    import pandas as pd
+
+    frame = pd.DataFrame(rows, columns=INSPECT_COLUMNS)
+    frame['size'] = pd.to_numeric(frame['size'], errors='coerce').astype('Int64')
+    frame.to_parquet(output_path, index=False)
+
+
+def collect_paths(targets: Iterable, scan_config: Optional[Dict] = None) -> List[Path]:
+    """파일/디렉토리 인자를 대상 파일 목록으로 변환 (디렉토리는 scan_files로 탐색)"""
+    scan_config = scan_config or {}
+    files, directories = [], []
+    for target in map(Path, targets):
+        (directories if target.is_dir() else files).append(target)
+
+    paths = [path for path in files if path.suffix.lower() in FILE_EXTENSIONS]
+    for path, _ in scan_files(directories, FILE_EXTENSIONS,
+                              include=scan_config.get('include'),
+                              exclude=scan_config.get('exclude'),
+                              recursive=bool(scan_config.get('recursive', True))):
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="ActiGraph 파일 메타데이터 일괄 조회 (읽기 전용)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python inspector.py -o metadata.csv
+  python inspector.py D:/site1 D:/site2 -o metadata.parquet --jobs 8
+  python inspector.py "MOS2D36155148 (2025-11-13).gt3x"
+        """
+    )
+    parser.add_argument('paths', nargs='*',
+                        help='파일 또는 디렉토리 (기본값: config.yaml의 paths.target_directory)')
+    parser.add_argument('--output', '-o', default='metadata.csv',
+                        help='출력 파일 (.csv 또는 .parquet, 기본값: metadata.csv)')
+    parser.add_argument('--format', choices=['csv', 'parquet'],
+                        help='출력 형식 (기본값: 출력 파일 확장자로 판단)')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help='워커 프로세스 수 (기본값: CPU 수)')
+    parser.add_argument('--config', default='config.yaml', help='설정 파일 경로 (기본값: config.yaml)')
+    args = parser.parse_args()
+
+    # 탐색 설정(scan)과 기본 대상 디렉토리는 config.yaml에서 (경로를 지정하면 설정 파일 없이도 동작)
+    config = {}
+    if os.path.exists(args.config):
+        import yaml
+
+        with open(args.config, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f) or {}
+    elif not args.paths:
+        print(f"❌ 오류: 설정 파일을 찾을 수 없습니다: {args.config}")
+        sys.exit(1)
+
+    scan_config = config.get('scan') or {}
+    targets = args.paths or config['paths']['target_directory']
+    if isinstance(targets, str):
+        targets = [targets]
+
+    output_format = args.format or ('parquet' if args.output.lower().endswith('.parquet') else 'csv')
+
+    started = time.perf_counter()
+    paths = collect_paths(targets, scan_config)
+    if not paths:
+        print(f"❌ 조회할 파일이 없습니다. (확장자: {', '.join(FILE_EXTENSIONS)})")
+        sys.exit(1)
+
+    rows = inspect_files(paths, jobs=args.jobs)
+    if output_format == 'parquet':
+        try:
+            write_parquet(rows, args.output)
+        except ImportError as e:
+            print(f"❌ 오류: Parquet 저장에는 pandas와 pyarrow가 필요합니다 ({e})")
+            sys.exit(1)
+    else:
+        write_csv(rows, args.output)
+    elapsed = time.perf_counter() - started
+
+    errors = [row for row in rows if row['error']]
+    print(f"✅ {len(rows)}개 파일 → {args.output} ({elapsed:.2f}초, {len(rows) / max(elapsed, 1e-9):.0f} 파일/초)")
+    if errors:
+        print(f"⚠️  읽기 실패: {len(errors)}개")
+        for row in errors[:10]:
+            print(f"  ❌ {row['filename']}: {row['error']}")
+        if len(errors) > 10:
+            print(f"  ... 외 {len(errors) - 10}개")
+
+
+if __name__ == '__main__':
+    main()
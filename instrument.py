@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+처리 단계별 시간/자원 측정
+
+파일별로 단계(lookup, metadata, modify, rename 등) 소요 시간과 읽기/쓰기 바이트를
+기록하고, 단계별 p50/p95/max를 요약합니다. 결과는 JSON lines(파일별 1줄 + 요약 1줄)와
+Prometheus textfile(node_exporter textfile collector 형식)로 내보낼 수 있습니다.
+
+  - 파일 단계: file() 안에서 lap()으로 구간을 나누거나(배타적), stage()로 감쌈(포함 관계)
+    예: modify 안에 sqlite_write/zip_rewrite, 그 안에 verify가 포함됨
+  - 실행 단계: 파일 밖에서 stage()로 감싼 구간 (load_data, manifest 등, 호출별 기록)
+  - 병렬 처리: 워커가 자기 프로세스에서 측정한 파일 기록을 take_records()로 넘기면
+    부모가 add_records()로 합침 (워커별 처리 파일 수/처리 시간 포함)
+  - 선택: cProfile(메인 프로세스), tracemalloc(최대 추적 메모리와 상위 할당 위치)
+
+측정을 끄면(enabled=False) stage()/file()은 빈 컨텍스트를 반환하므로 비용이 거의 없습니다.
+읽기/쓰기 바이트는 /proc/self/io(rchar/wchar)를 사용하며 Linux에서만 기록됩니다.
+"""
+
+import contextlib
+import datetime
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# Prometheus 메트릭 이름 접두어
+METRIC_PREFIX = "actigraph"
+
+# 요약에 사용할 백분위수
+SUMMARY_QUANTILES = (0.5, 0.95)
+
+# tracemalloc 상위 할당 위치 개수
+TRACEMALLOC_TOP = 10
+
+_NULL_CONTEXT = contextlib.nullcontext()
+
+
+def io_counters() -> Optional[Tuple[int, int]]:
+    """현재 프로세스의 누적 (읽기, 쓰기) 바이트 (/proc/self/io rchar/wchar, 없으면 None)"""
+    try:
+        with open('/proc/self/io', 'r') as f:
+            counters = dict(line.split(':', 1) for line in f if ':' in line)
+        return int(counters['rchar']), int(counters['wchar'])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def percentile(values: List[float], q: float) -> float:
+    """백분위수 (선형 보간, numpy.percentile 기본 방식과 동일)"""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class Instrumentation:
+    """단계별 시간/자원 측정기"""
+
+    def __init__(self, enabled: bool = True, profile_path: Optional[str] = None,
+                 trace_memory: bool = False):
+        """
+        Args:
+            enabled: False이면 아무것도 기록하지 않음
+            profile_path: 지정 시 start()~stop() 구간을 cProfile로 기록해 저장
+            trace_memory: True이면 tracemalloc으로 최대 메모리/상위 할당 위치 기록
+        """
+        self.enabled = enabled
+        self.profile_path = profile_path if enabled else None
+        self.trace_memory = trace_memory and enabled
+
+        self.records: List[Dict] = []
+        self.run_stages: Dict[str, List[float]] = {}
+        self.memory: Optional[Dict] = None
+        self.started_at: Optional[str] = None
+
+        self._current: Optional[Dict] = None
+        self._lap_started = 0.0
+        self._profiler = None
+
+    def __getstate__(self):
+        """병렬 워커 전달용 상태 (기록/프로파일러 제외, 워커는 파일 측정만 수행)"""
+        state = self.__dict__.copy()
+        state.update(records=[], run_stages={}, memory=None, profile_path=None,
+                     trace_memory=False, _current=None, _profiler=None)
+        return state
+
+    def for_worker(self) -> 'Instrumentation':
+        """병렬 워커용 측정기 (fork로 물려받은 cProfile/tracemalloc을 끄고 파일 측정만 수행)"""
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler = None
+        if self.trace_memory:
+            import tracemalloc
+            tracemalloc.stop()
+        return Instrumentation(enabled=self.enabled)
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'Instrumentation':
+        """config.yaml의 instrumentation 섹션으로 생성"""
+        config = config or {}
+        enabled = bool(config.get('enabled', False) or config.get('jsonl') or config.get('prometheus')
+                       or config.get('profile') or config.get('tracemalloc'))
+        return cls(enabled=enabled, profile_path=config.get('profile') or None,
+                   trace_memory=bool(config.get('tracemalloc', False)))
+
+    # ------------------------------------------------------------------
+    # 측정
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """실행 측정 시작 (cProfile/tracemalloc 시작)"""
+        if not self.enabled:
+            return
+        self.started_at = datetime.datetime.now().isoformat(timespec='seconds')
+        if self.trace_memory:
+            import tracemalloc
+            tracemalloc.start()
+        if self.profile_path:
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def stop(self):
+        """실행 측정 종료 (프로파일 저장, tracemalloc 결과 수집)"""
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler.dump_stats(self.profile_path)
+            self._profiler = None
+            print(f"🔬 프로파일 저장: {self.profile_path} (python -m pstats {self.profile_path})")
+
+        if self.trace_memory:
+            import tracemalloc
+            if tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                top = tracemalloc.take_snapshot().statistics('lineno')[:TRACEMALLOC_TOP]
+                tracemalloc.stop()
+                self.memory = {
+                    'current_bytes': current,
+                    'peak_bytes': peak,
+                    'top': [{'location': str(stat.traceback), 'bytes': stat.size, 'count': stat.count}
+                            for stat in top],
+                }
+
+    def stage(self, name: str):
+        """단계 측정 컨텍스트 (파일 측정 중이면 파일 단계, 아니면 실행 단계)"""
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._stage(name)
+
+    @contextlib.contextmanager
+    def _stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            if self._current is not None:
+                stages = self._current['stages']
+                stages[name] = stages.get(name, 0.0) + elapsed
+            else:
+                self.run_stages.setdefault(name, []).append(elapsed)
+
+    def file(self, path):
+        """파일 1개 측정 컨텍스트 (총 시간, 읽기/쓰기 바이트, 단계별 시간)
+
+        Yields:
+            dict: 파일 기록 (측정을 끄면 None) - success/message 등을 추가로 기록 가능
+        """
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._file(path)
+
+    @contextlib.contextmanager
+    def _file(self, path) -> Iterator[Dict]:
+        record = {
+            'type': 'file',
+            'path': str(path),
+            'pid': os.getpid(),
+            'started_at': time.time(),
+            'stages': {},
+        }
+        previous = self._current
+        self._current = record
+        counters_before = io_counters()
+        started = self._lap_started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - started
+            counters_after = io_counters()
+            if counters_before is not None and counters_after is not None:
+                record['bytes_read'] = counters_after[0] - counters_before[0]
+                record['bytes_written'] = counters_after[1] - counters_before[1]
+            self._current = previous
+            self.records.append(record)
+
+    def lap(self, name: str):
+        """파일 측정 중 직전 lap(또는 파일 시작) 이후 시간을 name 단계로 기록"""
+        if self._current is None:
+            return
+        now = time.perf_counter()
+        stages = self._current['stages']
+        stages[name] = stages.get(name, 0.0) + (now - self._lap_started)
+        self._lap_started = now
+
+    def take_records(self) -> List[Dict]:
+        """기록된 파일 측정 결과를 꺼냄 (병렬 워커 → 부모 전달용)"""
+        records, self.records = self.records, []
+        return records
+
+    def add_records(self, records: Optional[List[Dict]]):
+        """워커에서 받은 파일 측정 결과 추가"""
+        if self.enabled and records:
+            self.records.extend(records)
+
+    # ------------------------------------------------------------------
+    # 요약/내보내기
+    # ------------------------------------------------------------------
+
+    def stage_durations(self) -> Dict[str, List[float]]:
+        """단계별 소요 시간 목록 (파일 단계 + 실행 단계, total은 파일별 전체 시간)"""
+        durations: Dict[str, List[float]] = {}
+        for record in self.records:
+            durations.setdefault('total', []).append(record['seconds'])
+            for name, seconds in record['stages'].items():
+                durations.setdefault(name, []).append(seconds)
+        for name, values in self.run_stages.items():
+            durations.setdefault(name, []).extend(values)
+        return durations
+
+    def summary(self) -> Dict:
+        """측정 요약
+
+        Returns:
+            dict:
+                - stages: {단계: {count, sum, p50, p95, max}}
+                - files: {total, success, failed}
+                - bytes_read, bytes_written: 파일 처리 중 읽기/쓰기 바이트 합계 (Linux)
+                - workers: {pid: {files, seconds}}
+                - memory: tracemalloc 결과 (사용 시)
+        """
+        stages = {}
+        for name, values in self.stage_durations().items():
+            stages[name] = {
+                'count': len(values),
+                'sum': sum(values),
+                'p50': percentile(values, 0.5),
+                'p95': percentile(values, 0.95),
+                'max': max(values),
+            }
+
+        workers: Dict[int, Dict] = {}
+        for record in self.records:
+            worker = workers.setdefault(record['pid'], {'files': 0, 'seconds': 0.0})
+            worker['files'] += 1
+            worker['seconds'] += record['seconds']
+
+        success = sum(1 for record in self.records if record.get('success'))
+        summary = {
+            'type': 'summary',
+            'started_at': self.started_at,
+            'stages': stages,
+            'files': {'total': len(self.records), 'success': success,
+                      'failed': len(self.records) - success},
+            'bytes_read': sum(record.get('bytes_read', 0) for record in self.records),
+            'bytes_written': sum(record.get('bytes_written', 0) for record in self.records),
+            'workers': workers,
+        }
+        if self.memory is not None:
+            summary['memory'] = self.memory
+        return summary
+
+    def print_summary(self):
+        """단계별 p50/p95/max 표 출력"""
+        summary = self.summary()
+        if not summary['stages']:
+            return
+
+        print("⏱️  단계별 처리 시간 (초)")
+        print(f"  {'단계':<14}{'횟수':>6}{'p50':>10}{'p95':>10}{'max':>10}{'합계':>10}")
+        for name, stats in sorted(summary['stages'].items(), key=lambda item: -item[1]['sum']):
+            print(f"  {name:<14}{stats['count']:>6}{stats['p50']:>10.4f}{stats['p95']:>10.4f}"
+                  f"{stats['max']:>10.4f}{stats['sum']:>10.3f}")
+        if summary['bytes_read'] or summary['bytes_written']:
+            print(f"  💾 읽기 {summary['bytes_read']:,} bytes, 쓰기 {summary['bytes_written']:,} bytes")
+        if len(summary['workers']) > 1:
+            for pid, worker in sorted(summary['workers'].items()):
+                print(f"  👷 워커 {pid}: {worker['files']}개, {worker['seconds']:.3f}초")
+        if self.memory is not None:
+            print(f"  🧠 tracemalloc 최대: {self.memory['peak_bytes']:,} bytes")
+
+    def write_jsonl(self, path):
+        """JSON lines로 추가 기록 (파일별 1줄 + 요약 1줄, 실행마다 이어서 기록)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            for record in self.records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.write(json.dumps(self.summary(), ensure_ascii=False) + "\n")
+
+    def prometheus_text(self) -> str:
+        """Prometheus 텍스트 형식 (summary/counter/gauge)"""
+        summary = self.summary()
+        prefix = METRIC_PREFIX
+        lines = [
+            f"# HELP {prefix}_stage_seconds Stage latency in seconds (per file, or per call for run stages)",
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+        for name, stats in sorted(summary['stages'].items()):
+            for q in SUMMARY_QUANTILES:
+                lines.append(f'{prefix}_stage_seconds{{stage="{name}",quantile="{q}"}} '
+                             f'{stats["p50" if q == 0.5 else "p95"]:.6f}')
+            lines.append(f'{prefix}_stage_seconds{{stage="{name}",quantile="1"}} {stats["max"]:.6f}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{name}"}} {stats["sum"]:.6f}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{name}"}} {stats["count"]}')
+
+        lines += [
+            f"# HELP {prefix}_files_total Files processed in the last run",
+            f"# TYPE {prefix}_files_total gauge",
+            f'{prefix}_files_total{{result="success"}} {summary["files"]["success"]}',
+            f'{prefix}_files_total{{result="failed"}} {summary["files"]["failed"]}',
+            f"# HELP {prefix}_file_bytes Bytes read/written while processing files in the last run",
+            f"# TYPE {prefix}_file_bytes gauge",
+            f'{prefix}_file_bytes{{direction="read"}} {summary["bytes_read"]}',
+            f'{prefix}_file_bytes{{direction="written"}} {summary["bytes_written"]}',
+            f"# HELP {prefix}_worker_files Files processed per worker process in the last run",
+            f"# TYPE {prefix}_worker_files gauge",
+        ]
+        for pid, worker in sorted(summary['workers'].items()):
+            lines.append(f'{prefix}_worker_files{{pid="{pid}"}} {worker["files"]}')
+        lines += [
+            f"# HELP {prefix}_worker_busy_seconds Processing time per worker process in the last run",
+            f"# TYPE {prefix}_worker_busy_seconds gauge",
+        ]
+        for pid, worker in sorted(summary['workers'].items()):
+            lines.append(f'{prefix}_worker_busy_seconds{{pid="{pid}"}} {worker["seconds"]:.6f}')
+        if self.memory is not None:
+            lines += [
+                f"# HELP {prefix}_tracemalloc_peak_bytes Peak traced Python memory in the last run",
+                f"# TYPE {prefix}_tracemalloc_peak_bytes gauge",
+                f"{prefix}_tracemalloc_peak_bytes {self.memory['peak_bytes']}",
+            ]
+        lines += [
+            f"# HELP {prefix}_last_run_timestamp_seconds Unix time the last run finished",
+            f"# TYPE {prefix}_last_run_timestamp_seconds gauge",
+            f"{prefix}_last_run_timestamp_seconds {time.time():.0f}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Prometheus textfile 기록 (임시 파일 + os.replace, 수집 중 부분 파일 방지)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{path.name}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text())
+        os.replace(temp_path, path)
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+수정 전후 센서 데이터 무결성 확인
+
+메타데이터 수정이 센서 데이터를 건드리지 않았는지 파일마다 확인합니다.
+확인에 실패하면 DataIntegrityError를 발생시킵니다.
+
+.gt3x (ZIP):
+  - 수정 전 중앙 디렉토리의 엔트리별 CRC32/크기를 기록 (압축 해제 없음)
+  - 새 아카이브의 중앙 디렉토리와 로컬 헤더에서 교체하지 않은 엔트리(log.bin, calibration.json 등)의
+    CRC32/크기가 같은지 확인 (압축 해제 없음, 원본 교체 전에 확인하므로 실패 시 원본 유지)
+  - log.bin의 Bio METADATA 패킷을 교체한 경우, 원본 CRC32와 교체한 패킷만으로
+    새 log.bin의 CRC32를 계산해 비교 (crc32_combine - 나머지 패킷은 다시 읽지 않음)
+.agd (SQLite):
+  - settings(와 인덱스), freelist 페이지와 파일 헤더를 뺀 모든 페이지(data, capsense 등의
+    행이 그대로 들어 있음)의 CRC32를 기록 (1MiB 단위 순차 읽기, settings 페이지만 dbstat으로 조회)
+  - dbstat을 쓸 수 없거나 auto_vacuum 파일이면 settings 외 테이블을 rowid 순 청크로 읽어 행 해시
+  - 수정(커밋) 전에 기록하고 커밋 후 다시 계산해 비교 (다르면 바뀐 페이지의 테이블 이름 보고)
+
+사용 예시:
+    from integrity import DataIntegrityError, record_agd, verify_agd
+    before = record_agd(path)
+    ...  # settings 수정
+    verify_agd(path, before)   # 센서 데이터가 바뀌었으면 DataIntegrityError
+"""
+
+import hashlib
+import sqlite3
+import struct
+import zipfile
+import zlib
+from array import array
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, NamedTuple, Optional, Set, Tuple
+
+from gt3x_archive import LOCAL_HEADER, LOCAL_HEADER_SIGNATURE
+
+
+# 무결성 확인 대상에서 제외하는 .agd 테이블 (메타데이터)
+AGD_METADATA_TABLES = frozenset({"settings"})
+
+# 행 해시 시 한 번에 읽을 행 수
+DIGEST_CHUNK_ROWS = 4096
+
+# 페이지 CRC32 계산 시 한 번에 읽을 크기 (바이트)
+DIGEST_BLOCK_SIZE = 1024 * 1024
+
+# SQLite 파일 헤더 / freelist (첫 trunk 페이지, 전체 freelist 페이지 수)
+SQLITE_HEADER_SIZE = 100
+SQLITE_FREELIST_OFFSET = 32
+SQLITE_FREELIST = struct.Struct('>II')
+
+# 로컬 헤더 플래그 / ZIP64 크기 표시
+FLAG_DATA_DESCRIPTOR = 0x08
+ZIP64_MARKER = 0xFFFFFFFF
+
+# CRC-32 (IEEE, 반사) 다항식
+CRC32_POLYNOMIAL = 0xEDB88320
+
+EntryChecksum = Tuple[int, int]  # (CRC32, 압축 해제 크기)
+
+
+class DataIntegrityError(Exception):
+    """수정 후 센서 데이터(메타데이터 외 영역)가 원본과 다름"""
+
+
+# ============================================================================
+# CRC32 결합 (zlib crc32_combine)
+# ============================================================================
+
+def _gf2_times(matrix, vector: int) -> int:
+    result = 0
+    index = 0
+    while vector:
+        if vector & 1:
+            result ^= matrix[index]
+        vector >>= 1
+        index += 1
+    return result
+
+
+def _gf2_square(matrix):
+    return [_gf2_times(matrix, matrix[n]) for n in range(32)]
+
+
+def crc32_combine(crc1: int, crc2: int, length2: int) -> int:
+    """crc32(A + B) 계산 (crc1 = crc32(A), crc2 = crc32(B), length2 = len(B))
+
+    B를 다시 읽지 않고 GF(2) 행렬 제곱으로 A의 CRC를 B 길이만큼 이동합니다 (O(log n)).
+    """
+    if length2 <= 0:
+        return crc1
+
+    # 0 비트 하나를 처리하는 연산자 → 제곱해서 0 바이트 단위로
+    odd = [CRC32_POLYNOMIAL] + [1 << n for n in range(31)]
+    even = _gf2_square(odd)
+    odd = _gf2_square(even)
+
+    while True:
+        even = _gf2_square(odd)
+        if length2 & 1:
+            crc1 = _gf2_times(even, crc1)
+        length2 >>= 1
+        if not length2:
+            break
+        odd = _gf2_square(even)
+        if length2 & 1:
+            crc1 = _gf2_times(odd, crc1)
+        length2 >>= 1
+        if not length2:
+            break
+    return crc1 ^ crc2
+
+
+# ============================================================================
+# .gt3x (ZIP 엔트리 CRC32)
+# ============================================================================
+
+def record_gt3x(zf: zipfile.ZipFile) -> Dict[str, EntryChecksum]:
+    """중앙 디렉토리의 엔트리별 (CRC32, 크기) 기록 (압축 해제 없음)"""
+    return {info.filename: (info.CRC, info.file_size) for info in zf.infolist()}
+
+
+def expected_rewritten_entry(original: EntryChecksum,
+                             replaced: Optional[Tuple[int, int, bytes, bytes]]) -> EntryChecksum:
+    """구간 하나만 교체한 엔트리의 (CRC32, 크기) 계산
+
+    원본 = 앞부분 + 원본 구간 + 뒷부분, 새 엔트리 = 앞부분 + 새 구간 + 뒷부분일 때
+    뒷부분을 다시 읽지 않고 원본 CRC32에서 계산합니다.
+
+    Args:
+        original: 원본 (CRC32, 크기)
+        replaced: (구간 위치, 앞부분 CRC32, 원본 구간, 새 구간) 또는 None (교체 없음)
+            (BioMetadataRewriter.replaced)
+
+    Returns:
+        (CRC32, 크기): 뒷부분이 원본과 같을 때 새 엔트리의 값
+    """
+    if replaced is None:
+        return original
+
+    crc, size = original
+    offset, prefix_crc, old_bytes, new_bytes = replaced
+    suffix_size = size - offset - len(old_bytes)
+    if suffix_size < 0:
+        raise DataIntegrityError(f"Replaced range exceeds entry size ({offset + len(old_bytes)} > {size})")
+
+    # crc(앞+구간+뒤) = shift(crc(앞+구간), len(뒤)) ^ crc(뒤) 이므로 crc(뒤)를 소거
+    old_prefix = crc32_combine(prefix_crc, zlib.crc32(old_bytes), len(old_bytes))
+    new_prefix = crc32_combine(prefix_crc, zlib.crc32(new_bytes), len(new_bytes))
+    expected_crc = crc ^ crc32_combine(old_prefix ^ new_prefix, 0, suffix_size)
+    return expected_crc, size - len(old_bytes) + len(new_bytes)
+
+
+def _local_header_checksum(zf: zipfile.ZipFile, info: zipfile.ZipInfo) -> Optional[EntryChecksum]:
+    """엔트리 로컬 헤더의 (CRC32, 크기) (데이터 디스크립터/ZIP64이면 None)"""
+    zf.fp.seek(info.header_offset)
+    header = zf.fp.read(LOCAL_HEADER.size)
+    if len(header) < LOCAL_HEADER.size:
+        raise DataIntegrityError(f"{info.filename}: truncated local header")
+    fields = LOCAL_HEADER.unpack(header)
+    if fields[0] != LOCAL_HEADER_SIGNATURE:
+        raise DataIntegrityError(f"{info.filename}: local header not found at offset {info.header_offset}")
+    flag_bits, crc, file_size = fields[3], fields[7], fields[9]
+    if flag_bits & FLAG_DATA_DESCRIPTOR or file_size == ZIP64_MARKER:
+        return None
+    return crc, file_size
+
+
+def verify_gt3x(zf: zipfile.ZipFile, original: Dict[str, EntryChecksum],
+                replaced: Iterable[str] = (), expected: Optional[Dict[str, EntryChecksum]] = None):
+    """새 아카이브의 엔트리 CRC32/크기 확인 (압축 해제 없음)
+
+    Args:
+        zf: 새 아카이브 (기록한 핸들로 연 ZipFile)
+        original: record_gt3x 결과 (수정 전)
+        replaced: 내용이 바뀌어도 되는 엔트리 (info.txt 등 메타데이터)
+        expected: 일부만 교체한 엔트리의 기대 (CRC32, 크기) (expected_rewritten_entry)
+
+    Raises:
+        DataIntegrityError: 엔트리가 없어졌거나 CRC32/크기가 다름
+    """
+    expected = dict(expected or {})
+    replaced = set(replaced) - set(expected)
+    entries = {info.filename: info for info in zf.infolist()}
+
+    problems = []
+    for name in sorted(set(original) | set(entries)):
+        if name in replaced:
+            continue
+        info = entries.get(name)
+        if info is None:
+            problems.append(f"{name}: 엔트리 없음")
+            continue
+        if name not in original:
+            problems.append(f"{name}: 새 엔트리")
+            continue
+
+        want = expected.get(name, original[name])
+        actual = (info.CRC, info.file_size)
+        local = _local_header_checksum(zf, info)
+        if actual != want:
+            problems.append(f"{name}: CRC32 {want[0]:08X}/{want[1]}B → {actual[0]:08X}/{actual[1]}B")
+        elif local is not None and local != want:
+            problems.append(f"{name}: 로컬 헤더 CRC32 {local[0]:08X}/{local[1]}B (중앙 디렉토리 {want[0]:08X}/{want[1]}B)")
+
+    if problems:
+        raise DataIntegrityError("; ".join(problems))
+
+
+# ============================================================================
+# .agd (SQLite 페이지/행 해시)
+# ============================================================================
+
+class AgdDigest(NamedTuple):
+    """.agd 센서 데이터 해시"""
+    method: str                     # 'pages' (페이지별 CRC32) 또는 'rows' (테이블별 행 해시)
+    page_size: int                  # pages 방식의 페이지 크기
+    digests: Dict[object, object]   # (첫 페이지, 끝 페이지) → 페이지별 CRC32 array, 또는 테이블 이름 → 해시
+
+
+def _metadata_objects(conn: sqlite3.Connection) -> Dict[str, str]:
+    """메타데이터 테이블과 그 인덱스 (이름 → 종류)"""
+    return {
+        name: kind for kind, name, table in conn.execute(
+            "SELECT type, name, tbl_name FROM sqlite_master WHERE type IN ('table', 'index')")
+        if table in AGD_METADATA_TABLES
+    }
+
+
+def _freelist_pages(f: BinaryIO, page_size: int) -> Set[int]:
+    """freelist trunk/leaf 페이지 번호 (파일 헤더 32~39바이트에서 시작)"""
+    f.seek(SQLITE_FREELIST_OFFSET)
+    trunk, count = SQLITE_FREELIST.unpack(f.read(SQLITE_FREELIST.size))
+    pages: Set[int] = set()
+    while trunk and trunk not in pages and len(pages) <= count:
+        pages.add(trunk)
+        f.seek((trunk - 1) * page_size)
+        next_trunk, leaf_count = SQLITE_FREELIST.unpack(f.read(SQLITE_FREELIST.size))
+        leaf_count = min(leaf_count, page_size // 4 - 2)
+        pages.update(struct.unpack(f'>{leaf_count}I', f.read(4 * leaf_count)))
+        trunk = next_trunk
+    return pages
+
+
+def _page_blocks(page_count: int, excluded: Set[int], block_pages: int) -> Iterator[Tuple[int, int]]:
+    """excluded를 뺀 연속 페이지 구간을 block_pages 이하 블록으로 나눔 (첫 페이지, 끝 페이지)"""
+    first = None
+    for page in range(1, page_count + 2):
+        if page <= page_count and page not in excluded:
+            if first is None:
+                first = page
+            if page - first + 1 == block_pages:
+                yield first, page
+                first = None
+        elif first is not None:
+            yield first, page - 1
+            first = None
+
+
+def _page_crcs(f: BinaryIO, page_size: int, first: int, last: int) -> array:
+    """페이지 구간의 페이지별 CRC32 (1번 페이지는 파일 헤더 100바이트 제외)"""
+    f.seek((first - 1) * page_size)
+    block = memoryview(f.read((last - first + 1) * page_size))
+    crcs = array('I')
+    for index in range(last - first + 1):
+        start = index * page_size
+        if first + index == 1:
+            start += SQLITE_HEADER_SIZE
+        crcs.append(zlib.crc32(block[start:(index + 1) * page_size]))
+    return crcs
+
+
+def _page_digests(conn: sqlite3.Connection, path, page_size: int) -> Dict[object, object]:
+    """settings(와 인덱스)·freelist 페이지를 뺀 모든 페이지의 CRC32 (블록 단위로 읽음)
+
+    settings 페이지는 dbstat에서 이름으로만 조회하므로 (해당 B-tree만 순회) 비용이 작고,
+    나머지 페이지는 큰 순차 읽기로 해시합니다.
+
+    Raises:
+        sqlite3.Error: dbstat을 사용할 수 없을 때
+    """
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    excluded: Set[int] = set()
+    for name in _metadata_objects(conn):
+        excluded.update(pageno for (pageno,) in conn.execute(
+            "SELECT pageno FROM dbstat WHERE name = ?", (name,)))
+
+    block_pages = max(1, DIGEST_BLOCK_SIZE // page_size)
+    with open(path, 'rb') as f:
+        excluded |= _freelist_pages(f, page_size)
+        return {(first, last): _page_crcs(f, page_size, first, last)
+                for first, last in _page_blocks(page_count, excluded, block_pages)}
+
+
+def _row_digests(conn: sqlite3.Connection, chunk_rows: int = DIGEST_CHUNK_ROWS) -> Dict[object, object]:
+    """테이블별 행 해시 (rowid 순 청크 스트리밍, settings와 SQLite 내부 테이블 제외)"""
+    tables = [name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+              if name not in AGD_METADATA_TABLES and not name.startswith('sqlite_')]
+    digests = {}
+    for name in tables:
+        digest = hashlib.sha256()
+        cursor = conn.execute(f'SELECT rowid, * FROM "{name}" ORDER BY rowid')
+        while True:
+            rows = cursor.fetchmany(chunk_rows)
+            if not rows:
+                break
+            digest.update(repr(rows).encode('utf-8'))
+        digests[name] = digest.hexdigest()
+    return digests
+
+
+def _connect(path) -> sqlite3.Connection:
+    return sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro", uri=True)
+
+
+def record_agd(path, method: Optional[str] = None) -> AgdDigest:
+    """.agd 센서 데이터 해시 계산 (읽기 전용)
+
+    Args:
+        path: .agd 파일 경로
+        method: 'pages' 또는 'rows' (None이면 가능하면 pages - dbstat을 쓸 수 없거나
+                auto_vacuum으로 커밋 시 페이지가 옮겨질 수 있으면 rows)
+
+    Returns:
+        AgdDigest
+    """
+    conn = _connect(path)
+    try:
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        if method == 'pages' or (method is None and conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 0):
+            try:
+                return AgdDigest('pages', page_size, _page_digests(conn, path, page_size))
+            except sqlite3.Error:
+                if method == 'pages':
+                    raise
+        return AgdDigest('rows', page_size, _row_digests(conn))
+    finally:
+        conn.close()
+
+
+def _page_owners(path, pages: Set[int]) -> str:
+    """바뀐 페이지의 테이블/인덱스 이름 (오류 메시지용, dbstat이 없으면 빈 문자열)"""
+    conn = _connect(path)
+    try:
+        owners = sorted({name for name, pageno in conn.execute("SELECT name, pageno FROM dbstat")
+                         if pageno in pages})
+    except sqlite3.Error:
+        return ""
+    finally:
+        conn.close()
+    return f" ({', '.join(owners)})" if owners else ""
+
+
+def verify_agd(path, before: AgdDigest):
+    """수정 후 .agd 센서 데이터 해시를 수정 전과 비교
+
+    pages 방식은 수정 전에 기록한 페이지들의 CRC32를 다시 계산합니다
+    (커밋이 새로 쓴 settings 페이지는 원래 settings/freelist/파일 끝 페이지이므로 제외됨).
+
+    Raises:
+        DataIntegrityError: 센서 데이터 페이지/행이 다름
+    """
+    if before.method == 'pages':
+        changed = []
+        with open(path, 'rb') as f:
+            for (first, last), crcs in before.digests.items():
+                current = _page_crcs(f, before.page_size, first, last)
+                if current != crcs:
+                    changed += [first + index for index, crc in enumerate(crcs)
+                                if index >= len(current) or current[index] != crc]
+        if changed:
+            pages = ", ".join(map(str, changed[:10]))
+            more = f" 외 {len(changed) - 10}개" if len(changed) > 10 else ""
+            raise DataIntegrityError(f"페이지 {pages}{more} 내용 변경{_page_owners(path, set(changed))}")
+        return
+
+    conn = _connect(path)
+    try:
+        after = _row_digests(conn)
+    finally:
+        conn.close()
+    problems = []
+    for name in sorted(set(before.digests) | set(after)):
+        if name not in after:
+            problems.append(f"{name}: 없어짐")
+        elif name not in before.digests:
+            problems.append(f"{name}: 새로 생김")
+        elif before.digests[name] != after[name]:
+            problems.append(f"{name}: 행 내용 변경")
+    if problems:
+        raise DataIntegrityError("; ".join(problems))
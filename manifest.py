@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+ActiGraph 파일 처리 기록(manifest)
+
+대상 디렉토리 옆 SQLite 파일에 파일별 처리 결과를 기록합니다.
+  - 경로, 크기, 수정 시각(mtime), 내용 지문(앞/뒤 블록 해시)
+  - 적용한 메타데이터(JSON), 연도/구분, 레지스트리 키, 상태
+
+다음 실행에서 크기/수정 시각(필요하면 내용 지문)과 레지스트리 키가 같고
+처리 완료(done)로 기록된 파일은 Excel을 읽기 전에 건너뜁니다.
+처리 시작 시 in_progress로 기록하므로, 중단된 실행은 완료되지 않은 파일부터
+다시 처리됩니다.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Dict, Optional
+
+
+# 기본 manifest 파일 이름 (첫 번째 대상 디렉토리에 생성)
+DEFAULT_MANIFEST_NAME = ".actigraph_manifest.sqlite"
+
+# 내용 지문에 사용할 앞/뒤 블록 크기
+FINGERPRINT_BLOCK_SIZE = 64 * 1024
+
+# 처리 상태
+STATUS_IN_PROGRESS = "in_progress"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+def file_fingerprint(path, size: Optional[int] = None) -> str:
+    """파일 내용 지문 (크기 + 앞/뒤 블록 blake2b)
+
+    .agd 헤더(settings)와 .gt3x 중앙 디렉토리(info.txt 교체 시 변경)가
+    각각 파일 앞/끝에 있으므로 전체를 읽지 않고도 수정 여부를 구분할 수 있습니다.
+    """
+    if size is None:
+        size = os.path.getsize(path)
+    digest = hashlib.blake2b(str(size).encode('ascii'), digest_size=16)
+    with open(path, 'rb') as f:
+        digest.update(f.read(FINGERPRINT_BLOCK_SIZE))
+        if size > FINGERPRINT_BLOCK_SIZE:
+            f.seek(max(FINGERPRINT_BLOCK_SIZE, size - FINGERPRINT_BLOCK_SIZE))
+            digest.update(f.read(FINGERPRINT_BLOCK_SIZE))
+    return digest.hexdigest()
+
+
+def manifest_path(config: Dict, target_directory) -> Path:
+    """manifest 파일 경로 (config.yaml의 manifest.path, 없으면 대상 디렉토리 안)"""
+    path = config.get('manifest', {}).get('path')
+    if path:
+        return Path(path).expanduser()
+    return Path(target_directory) / DEFAULT_MANIFEST_NAME
+
+
+class ProcessingManifest:
+    """파일별 처리 기록 (SQLite)"""
+
+    def __init__(self, path, read_only: bool = False):
+        """manifest 열기 (없으면 생성)
+
+        Args:
+            path: manifest SQLite 파일 경로
+            read_only: True이면 기록하지 않음 (dry-run)
+        """
+        self.path = Path(path)
+        self.read_only = read_only
+
+        if read_only and not self.path.exists():
+            self.conn = sqlite3.connect(":memory:")
+        elif read_only:
+            self.conn = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True)
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(str(self.path))
+            self.conn.execute("PRAGMA journal_mode=DELETE")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.row_factory = sqlite3.Row
+
+        if not read_only or self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name='files'").fetchone() is None:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY,
+                    source_path TEXT,
+                    size INTEGER,
+                    mtime_ns INTEGER,
+                    fingerprint TEXT,
+                    status TEXT NOT NULL,
+                    year INTEGER,
+                    division TEXT,
+                    registry_key TEXT,
+                    metadata_applied INTEGER NOT NULL DEFAULT 0,
+                    metadata TEXT,
+                    message TEXT,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+            self.conn.commit()
+
+    @staticmethod
+    def _key(path) -> str:
+        return os.path.abspath(path)
+
+    def lookup(self, path) -> Optional[Dict]:
+        """경로의 처리 기록 조회"""
+        row = self.conn.execute("SELECT * FROM files WHERE path = ?", (self._key(path),)).fetchone()
+        return dict(row) if row is not None else None
+
+    def is_unchanged(self, path, stat: os.stat_result, registry_keys: Dict,
+                     divisions: Optional[set], modify_metadata: bool) -> bool:
+        """이전 실행 이후 파일/레지스트리가 바뀌지 않아 건너뛸 수 있는지 확인
+
+        Args:
+            path: 파일 경로
+            stat: 파일 stat 결과 (스캐너에서 전달)
+            registry_keys: {연도: 레지스트리 키} (이번 실행 대상 연도)
+            divisions: 이번 실행 대상 구분 집합 (None이면 전체)
+            modify_metadata: 이번 실행에서 메타데이터도 수정하는지 여부
+
+        Returns:
+            bool: True이면 건너뛰기
+        """
+        record = self.lookup(path)
+        if record is None or record['status'] != STATUS_DONE:
+            return False
+        if record['year'] not in registry_keys or registry_keys[record['year']] != record['registry_key']:
+            return False
+        if divisions is not None and record['division'] not in divisions:
+            return False
+        if modify_metadata and not record['metadata_applied']:
+            return False
+        if record['size'] != stat.st_size:
+            return False
+        if record['mtime_ns'] == stat.st_mtime_ns:
+            return True
+
+        # 수정 시각만 바뀐 경우 (동기화 도구 등) 내용 지문으로 확인
+        try:
+            if file_fingerprint(path, stat.st_size) != record['fingerprint']:
+                return False
+        except OSError:
+            return False
+        if not self.read_only:
+            self.conn.execute("UPDATE files SET mtime_ns = ? WHERE path = ?",
+                              (stat.st_mtime_ns, self._key(path)))
+            self.conn.commit()
+        return True
+
+    def interrupted_count(self) -> int:
+        """이전 실행에서 처리 중 중단된 파일 수"""
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM files WHERE status = ?", (STATUS_IN_PROGRESS,)).fetchone()[0]
+
+    def mark_started(self, path, stat: os.stat_result):
+        """처리 시작 기록 (중단 시 다음 실행에서 재처리)"""
+        if self.read_only:
+            return
+        self.conn.execute("""
+            INSERT INTO files (path, source_path, size, mtime_ns, status, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(path) DO UPDATE SET
+                size = excluded.size, mtime_ns = excluded.mtime_ns,
+                status = excluded.status, updated_at = excluded.updated_at
+        """, (self._key(path), self._key(path), stat.st_size, stat.st_mtime_ns,
+              STATUS_IN_PROGRESS, self._now()))
+        self.conn.commit()
+
+    def mark_done(self, source_path, path, year: int, division: str, registry_key: Optional[str],
+                  metadata: Optional[Dict], message: str):
+        """처리 완료 기록 (파일명이 바뀌었으면 새 경로로 기록)
+
+        Args:
+            source_path: 처리 전 경로
+            path: 처리 후 경로 (이름 변경 후)
+            year, division: 적용한 연도/구분
+            registry_key: 해당 연도 레지스트리 키
+            metadata: 적용한 메타데이터 (파일명만 변경했으면 None)
+            message: 처리 결과 메시지
+        """
+        if self.read_only:
+            return
+        stat = os.stat(path)
+        fingerprint = file_fingerprint(path, stat.st_size)
+        metadata_json = json.dumps(metadata, ensure_ascii=False, default=str) if metadata else None
+        with self.conn:
+            if self._key(source_path) != self._key(path):
+                self.conn.execute("DELETE FROM files WHERE path = ?", (self._key(source_path),))
+            self.conn.execute("""
+                INSERT OR REPLACE INTO files
+                    (path, source_path, size, mtime_ns, fingerprint, status, year, division,
+                     registry_key, metadata_applied, metadata, message, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (self._key(path), self._key(source_path), stat.st_size, stat.st_mtime_ns,
+                  fingerprint, STATUS_DONE, year, division, registry_key,
+                  1 if metadata else 0, metadata_json, message, self._now()))
+
+    def mark_failed(self, path, message: str):
+        """처리 실패 기록 (다음 실행에서 다시 처리)"""
+        if self.read_only:
+            return
+        self.conn.execute("UPDATE files SET status = ?, message = ?, updated_at = ? WHERE path = ?",
+                          (STATUS_FAILED, message, self._now(), self._key(path)))
+        self.conn.commit()
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.datetime.now().isoformat(timespec='seconds')
+
+    def close(self):
+        self.conn.close()
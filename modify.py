@@ -8,10 +8,14 @@ ActiGraph 파일 메타데이터 수정 스크립트
     # 테스트 모드 (Progress 02 검증용)
     conda run -n module python modify.py --test
 
+    # in-place 모드로 남은 .gt3x 고아 엔트리 정리
+    conda run -n module python modify.py --compact temp_test
+
     # 프로그래밍 방식 사용 (Progress 04에서 사용)
     from modify import ActiGraphModifier
     modifier = ActiGraphModifier()
     modifier.modify_agd_file(path, metadata)
+    result = modifier.modify_and_verify(path, metadata)   # 필드별 {expected, actual, ok}
 """
 
 import argparse
@@ -20,12 +24,15 @@ import os
 import shutil
 import sqlite3
 import sys
-import tempfile
 import zipfile
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 
-import yaml
+from gt3x_archive import append_entries, compact_archive, replace_entries
+from gt3x_log import BioMetadataRewriter, find_bio_metadata
+from instrument import Instrumentation
+from integrity import (DataIntegrityError, expected_rewritten_entry, record_agd, record_gt3x,
+                       verify_agd, verify_gt3x)
 
 
 # ============================================================================
@@ -61,21 +68,71 @@ GT3X_FIELDS = {
     "limb": "Limb",
 }
 
+# .gt3x log.bin Bio METADATA JSON 키
+GT3X_BIO_FIELDS = {
+    "subjectname": "SubjectName",
+    "sex": "Sex",
+    "height": "Height",
+    "mass": "Mass",
+    "age": "Age",
+    "dateOfBirth": "DateOfBirth",
+    "side": "Side",
+    "dominance": "Dominance",
+    "limb": "Limb",
+}
+
 # 기본값
 DEFAULT_LIMB = "Waist"
 
 
+def parse_info_txt(content: str) -> Dict[str, str]:
+    """info.txt 내용 파싱 (Key: Value)
+
+    Args:
+        content: info.txt 문자열
+
+    Returns:
+        dict: 키-값 딕셔너리
+    """
+    info_dict = {}
+    for line in content.strip().split('\n'):
+        if ':' in line:
+            key, value = line.split(':', 1)
+            info_dict[key.strip()] = value.strip()
+    return info_dict
+
+
 class ActiGraphModifier:
     """ActiGraph 파일 (.agd, .gt3x) 메타데이터 수정 클래스"""
 
-    def __init__(self, config_path: str = "config.yaml"):
+    def __init__(self, config_path: str = "config.yaml", config: Optional[Dict] = None,
+                 metrics: Optional[Instrumentation] = None):
         """설정 파일을 로드하고 초기화
 
         Args:
             config_path: config.yaml 파일 경로
+            config: 이미 로드된 설정 dict (지정 시 config_path는 읽지 않음)
+            metrics: 단계별 측정기 (sqlite_write, zip_rewrite, verify, integrity 단계 기록)
         """
-        with open(config_path, 'r', encoding='utf-8') as f:
-            self.config = yaml.safe_load(f)
+        if config is not None:
+            self.config = config
+        else:
+            import yaml
+
+            with open(config_path, 'r', encoding='utf-8') as f:
+                self.config = yaml.safe_load(f)
+
+        # 마지막 .agd 수정에서 필드별 변경된 행 수 (write_agd_settings 결과)
+        self.last_settings_changes: Dict[str, int] = {}
+
+        # 마지막 수정-검증 결과 {메타데이터 키: {'expected', 'actual', 'ok'}}
+        self.last_verification: Dict[str, Dict] = {}
+
+        # 단계별 측정 (지정하지 않으면 기록하지 않음)
+        self.metrics = metrics or Instrumentation(enabled=False)
+
+        # 수정 전후 센서 데이터 무결성 확인 (integrity 모듈)
+        self.check_integrity = bool((self.config.get('integrity') or {}).get('enabled', True))
 
     def datetime_to_ticks(self, dt: datetime.datetime) -> int:
         """datetime을 Windows DateTime.Ticks로 변환
@@ -129,120 +186,248 @@ class ActiGraphModifier:
 
         return (mapping[hand]['side'], mapping[hand]['dominance'])
 
-    def _create_backup(self, file_path: str) -> str:
-        """파일 백업 생성
-
-        Args:
-            file_path: 백업할 파일 경로
-
-        Returns:
-            str: 백업 파일 경로
-        """
-        backup_path = f"{file_path}.bak"
-        shutil.copy2(file_path, backup_path)
-        return backup_path
-
     def _restore_backup(self, original_path: str, backup_path: str):
         """백업에서 복원
 
+        수정은 전체 파일 복사 없이 원자적으로 커밋되므로(.agd: SQLite 트랜잭션,
+        .gt3x: 임시 파일 + os.replace) 정상 동작 중에는 사용하지 않습니다.
+        이전 버전이 중단되며 남긴 .bak 파일 복구(recover_interrupted)에만 사용합니다.
+
         Args:
             original_path: 원본 파일 경로
             backup_path: 백업 파일 경로
         """
         if os.path.exists(backup_path):
-            shutil.copy2(backup_path, original_path)
-            os.remove(backup_path)
+            os.replace(backup_path, original_path)
 
-    def modify_agd_file(self, file_path: str, metadata: Dict) -> bool:
-        """.agd 파일 (SQLite) 메타데이터 수정
+    def recover_interrupted(self, file_path: str) -> bool:
+        """중단된 수정 복구 (크래시 복구 전용)
+
+        이전 버전의 전체 복사 백업(.bak)이 남아 있으면 원본으로 복원합니다.
+        SQLite 핫 저널(-journal)은 다음 연결 시 SQLite가 자동으로 롤백하고,
+        .gt3x 임시 파일(.<파일명>.*.tmp)은 원본을 건드리지 않으므로 별도 복구가 필요 없습니다.
 
         Args:
-            file_path: .agd 파일 경로
-            metadata: 수정할 메타데이터
-                - subjectname: str (이름)
-                - sex: str ("Male" or "Female")
-                - height: int (cm)
-                - mass: int (kg)
-                - age: int
-                - dateOfBirth: datetime 또는 int (Ticks)
-                - hand: str ("오" or "왼") - side/dominance로 자동 변환
-                - limb: str (Optional, default "Waist")
+            file_path: 대상 파일 경로
 
         Returns:
-            bool: 성공 여부
+            bool: 백업에서 복원했으면 True
         """
-        backup_path = None
-        try:
-            # 백업 생성
-            backup_path = self._create_backup(file_path)
+        backup_path = f"{file_path}.bak"
+        if not os.path.exists(backup_path):
+            return False
 
-            # SQLite 연결
-            conn = sqlite3.connect(file_path)
-            cursor = conn.cursor()
+        print(f"  ⚠️  중단된 수정 감지, 백업에서 복원: {os.path.basename(backup_path)}")
+        self._restore_backup(file_path, backup_path)
+        return True
 
-            # 필드 매핑 (상수 사용)
-            field_mapping = AGD_FIELDS
+    def _prepare_updates(self, metadata: Dict, field_mapping: Dict[str, str]) -> Dict[str, str]:
+        """메타데이터를 파일 필드명 → 문자열 값으로 변환
+
+        Args:
+            metadata: 수정할 메타데이터 (modify_agd_file 참고)
+            field_mapping: AGD_FIELDS 또는 GT3X_FIELDS
+
+        Returns:
+            dict: {필드명: 값}
+        """
+        updates = {}
+
+        # 기본 필드
+        for key in ['subjectname', 'sex', 'height', 'mass', 'age']:
+            if key in metadata:
+                updates[field_mapping[key]] = str(metadata[key])
+
+        # dateOfBirth 변환
+        if 'dateOfBirth' in metadata:
+            dob = metadata['dateOfBirth']
+            if isinstance(dob, datetime.datetime):
+                dob_ticks = self.datetime_to_ticks(dob)
+            else:
+                dob_ticks = int(dob)
+            updates[field_mapping['dateOfBirth']] = str(dob_ticks)
+
+        # 손잡이 매핑
+        if 'hand' in metadata:
+            side, dominance = self.map_handedness(metadata['hand'])
+            updates[field_mapping['side']] = side
+            updates[field_mapping['dominance']] = dominance
 
-            # 메타데이터 준비
-            updates = {}
+        # limb 기본값
+        if 'limb' in metadata:
+            updates[field_mapping['limb']] = str(metadata['limb'])
+        else:
+            updates[field_mapping['limb']] = DEFAULT_LIMB
 
-            # 기본 필드
-            if 'subjectname' in metadata:
-                updates[field_mapping['subjectname']] = str(metadata['subjectname'])
+        return updates
 
-            if 'sex' in metadata:
-                updates[field_mapping['sex']] = str(metadata['sex'])
+    def _compare_fields(self, updates: Dict[str, str], actual: Dict[str, str],
+                        field_mapping: Dict[str, str]) -> Dict[str, Dict]:
+        """기록한 값과 파일에서 읽은 값을 필드별로 비교
 
-            if 'height' in metadata:
-                updates[field_mapping['height']] = str(metadata['height'])
+        Args:
+            updates: _prepare_updates 결과 {필드명: 기대값}
+            actual: 파일에서 읽은 {필드명: 값}
+            field_mapping: AGD_FIELDS 또는 GT3X_FIELDS
 
-            if 'mass' in metadata:
-                updates[field_mapping['mass']] = str(metadata['mass'])
+        Returns:
+            dict: {메타데이터 키: {'expected': str, 'actual': str, 'ok': bool}}
+        """
+        results = {}
+        for key, field_name in field_mapping.items():
+            if field_name not in updates:
+                continue
+            actual_value = actual.get(field_name)
+            actual_value = '' if actual_value is None else str(actual_value)
+            results[key] = {
+                'expected': updates[field_name],
+                'actual': actual_value,
+                'ok': actual_value == updates[field_name],
+            }
+            if not results[key]['ok']:
+                print(f"  ❌ Mismatch in {key}: expected '{updates[field_name]}', got '{actual_value}'")
+        return results
+
+    def write_agd_settings(self, conn: sqlite3.Connection, updates: Dict[str, str],
+                           verify: bool = False) -> Dict[str, int]:
+        """settings 테이블 일괄 기록 (단일 트랜잭션, upsert)
+
+        모든 필드를 하나의 명시적 트랜잭션에서 executemany로 기록하고,
+        settings 테이블에 없는 필드는 새 행으로 추가합니다.
+        실패 시 트랜잭션 전체가 롤백됩니다.
+
+        verify=True이면 COMMIT 전에 같은 연결에서 기록한 값을 다시 읽어 비교하고
+        (결과는 last_verification), 하나라도 다르면 롤백합니다.
 
-            if 'age' in metadata:
-                updates[field_mapping['age']] = str(metadata['age'])
+        Args:
+            conn: isolation_level=None으로 연 SQLite 연결
+            updates: {settingName: settingValue}
+            verify: True이면 커밋 전 검증
 
-            # dateOfBirth 변환
-            if 'dateOfBirth' in metadata:
-                dob = metadata['dateOfBirth']
-                if isinstance(dob, datetime.datetime):
-                    dob_ticks = self.datetime_to_ticks(dob)
-                else:
-                    dob_ticks = int(dob)
-                updates[field_mapping['dateOfBirth']] = str(dob_ticks)
-
-            # 손잡이 매핑
-            if 'hand' in metadata:
-                side, dominance = self.map_handedness(metadata['hand'])
-                updates[field_mapping['side']] = side
-                updates[field_mapping['dominance']] = dominance
-
-            # limb 기본값
-            if 'limb' in metadata:
-                updates[field_mapping['limb']] = str(metadata['limb'])
-            else:
-                updates[field_mapping['limb']] = DEFAULT_LIMB
+        Returns:
+            dict: {settingName: 변경된 행 수} (같은 값이면 0, 새로 추가되면 1, 롤백되면 0)
+        """
+        # 쓰기 중 pragma (연결 단위 설정 - 연결 종료 시 원복)
+        # 파일당 커밋이 1회이므로 저널은 기본(DELETE) 유지 - 공유 폴더에 -journal 파일을 남기지 않음
+        # NORMAL: 커밋 시 fsync 횟수 감소, temp_store=MEMORY: 임시 B-tree를 디스크에 쓰지 않음
+        conn.execute("PRAGMA journal_mode=DELETE")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+
+        names = list(updates)
+        placeholders = ','.join('?' * len(names))
+        changes = {name: 0 for name in names}
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # 현재 값 조회 (필드별 변경 행 수 계산)
+            existing = conn.execute(
+                f"SELECT settingName, settingValue FROM settings WHERE settingName IN ({placeholders})",
+                names
+            ).fetchall()
+            for name, value in existing:
+                if value != updates[name]:
+                    changes[name] += 1
+
+            # 값이 다른 행만 UPDATE
+            conn.executemany(
+                "UPDATE settings SET settingValue=? WHERE settingName=? AND settingValue IS NOT ?",
+                [(value, name, value) for name, value in updates.items()]
+            )
 
-            # UPDATE 실행
-            for field_name, value in updates.items():
-                cursor.execute(
-                    "UPDATE settings SET settingValue=? WHERE settingName=?",
-                    (value, field_name)
+            # 없는 필드는 INSERT
+            present = {name for name, _ in existing}
+            missing = [name for name in names if name not in present]
+            if missing:
+                conn.executemany(
+                    "INSERT INTO settings (settingName, settingValue) VALUES (?, ?)",
+                    [(name, updates[name]) for name in missing]
                 )
+                for name in missing:
+                    changes[name] = 1
+                print(f"  ℹ️  settings 테이블에 없던 필드 추가: {', '.join(missing)}")
+
+            # 커밋 전 같은 연결에서 검증 (불일치 시 롤백)
+            if verify:
+                with self.metrics.stage('verify'):
+                    actual = dict(conn.execute(
+                        f"SELECT settingName, settingValue FROM settings WHERE settingName IN ({placeholders})",
+                        names
+                    ).fetchall())
+                    self.last_verification = self._compare_fields(updates, actual, AGD_FIELDS)
+                if not all(field['ok'] for field in self.last_verification.values()):
+                    conn.execute("ROLLBACK")
+                    return {name: 0 for name in names}
+
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        return changes
+
+    def modify_agd_file(self, file_path: str, metadata: Dict, verify: bool = False) -> bool:
+        """.agd 파일 (SQLite) 메타데이터 수정
 
-            conn.commit()
-            conn.close()
+        .bak 전체 복사 없이 단일 SQLite 트랜잭션으로 기록하며,
+        실패 시 트랜잭션이 롤백되어 원본이 그대로 유지됩니다.
 
-            # 백업 삭제
-            if backup_path and os.path.exists(backup_path):
-                os.remove(backup_path)
+        무결성 확인이 켜져 있으면 수정 전에 settings 외 테이블(data 등)의 해시를 기록하고
+        커밋 후 다시 계산해 비교합니다.
 
-            return True
+        Args:
+            file_path: .agd 파일 경로
+            metadata: 수정할 메타데이터
+                - subjectname: str (이름)
+                - sex: str ("Male" or "Female")
+                - height: int (cm)
+                - mass: int (kg)
+                - age: int
+                - dateOfBirth: datetime 또는 int (Ticks)
+                - hand: str ("오" or "왼") - side/dominance로 자동 변환
+                - limb: str (Optional, default "Waist")
+            verify: True이면 같은 트랜잭션에서 커밋 전 검증 (결과는 last_verification)
+
+        Returns:
+            bool: 성공 여부 (verify=True이면 검증 불일치 시 False, 파일 변경 없음)
 
+        Raises:
+            DataIntegrityError: 커밋 후 센서 데이터가 수정 전과 다름
+        """
+        self.last_verification = {}
+        try:
+            # 이전 실행이 남긴 백업 복구
+            self.recover_interrupted(file_path)
+
+            # 메타데이터 준비 (필드 매핑 상수 사용)
+            updates = self._prepare_updates(metadata, AGD_FIELDS)
+
+            # 수정 전 센서 데이터 해시
+            data_digest = None
+            if self.check_integrity:
+                with self.metrics.stage('integrity'):
+                    data_digest = record_agd(file_path)
+
+            # SQLite 연결 (트랜잭션은 write_agd_settings에서 명시적으로 관리)
+            conn = sqlite3.connect(file_path, isolation_level=None)
+            try:
+                with self.metrics.stage('sqlite_write'):
+                    self.last_settings_changes = self.write_agd_settings(conn, updates, verify=verify)
+            finally:
+                conn.close()
+
+            # 커밋 후 센서 데이터 확인
+            if data_digest is not None:
+                with self.metrics.stage('integrity'):
+                    verify_agd(file_path, data_digest)
+
+            return all(field['ok'] for field in self.last_verification.values())
+
+        except DataIntegrityError as e:
+            print(f"🚨 데이터 무결성 오류 ({Path(file_path).name}): {e}")
+            raise
         except Exception as e:
             print(f"❌ Error modifying .agd file: {e}")
-            if backup_path:
-                self._restore_backup(file_path, backup_path)
             return False
 
     def _parse_info_txt(self, content: str) -> Dict[str, str]:
@@ -254,12 +439,7 @@ class ActiGraphModifier:
         Returns:
             dict: 키-값 딕셔너리
         """
-        info_dict = {}
-        for line in content.strip().split('\n'):
-            if ':' in line:
-                key, value = line.split(':', 1)
-                info_dict[key.strip()] = value.strip()
-        return info_dict
+        return parse_info_txt(content)
 
     def _update_info_txt(self, content: str, metadata: Dict) -> str:
         """info.txt 내용 업데이트
@@ -274,43 +454,9 @@ class ActiGraphModifier:
             str: 업데이트된 info.txt 문자열
         """
         lines = content.strip().split('\n')
-        field_mapping = GT3X_FIELDS
 
         # 업데이트할 값 준비
-        updates = {}
-
-        if 'subjectname' in metadata:
-            updates[field_mapping['subjectname']] = str(metadata['subjectname'])
-
-        if 'sex' in metadata:
-            updates[field_mapping['sex']] = str(metadata['sex'])
-
-        if 'height' in metadata:
-            updates[field_mapping['height']] = str(metadata['height'])
-
-        if 'mass' in metadata:
-            updates[field_mapping['mass']] = str(metadata['mass'])
-
-        if 'age' in metadata:
-            updates[field_mapping['age']] = str(metadata['age'])
-
-        if 'dateOfBirth' in metadata:
-            dob = metadata['dateOfBirth']
-            if isinstance(dob, datetime.datetime):
-                dob_ticks = self.datetime_to_ticks(dob)
-            else:
-                dob_ticks = int(dob)
-            updates[field_mapping['dateOfBirth']] = str(dob_ticks)
-
-        if 'hand' in metadata:
-            side, dominance = self.map_handedness(metadata['hand'])
-            updates[field_mapping['side']] = side
-            updates[field_mapping['dominance']] = dominance
-
-        if 'limb' in metadata:
-            updates[field_mapping['limb']] = str(metadata['limb'])
-        else:
-            updates[field_mapping['limb']] = DEFAULT_LIMB
+        updates = self._prepare_updates(metadata, GT3X_FIELDS)
 
         # 현재 존재하는 필드 파악
         existing_keys = set()
@@ -352,62 +498,164 @@ class ActiGraphModifier:
 
         return '\n'.join(updated_lines) + '\n'
 
-    def modify_gt3x_file(self, file_path: str, metadata: Dict) -> bool:
+    def modify_gt3x_file(self, file_path: str, metadata: Dict, in_place: Optional[bool] = None,
+                         verify: bool = False, log_metadata: Optional[bool] = None) -> bool:
         """.gt3x 파일 (ZIP) 메타데이터 수정
 
-        info.txt만 수정하고 log.bin은 수정하지 않습니다.
+        기본적으로 info.txt만 수정하고 log.bin은 수정하지 않습니다.
+        압축 해제 없이 info.txt만 다시 인코딩하고, 나머지 엔트리는 압축된
+        바이트를 그대로 같은 디렉토리의 임시 파일로 복사한 뒤 원본을 교체합니다.
+
+        .bak 전체 복사는 하지 않습니다. 원본은 os.replace 시점에만 교체되므로
+        실패 시 그대로 유지됩니다.
+
+        in_place 모드에서는 새 info.txt를 아카이브 끝에 추가하고 중앙 디렉토리만
+        다시 기록합니다 (비용이 info.txt 크기에 비례). 이전 info.txt는 고아
+        엔트리로 남으며 `python modify.py --compact`로 정리합니다.
+
+        log_metadata 모드에서는 log.bin의 Bio METADATA 패킷 JSON도 같은 값으로
+        바꿉니다. log.bin을 스트리밍으로 압축 해제/재압축하므로(메모리 사용량 제한)
+        info.txt만 수정할 때보다 느리며, 이 경우 in_place 설정과 관계없이 전체를
+        다시 기록합니다.
+
+        verify=True이면 새 아카이브를 쓴 핸들에서 info.txt(와 Bio METADATA)를
+        다시 읽어 검증하고 (결과는 last_verification), 불일치 시 원본을 교체하지 않습니다.
+
+        무결성 확인이 켜져 있으면 원본 교체 전에 새 중앙 디렉토리의 엔트리 CRC32/크기를
+        원본과 비교합니다 (압축 해제 없음, log.bin을 다시 쓴 경우 기대 CRC32를 계산해 비교).
 
         Args:
             file_path: .gt3x 파일 경로
             metadata: 수정할 메타데이터 (modify_agd_file과 동일)
+            in_place: True이면 추가(in-place) 모드 (기본값: config.yaml의 gt3x.in_place)
+            verify: True이면 교체 전 검증
+            log_metadata: True이면 log.bin Bio METADATA도 수정 (기본값: config.yaml의 gt3x.log_metadata)
 
         Returns:
-            bool: 성공 여부
-        """
-        backup_path = None
-        try:
-            # 백업 생성
-            backup_path = self._create_backup(file_path)
+            bool: 성공 여부 (verify=True이면 검증 불일치 시 False, 파일 변경 없음)
 
-            # 임시 디렉토리 생성
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
+        Raises:
+            DataIntegrityError: 새 아카이브의 센서 데이터 엔트리가 원본과 다름 (원본 유지)
+        """
+        if in_place is None:
+            in_place = bool(self.config.get('gt3x', {}).get('in_place', False))
+        if log_metadata is None:
+            log_metadata = bool(self.config.get('gt3x', {}).get('log_metadata', False))
 
-                # ZIP 압축 해제
-                with zipfile.ZipFile(file_path, 'r') as zf:
-                    zf.extractall(temp_path)
+        self.last_verification = {}
+        try:
+            # 이전 실행이 남긴 백업 복구
+            self.recover_interrupted(file_path)
 
-                # info.txt 읽기 및 수정
-                info_txt_path = temp_path / 'info.txt'
-                if not info_txt_path.exists():
+            # info.txt 읽기 (log_metadata 모드면 Bio METADATA 패킷 존재 확인)
+            rewrite_log = False
+            bio_fields = {}
+            original_entries = None
+            with zipfile.ZipFile(file_path, 'r') as zf:
+                if 'info.txt' not in zf.namelist():
                     raise FileNotFoundError("info.txt not found in .gt3x file")
+                raw_content = zf.read('info.txt').decode('utf-8')
+
+                # 수정 전 엔트리 CRC32/크기 (중앙 디렉토리)
+                if self.check_integrity:
+                    original_entries = record_gt3x(zf)
+
+                if log_metadata and 'log.bin' in zf.namelist():
+                    with zf.open('log.bin') as stream:
+                        original_bio = find_bio_metadata(stream)
+                    # 장치가 기록한 키만 수정/검증 (SubjectName, Limb, Side, Dominance 등)
+                    if original_bio is not None:
+                        bio_fields = {key: name for key, name in GT3X_BIO_FIELDS.items() if name in original_bio}
+                    rewrite_log = bool(bio_fields)
+                    if not rewrite_log:
+                        print("  ℹ️  log.bin에 Bio METADATA 패킷 없음 - info.txt만 수정")
+
+            # 원본 줄바꿈(CRLF/LF) 유지
+            newline = '\r\n' if '\r\n' in raw_content else '\n'
+            original_content = raw_content.replace('\r\n', '\n')
+
+            updated_content = self._update_info_txt(original_content, metadata)
+            updated_content = updated_content.replace('\n', newline)
+
+            # 기록한 아카이브에서 info.txt(와 Bio METADATA)를 다시 읽어 필드 비교
+            updates = self._prepare_updates(metadata, GT3X_FIELDS)
+            bio_updates = {name: value for name, value in self._prepare_updates(metadata, GT3X_BIO_FIELDS).items()
+                           if name in bio_fields.values()}
+
+            def verify_archive(zf: zipfile.ZipFile) -> bool:
+                with self.metrics.stage('verify'):
+                    written = self._parse_info_txt(zf.read('info.txt').decode('utf-8'))
+                    self.last_verification = self._compare_fields(updates, written, GT3X_FIELDS)
+                    if rewrite_log:
+                        with zf.open('log.bin') as stream:
+                            written_bio = find_bio_metadata(stream) or {}
+                        bio_results = self._compare_fields(bio_updates, written_bio, bio_fields)
+                        self.last_verification.update(
+                            (f"bio.{key}", result) for key, result in bio_results.items()
+                        )
+                    return all(field['ok'] for field in self.last_verification.values())
+
+            # info.txt 교체 (log.bin 등은 raw copy 또는 그대로 유지)
+            replacements = {'info.txt': updated_content.encode('utf-8')}
+            if rewrite_log:
+                # Bio METADATA 패킷만 교체하며 log.bin 스트리밍 재기록
+                replacements['log.bin'] = BioMetadataRewriter(bio_updates)
+
+            # 원본 교체 전 센서 데이터 엔트리 확인 (불일치 시 DataIntegrityError)
+            def check_archive(zf: zipfile.ZipFile) -> bool:
+                if original_entries is not None:
+                    with self.metrics.stage('integrity'):
+                        expected = {}
+                        if rewrite_log:
+                            expected['log.bin'] = expected_rewritten_entry(
+                                original_entries['log.bin'], replacements['log.bin'].replaced)
+                        verify_gt3x(zf, original_entries, replaced=replacements, expected=expected)
+                return verify_archive(zf) if verify else True
+
+            verifier = check_archive if verify or original_entries is not None else None
+            with self.metrics.stage('zip_rewrite'):
+                if in_place and not rewrite_log:
+                    return append_entries(file_path, replacements, verifier)
+                else:
+                    return replace_entries(file_path, replacements, verifier)
 
-                with open(info_txt_path, 'r', encoding='utf-8') as f:
-                    original_content = f.read()
+        except DataIntegrityError as e:
+            print(f"🚨 데이터 무결성 오류 ({Path(file_path).name}): {e}")
+            raise
+        except Exception as e:
+            print(f"❌ Error modifying .gt3x file: {e}")
+            return False
 
-                updated_content = self._update_info_txt(original_content, metadata)
+    def modify_and_verify(self, file_path: str, metadata: Dict) -> Optional[Dict[str, Dict]]:
+        """메타데이터 수정과 검증을 한 번에 수행 (파일을 다시 열지 않음)
 
-                with open(info_txt_path, 'w', encoding='utf-8') as f:
-                    f.write(updated_content)
+        .agd는 같은 연결/트랜잭션에서 커밋 전에, .gt3x는 새 아카이브를 쓴 핸들에서
+        원본 교체 전에 검증합니다. 불일치하면 파일은 변경되지 않습니다.
 
-                # ZIP 재생성
-                with zipfile.ZipFile(file_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-                    for file in temp_path.rglob('*'):
-                        if file.is_file():
-                            arcname = file.relative_to(temp_path)
-                            zf.write(file, arcname)
+        Args:
+            file_path: .agd 또는 .gt3x 파일 경로
+            metadata: 수정할 메타데이터 (modify_agd_file과 동일)
 
-            # 백업 삭제
-            if backup_path and os.path.exists(backup_path):
-                os.remove(backup_path)
+        Returns:
+            dict: {메타데이터 키: {'expected': str, 'actual': str, 'ok': bool}}
+                  또는 None (수정 중 오류)
 
-            return True
+        Raises:
+            DataIntegrityError: 센서 데이터가 수정 전과 다름
+        """
+        file_ext = Path(file_path).suffix.lower()
+        if file_ext == '.agd':
+            success = self.modify_agd_file(file_path, metadata, verify=True)
+        elif file_ext == '.gt3x':
+            success = self.modify_gt3x_file(file_path, metadata, verify=True)
+        else:
+            print(f"❌ Unsupported file type: {file_path}")
+            return None
 
-        except Exception as e:
-            print(f"❌ Error modifying .gt3x file: {e}")
-            if backup_path:
-                self._restore_backup(file_path, backup_path)
-            return False
+        # 검증 불일치가 아닌 오류로 실패한 경우
+        if not success and all(field['ok'] for field in self.last_verification.values()):
+            return None
+        return self.last_verification
 
     def validate_agd_modification(self, file_path: str, expected: Dict) -> bool:
         """.agd 파일 수정 검증
@@ -669,6 +917,36 @@ def test_modifier():
         pass
 
 
+def compact_files(paths):
+    """in-place 모드로 남은 .gt3x 고아 엔트리 정리
+
+    Args:
+        paths: .gt3x 파일 또는 디렉토리 경로 리스트 (디렉토리는 *.gt3x 전체)
+    """
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(path.glob("*.gt3x")))
+        else:
+            files.append(path)
+
+    total = 0
+    for file in files:
+        try:
+            reclaimed = compact_archive(str(file))
+        except Exception as e:
+            print(f"❌ {file.name}: {e}")
+            continue
+
+        total += reclaimed
+        if reclaimed:
+            print(f"✅ {file.name}: {reclaimed:,} bytes 정리")
+        else:
+            print(f"⏭️  {file.name}: 정리할 엔트리 없음")
+
+    print(f"\n📊 총 {total:,} bytes 정리 ({len(files)}개 파일)")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="ActiGraph 파일 메타데이터 수정",
@@ -681,12 +959,22 @@ def main():
         help='Progress 02 검증 테스트 실행'
     )
 
+    parser.add_argument(
+        '--compact',
+        nargs='+',
+        metavar='PATH',
+        help='in-place 모드로 남은 .gt3x 고아 엔트리 정리 (파일 또는 디렉토리)'
+    )
+
     args = parser.parse_args()
 
     if args.test:
         test_modifier()
+    elif args.compact:
+        compact_files(args.compact)
     else:
         print("사용법: python modify.py --test")
+        print("       python modify.py --compact <파일 또는 디렉토리> ...")
         print("\nProgress 04에서는 프로그래밍 방식으로 import하여 사용합니다.")
         sys.exit(1)
 
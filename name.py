@@ -11,6 +11,13 @@ conda run -n module python name.py --week 40주차
 
 미리보기 모드
 conda run -n module python name.py --week 40주차 --dry
+
+여러 구분/연도 한 번에 처리 (파일별 구분은 착용 시작일로 자동 판별)
+conda run -n module python name.py --week 1주차-40주차
+conda run -n module python name.py --all --year 2024-2025
+
+여러 디렉토리/하위 폴더 탐색
+conda run -n module python name.py --week 40주차 --root D:/site1 --root D:/site2 --exclude "backup/*"
 """
 
 import argparse
@@ -18,46 +25,289 @@ import datetime
 import os
 import re
 import sys
+from itertools import chain, repeat
 from pathlib import Path
-from typing import Dict, Optional, Tuple
-
-import pandas as pd
-import yaml
+from typing import Dict, List, Optional, Set, Tuple, Union
 
+from instrument import Instrumentation
+from integrity import DataIntegrityError
+from manifest import ProcessingManifest, manifest_path
 from modify import ActiGraphModifier, FILE_EXTENSIONS
+from registry import cache_directory, load_registry_cache, registry_cache_key, save_registry_cache
+from scanner import scan_files
+from staging import LocalStaging
+from workbook import SheetTable, WorkbookReader
+
+# yaml/openpyxl은 필요한 경로에서만 import (--help, 캐시 적중 시 Excel 리더 로드 없음)
 
 
 class ActiGraphRenamer:
     def __init__(self, config_path: str = "config.yaml"):
         """설정 파일을 로드하고 초기화"""
+        import yaml
+
         with open(config_path, 'r', encoding='utf-8') as f:
             self.config = yaml.safe_load(f)
-        
-        self.serial_mapping_df = None
-        self.subject_info_df = None
-        
-    def load_data(self, year: int):
-        """Excel 파일에서 데이터 로드"""
+
+        # 로드된 연도 (year를 생략한 조회는 첫 번째 연도 사용)
+        self.year: Optional[int] = None
+        self.years: List[int] = []
+
+        # 조회용 인덱스 (load_data에서 1회 구성, 키에 연도 포함)
+        self.serial_index: Dict[str, int] = {}
+        self.subject_index: Dict[Tuple[int, str, int], List[Dict]] = {}
+        self.id_index: Dict[Tuple[str, str, int], int] = {}
+
+        # 구분 자동 판별용 인덱스: 관리번호/ID → [(착용시작일, 연도, 구분), ...] (착용시작일 순)
+        self.wear_index: Dict[int, List[Tuple[str, int, str]]] = {}
+        self.id_wear_index: Dict[str, List[Tuple[str, int, str]]] = {}
+
+        # 자동 판별 시 허용할 (연도, 구분) 집합 (None이면 로드된 전체)
+        self.division_filter: Optional[Set[Tuple[int, str]]] = None
+
+        # 레지스트리 캐시 사용 여부 (config.yaml의 cache.enabled, --no-cache로 끄기)
+        self.use_cache = bool(self.config.get('cache', {}).get('enabled', True))
+
+        # 처리 기록(manifest) 사용 여부 (config.yaml의 manifest.enabled, --no-manifest로 끄기)
+        self.use_manifest = bool(self.config.get('manifest', {}).get('enabled', True))
+
+        # 단계별 측정 (run에서 config.yaml의 instrumentation 설정으로 생성)
+        self.metrics = Instrumentation(enabled=False)
+
+        # 로컬 스테이징 (run에서 config.yaml의 staging.enabled일 때 생성, 없으면 원래 위치에서 수정)
+        self.staging: Optional[LocalStaging] = None
+
+    def load_data(self, year: Union[int, List[int]]):
+        """Excel 파일에서 데이터 로드
+
+        여러 연도를 지정하면 필요한 시트를 한 번에 읽습니다.
+        Excel은 openpyxl read-only 모드로 config.yaml columns에 지정된 컬럼만 읽습니다.
+        캐시가 유효하면(Excel 파일 크기/수정 시각, 시트, 컬럼 설정이 같으면)
+        Excel을 읽지 않고 캐시된 조회 인덱스를 사용합니다.
+
+        Args:
+            year: 연도 또는 연도 리스트 (시트 이름)
+        """
         print("📂 데이터 로드 중...")
 
-        # 관리번호-시리얼번호 매칭 데이터
+        self.years = [year] if isinstance(year, int) else list(year)
+        self.year = self.years[0]
+        self.serial_index = {}
+        self.subject_index = {}
+        self.id_index = {}
+        self.wear_index = {}
+        self.id_wear_index = {}
+
+        # 캐시에서 로드
+        cache_keys = {}
+        pending_years = []
+        serial_printed = False
+        for y in self.years:
+            if self.use_cache:
+                cache_keys[y] = registry_cache_key(self.config, str(y))
+                cached = load_registry_cache(cache_directory(self.config), cache_keys[y])
+                if cached is not None:
+                    if not serial_printed:
+                        print(f"  ✓ 관리번호-시리얼번호 매칭: {cached['serial_count']} 건 (캐시)")
+                        serial_printed = True
+                    print(f"  ✓ 대상자 정보 ({y}년): {cached['subject_count']} 건 (캐시)")
+                    self._merge_registry(y, cached)
+                    continue
+            pending_years.append(y)
+
+        if not pending_years:
+            return
+
+        # 관리번호-시리얼번호 매칭 데이터 (첫 번째 시트)
         serial_path = self.config['paths']['serial_mapping']
-        self.serial_mapping_df = pd.read_excel(serial_path)
-        print(f"  ✓ 관리번호-시리얼번호 매칭: {len(self.serial_mapping_df)} 건")
+        with WorkbookReader(serial_path) as reader:
+            serial_table = reader.read_sheet(None, self.config['columns']['serial_mapping'])
+        if serial_table.missing:
+            missing = [self.config['columns']['serial_mapping'][key] for key in serial_table.missing]
+            print(f"  ⚠️  경고: 관리번호-시리얼번호 파일에 컬럼 없음 ({', '.join(missing)})")
+        serial_index = self._build_serial_index(serial_table)
+        if not serial_printed:
+            print(f"  ✓ 관리번호-시리얼번호 매칭: {len(serial_table.rows)} 건")
 
-        # 대상자 정보 데이터 (연도별 시트)
+        # 대상자 정보 데이터 (연도별 시트, 필요한 시트만 읽기)
         subject_path = self.config['paths']['subject_info']
-        self.subject_info_df = pd.read_excel(subject_path, sheet_name=str(year))
+        subject_columns = self.config['columns']['subject_info']
+        with WorkbookReader(subject_path) as reader:
+            for y in pending_years:
+                # 중복 헤더 행 제외, 구분 컬럼 forward-fill (Excel의 병합된 셀 처리)
+                subject_table = reader.read_sheet(str(y), subject_columns, key='management_number',
+                                                  fill_down=('division',))
+
+                missing = [subject_columns[key] for key in ('division', 'management_number')
+                           if key in subject_table.missing]
+                if missing:
+                    print(f"  ⚠️  경고: {y}년 시트에 컬럼 없음 ({', '.join(missing)}), 건너뜀")
+                    for serial, management_number in serial_index.items():
+                        self.serial_index.setdefault(serial, management_number)
+                    continue
+
+                print(f"  ✓ 대상자 정보 ({y}년): {len(subject_table.rows)} 건")
+
+                registry = self._build_registry(serial_index, len(serial_table.rows), subject_table)
+                self._merge_registry(y, registry)
+
+                if y in cache_keys:
+                    save_registry_cache(cache_directory(self.config), cache_keys[y], registry)
+
+    @staticmethod
+    def _to_management_number(value) -> Optional[int]:
+        """관리번호 셀 값을 int로 변환 (비어있거나 숫자가 아니면 None)"""
+        if value is None:
+            return None
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            return None
+        if number != number or not number.is_integer():
+            return None
+        return int(number)
+
+    def _build_registry(self, serial_index: Dict[str, int], serial_count: int,
+                        subject_table: SheetTable) -> Dict:
+        """고유번호/관리번호/ID 조회용 dict 인덱스 구성 (시트 1개 단위, 캐시 저장 단위)
+
+        파일마다 시트 전체를 검색하는 대신, 로드 시점에
+        한 번만 인덱스를 만들어 조회를 O(1)로 처리합니다.
+        중복 키는 기존 조회 방식(첫 번째 행 사용)과 동일하게 먼저 나온 행이 우선합니다.
+
+        Args:
+            serial_index: _build_serial_index 결과
+            serial_count: 관리번호-시리얼번호 원본 행 수
+            subject_table: 대상자 정보 시트 (config 키 이름의 컬럼)
+
+        Returns:
+            dict:
+                - serial_index: 고유번호 → 관리번호
+                - subject_index: (관리번호, 구분) → 대상자 레코드 리스트
+                - id_index: (ID, 구분) → 관리번호
+                - wear_dates: [(착용시작일, 구분, 관리번호, ID), ...]
+                - serial_count, subject_count: 원본 행 수
+        """
+        subject_index = {}
+        id_index = {}
+        wear_dates = []
+        for row in subject_table.rows:
+            # 대상자 정보 (config 키 이름으로 레코드 구성)
+            record = dict(zip(subject_table.keys, row))
+
+            management_number = self._to_management_number(record.get('management_number'))
+            division = record.get('division')
+            if management_number is None or division is None:
+                continue
+            division = str(division)
+
+            subject_index.setdefault((management_number, division), []).append(record)
+
+            subject_id = record.get('id')
+            if subject_id is not None:
+                id_index.setdefault((str(subject_id), division), management_number)
+
+            wear_date = self._format_wear_date(record.get('wear_start_date'))
+            if wear_date is not None:
+                wear_dates.append((wear_date, division, management_number,
+                                   None if subject_id is None else str(subject_id)))
+
+        return {
+            'serial_index': serial_index,
+            'subject_index': subject_index,
+            'id_index': id_index,
+            'wear_dates': wear_dates,
+            'serial_count': serial_count,
+            'subject_count': len(subject_table.rows),
+        }
+
+    def _build_serial_index(self, serial_table: SheetTable) -> Dict[str, int]:
+        """고유번호 → 관리번호 인덱스 구성 (중복 시 먼저 나온 행 우선)"""
+        if serial_table.missing:
+            return {}
+
+        serial_position = serial_table.keys.index('serial_number')
+        mgmt_position = serial_table.keys.index('management_number')
+
+        serial_index = {}
+        for row in serial_table.rows:
+            serial = row[serial_position]
+            management_number = self._to_management_number(row[mgmt_position])
+            if serial is None or management_number is None:
+                continue
+            serial_index.setdefault(str(serial), management_number)
+        return serial_index
+
+    def _merge_registry(self, year: int, registry: Dict):
+        """시트 1개의 레지스트리를 연도를 포함한 키로 전체 인덱스에 병합"""
+        for serial, management_number in registry['serial_index'].items():
+            self.serial_index.setdefault(serial, management_number)
+
+        for (management_number, division), records in registry['subject_index'].items():
+            self.subject_index[(management_number, division, year)] = records
+
+        for (subject_id, division), management_number in registry['id_index'].items():
+            self.id_index[(subject_id, division, year)] = management_number
+
+        for wear_date, division, management_number, subject_id in registry['wear_dates']:
+            self.wear_index.setdefault(management_number, []).append((wear_date, year, division))
+            if subject_id is not None:
+                self.id_wear_index.setdefault(subject_id, []).append((wear_date, year, division))
+
+        for entries in (self.wear_index, self.id_wear_index):
+            for candidates in entries.values():
+                candidates.sort()
 
-        # 첫 번째 행 제거 (중복 헤더 행)
-        if len(self.subject_info_df) > 0 and pd.isna(self.subject_info_df.iloc[0]['관리번호']):
-            self.subject_info_df = self.subject_info_df.iloc[1:].reset_index(drop=True)
+    @staticmethod
+    def _date_string(value) -> str:
+        """날짜 값을 YYYY-MM-DD 문자열로 변환 (datetime은 pandas 없이 변환)"""
+        if isinstance(value, (datetime.datetime, datetime.date)):
+            return value.strftime('%Y-%m-%d')
 
-        # 구분 컬럼 forward-fill (Excel의 병합된 셀 처리)
-        col_div = self.config['columns']['subject_info']['division']
-        self.subject_info_df[col_div] = self.subject_info_df[col_div].ffill()
+        import pandas as pd
+        return pd.to_datetime(value).strftime('%Y-%m-%d')
 
-        print(f"  ✓ 대상자 정보 ({year}년): {len(self.subject_info_df)} 건")
+    @classmethod
+    def _format_wear_date(cls, value) -> Optional[str]:
+        """착용 시작일을 YYYY-MM-DD 문자열로 변환 (실패 시 None)"""
+        if value is None:
+            return None
+        try:
+            return cls._date_string(value)
+        except Exception:
+            return None
+
+    def resolve_division(self, key, file_date: Optional[str], by_id: bool = False) -> Optional[Tuple[int, str]]:
+        """파일 날짜와 착용 시작일로 파일의 (연도, 구분) 판별
+
+        division_filter에 포함된 후보 중 착용 시작일이 파일 날짜 이전인
+        가장 최근 착용 기간을 선택합니다. 파일 날짜가 없으면 후보가 하나일 때만 선택합니다.
+
+        Args:
+            key: 관리번호 (by_id=False) 또는 ID (by_id=True)
+            file_date: 파일명의 날짜 (YYYY-MM-DD) 또는 None
+            by_id: True이면 ID로 조회
+
+        Returns:
+            (연도, 구분) 튜플 또는 None
+        """
+        index = self.id_wear_index if by_id else self.wear_index
+        candidates = [
+            (wear_date, year, division) for wear_date, year, division in index.get(key, [])
+            if self.division_filter is None or (year, division) in self.division_filter
+        ]
+        if not candidates:
+            return None
+
+        if file_date is None:
+            if len(candidates) == 1:
+                return candidates[0][1], candidates[0][2]
+            return None
+
+        eligible = [candidate for candidate in candidates if candidate[0] <= file_date]
+        if not eligible:
+            return None
+        return eligible[-1][1], eligible[-1][2]
         
     def extract_serial_from_filename(self, filename: str) -> Optional[str]:
         """파일명에서 고유번호 추출
@@ -78,51 +328,49 @@ class ActiGraphRenamer:
         if match:
             return (match.group(1), match.group(2), match.group(3))
         return None
+
+    def extract_date_from_filename(self, filename: str) -> Optional[str]:
+        """파일명의 괄호 안 날짜 추출
+
+        예: "MOS2D36155148 (2025-11-13)60sec.agd" -> "2025-11-13"
+        """
+        match = re.search(r'\((\d{4}-\d{2}-\d{2})\)', filename)
+        if match:
+            return match.group(1)
+        return None
     
     def get_management_number(self, serial_number: str) -> Optional[int]:
         """고유번호로 관리번호 조회"""
-        col_serial = self.config['columns']['serial_mapping']['serial_number']
-        col_mgmt = self.config['columns']['serial_mapping']['management_number']
-        
-        result = self.serial_mapping_df[
-            self.serial_mapping_df[col_serial] == serial_number
-        ]
-        
-        if len(result) == 0:
-            return None
-        
-        return int(result.iloc[0][col_mgmt])
+        return self.serial_index.get(serial_number)
     
-    def get_subject_info(self, management_number: int, division: str) -> Optional[Tuple[str, str, str]]:
+    def get_subject_info(self, management_number: int, division: str,
+                         year: Optional[int] = None) -> Optional[Tuple[str, str, str]]:
         """관리번호와 구분으로 대상자 ID, 이름, 착용시작일 조회
+
+        Args:
+            management_number: 관리번호
+            division: 구분 (예: "40주차")
+            year: 연도 (기본값: 처음 로드한 연도)
         
         Returns:
             (ID, 이름, 착용시작일) 튜플 또는 None
         """
-        col_mgmt = self.config['columns']['subject_info']['management_number']
-        col_div = self.config['columns']['subject_info']['division']
-        col_id = self.config['columns']['subject_info']['id']
-        col_name = self.config['columns']['subject_info']['name']
-        col_wear_date = self.config['columns']['subject_info']['wear_start_date']
+        result = self.subject_index.get((management_number, division, year or self.year))
         
-        result = self.subject_info_df[
-            (self.subject_info_df[col_mgmt] == management_number) &
-            (self.subject_info_df[col_div] == division)
-        ]
-        
-        if len(result) == 0:
+        if not result:
             return None
         
         if len(result) > 1:
             print(f"  ⚠️  경고: 관리번호 {management_number}, 구분 {division}에 {len(result)}개의 매칭 발견")
         
-        subject_id = str(result.iloc[0][col_id])
-        subject_name = str(result.iloc[0][col_name])
-        wear_start_date = result.iloc[0][col_wear_date]
+        record = result[0]
+        subject_id = str(record['id'])
+        subject_name = str(record['name'])
+        wear_start_date = record['wear_start_date']
         
         # 날짜 형식 변환
         try:
-            wear_date_str = pd.to_datetime(wear_start_date).strftime('%Y-%m-%d')
+            wear_date_str = self._date_string(wear_start_date)
         except Exception as e:
             print(f"  ⚠️  경고: 착용 시작일 변환 실패 ({wear_start_date}): {e}")
             return None
@@ -133,7 +381,7 @@ class ActiGraphRenamer:
         """Excel 날짜 파싱 (MM-DD-YY 형식)
 
         Args:
-            date_value: Excel 날짜 값 (pandas datetime 또는 문자열 "MM-DD-YY")
+            date_value: Excel 날짜 값 (datetime 또는 문자열 "MM-DD-YY")
 
         Returns:
             datetime 객체 또는 None
@@ -147,10 +395,6 @@ class ActiGraphRenamer:
             YY >= 50 -> 19YY (1900년대)
         """
         try:
-            # pandas Timestamp인 경우
-            if isinstance(date_value, pd.Timestamp):
-                return date_value.to_pydatetime()
-
             # datetime인 경우
             if isinstance(date_value, datetime.datetime):
                 return date_value
@@ -178,12 +422,14 @@ class ActiGraphRenamer:
             print(f"  ⚠️  경고: 날짜 파싱 실패 ({date_value}): {e}")
             return None
 
-    def extract_metadata_from_subject_info(self, management_number: int, division: str) -> Optional[Dict]:
+    def extract_metadata_from_subject_info(self, management_number: int, division: str,
+                                           year: Optional[int] = None) -> Optional[Dict]:
         """Excel에서 메타데이터 추출
 
         Args:
             management_number: 관리번호
             division: 구분 (예: "40주차")
+            year: 연도 (기본값: 처음 로드한 연도)
 
         Returns:
             메타데이터 dict 또는 None
@@ -198,47 +444,34 @@ class ActiGraphRenamer:
                 'limb': str   # "Waist"
             }
         """
-        col_mgmt = self.config['columns']['subject_info']['management_number']
-        col_div = self.config['columns']['subject_info']['division']
-        col_name = self.config['columns']['subject_info']['name']
-        col_sex = self.config['columns']['subject_info']['sex']
-        col_age = self.config['columns']['subject_info']['age']
-        col_height = self.config['columns']['subject_info']['height']
-        col_mass = self.config['columns']['subject_info']['mass']
-        col_dob = self.config['columns']['subject_info']['date_of_birth']
-        col_hand = self.config['columns']['subject_info']['handedness']
-
-        # Excel에서 행 조회
-        result = self.subject_info_df[
-            (self.subject_info_df[col_mgmt] == management_number) &
-            (self.subject_info_df[col_div] == division)
-        ]
+        # 인덱스에서 레코드 조회
+        result = self.subject_index.get((management_number, division, year or self.year))
 
-        if len(result) == 0:
+        if not result:
             return None
 
-        row = result.iloc[0]
+        row = result[0]
 
         # 생년월일 파싱
-        dob = self.parse_date_from_excel(row[col_dob])
+        dob = self.parse_date_from_excel(row['date_of_birth'])
         if dob is None:
             print(f"  ⚠️  경고: 생년월일 파싱 실패 (관리번호: {management_number})")
             return None
 
         # 성별 매핑
-        sex_raw = str(row[col_sex]).strip()
+        sex_raw = str(row['sex']).strip()
         sex_mapping = self.config['metadata']['sex_mapping']
         sex = sex_mapping.get(sex_raw, sex_raw)
 
         # 메타데이터 구성
         metadata = {
-            'subjectname': str(row[col_name]),
+            'subjectname': str(row['name']),
             'sex': sex,
-            'height': int(row[col_height]),
-            'mass': int(row[col_mass]),
-            'age': int(row[col_age]),
+            'height': int(row['height']),
+            'mass': int(row['mass']),
+            'age': int(row['age']),
             'dateOfBirth': dob,
-            'hand': str(row[col_hand]).strip(),
+            'hand': str(row['handedness']).strip(),
             'limb': 'Waist'
         }
 
@@ -266,18 +499,41 @@ class ActiGraphRenamer:
         
         return old_filename
     
-    def process_file(self, filepath: Path, division: str, dry_run: bool = False, modify_metadata: bool = True) -> Tuple[bool, str]:
+    def process_file(self, filepath: Path, division: Optional[str], dry_run: bool = False,
+                     modify_metadata: bool = True, year: Optional[int] = None) -> Tuple[bool, str]:
         """단일 파일 처리
 
         Args:
             filepath: 처리할 파일 경로
-            division: 구분 (예: "40주차")
+            division: 구분 (예: "40주차"), None이면 파일명 날짜와 착용 시작일로 자동 판별
             dry_run: True이면 실제 변경 없이 미리보기만
             modify_metadata: True이면 메타데이터도 수정, False이면 파일명만 변경
+            year: 연도 (기본값: 처음 로드한 연도, 자동 판별 시 판별된 연도)
 
         Returns:
             (성공 여부, 메시지)
         """
+        success, message, _ = self._process_file(filepath, division, dry_run, modify_metadata, year)
+        return success, message
+
+    def _process_file(self, filepath: Path, division: Optional[str], dry_run: bool = False,
+                      modify_metadata: bool = True,
+                      year: Optional[int] = None) -> Tuple[bool, str, Optional[Dict]]:
+        """단일 파일 처리 (process_file + 처리 기록용 결과)
+
+        Returns:
+            (성공 여부, 메시지, 결과) - 결과는 처리 후 경로/연도/구분/적용 메타데이터 dict
+            (변경 또는 확인이 끝난 경우만, 그 외에는 None)
+        """
+        with self.metrics.file(filepath) as record:
+            outcome = self._process_file_steps(filepath, division, dry_run, modify_metadata, year)
+            if record is not None:
+                record.update(success=outcome[0], message=outcome[1])
+        return outcome
+
+    def _process_file_steps(self, filepath: Path, division: Optional[str], dry_run: bool,
+                            modify_metadata: bool, year: Optional[int]) -> Tuple[bool, str, Optional[Dict]]:
+        """_process_file 본문 (단계 경계마다 metrics.lap으로 소요 시간 기록)"""
         filename = filepath.name
         
         # 이미 변경된 파일인지 확인
@@ -287,180 +543,570 @@ class ActiGraphRenamer:
         if renamed_info:
             # 이미 변경된 파일 - ID로 관리번호 역추적
             existing_id, existing_name, existing_date = renamed_info
+
+            # 구분 자동 판별 (ID의 착용 기간)
+            if division is None:
+                target = self.resolve_division(existing_id, existing_date, by_id=True)
+                if target is None:
+                    return False, f"구분 판별 실패 (ID: {existing_id}, 날짜: {existing_date})", None
+                year, division = target
             
             # ID로 관리번호 찾기 (역조회)
-            col_id = self.config['columns']['subject_info']['id']
-            col_mgmt = self.config['columns']['subject_info']['management_number']
-            col_div = self.config['columns']['subject_info']['division']
-            
-            result = self.subject_info_df[
-                (self.subject_info_df[col_id] == existing_id) &
-                (self.subject_info_df[col_div] == division)
-            ]
+            management_number = self.id_index.get((existing_id, division, year or self.year))
             
-            if len(result) == 0:
-                return False, f"ID {existing_id}에 대한 정보를 찾을 수 없음"
-            
-            management_number = int(result.iloc[0][col_mgmt])
+            if management_number is None:
+                return False, f"ID {existing_id}에 대한 정보를 찾을 수 없음", None
         else:
             # 원본 파일 - 고유번호에서 관리번호 찾기
             serial_number = self.extract_serial_from_filename(filename)
             if not serial_number:
-                return False, "고유번호 추출 실패"
+                return False, "고유번호 추출 실패", None
             
             # 관리번호 조회
             management_number = self.get_management_number(serial_number)
             if management_number is None:
-                return False, f"관리번호 찾을 수 없음 (고유번호: {serial_number})"
+                return False, f"관리번호 찾을 수 없음 (고유번호: {serial_number})", None
+
+            # 구분 자동 판별 (관리번호의 착용 기간)
+            if division is None:
+                file_date = self.extract_date_from_filename(filename)
+                target = self.resolve_division(management_number, file_date)
+                if target is None:
+                    return False, f"구분 판별 실패 (관리번호: {management_number}, 날짜: {file_date})", None
+                year, division = target
+        year = year or self.year
         
         # ID, 이름, 착용시작일 조회
-        subject_info = self.get_subject_info(management_number, division)
+        subject_info = self.get_subject_info(management_number, division, year)
         if subject_info is None:
-            return False, f"대상자 정보 찾을 수 없음 (관리번호: {management_number}, 구분: {division})"
+            return False, f"대상자 정보 찾을 수 없음 (관리번호: {management_number}, 구분: {division})", None
         
         subject_id, name, wear_date = subject_info
         
         # 새 파일명 생성
         new_filename = self.generate_new_filename(filename, subject_id, name, wear_date)
+        self.metrics.lap('lookup')
         
         # 이미 올바른 파일명인 경우 건너뛰기
         if renamed_info:
             existing_id, existing_name, existing_date = renamed_info
             if existing_id == subject_id and existing_name == name and existing_date == wear_date:
-                return False, "이미 올바르게 변경됨"
+                result = {'path': filepath, 'year': year, 'division': division, 'metadata': None}
+                return False, "이미 올바르게 변경됨", result
         
         new_filepath = filepath.parent / new_filename
+        metadata = None
 
         # 메타데이터 수정 (파일명 변경 전)
         if modify_metadata and not dry_run:
             # 메타데이터 추출
-            metadata = self.extract_metadata_from_subject_info(management_number, division)
+            metadata = self.extract_metadata_from_subject_info(management_number, division, year)
             if metadata is None:
-                return False, f"메타데이터 추출 실패 (관리번호: {management_number}, 구분: {division})"
+                return False, f"메타데이터 추출 실패 (관리번호: {management_number}, 구분: {division})", None
+            self.metrics.lap('metadata')
 
             try:
                 # ActiGraphModifier 초기화
-                modifier = ActiGraphModifier(self.config.get('config_path', 'config.yaml') if isinstance(self.config, dict) else 'config.yaml')
-
-                # .agd 또는 .gt3x 파일 메타데이터 수정
-                file_ext = filepath.suffix.lower()
-                if file_ext == '.agd':
-                    success = modifier.modify_agd_file(str(filepath), metadata)
-                    if not success:
-                        return False, f"메타데이터 수정 실패 (.agd): {filename}"
-                elif file_ext == '.gt3x':
-                    success = modifier.modify_gt3x_file(str(filepath), metadata)
-                    if not success:
-                        return False, f"메타데이터 수정 실패 (.gt3x): {filename}"
-
-                # 검증
-                expected = {
-                    'subjectname': metadata['subjectname'],
-                    'sex': metadata['sex'],
-                    'height': metadata['height'],
-                    'mass': metadata['mass'],
-                    'age': metadata['age'],
-                    'dateOfBirth': metadata['dateOfBirth'],
-                    'side': modifier.map_handedness(metadata['hand'])[0],
-                    'dominance': modifier.map_handedness(metadata['hand'])[1],
-                    'limb': metadata['limb']
-                }
-
-                if file_ext == '.agd':
-                    if not modifier.validate_agd_modification(str(filepath), expected):
-                        return False, f"메타데이터 검증 실패 (.agd): {filename}"
-                elif file_ext == '.gt3x':
-                    if not modifier.validate_gt3x_modification(str(filepath), expected):
-                        return False, f"메타데이터 검증 실패 (.gt3x): {filename}"
+                modifier = ActiGraphModifier(config=self.config, metrics=self.metrics)
+
+                # 스테이징 모드에서는 로컬 복사본을 수정하고, 검증이 끝나면 원래 위치에 한 번만 교체
+                work_path = filepath
+                if self.staging is not None:
+                    work_path = self.staging.fetch(filepath)
+                    self.metrics.lap('stage_in')
+
+                try:
+                    # .agd 또는 .gt3x 파일 메타데이터 수정 + 검증 (파일을 한 번만 열고,
+                    # 불일치하면 커밋/교체하지 않음)
+                    file_ext = filepath.suffix.lower()
+                    verification = modifier.modify_and_verify(str(work_path), metadata)
+                    self.metrics.lap('modify')
+                    if verification is None:
+                        return False, f"메타데이터 수정 실패 ({file_ext}): {filename}", None
+                    if not all(field['ok'] for field in verification.values()):
+                        return False, f"메타데이터 검증 실패 ({file_ext}): {filename}", None
 
+                    if work_path != filepath:
+                        self.staging.commit(work_path, filepath)
+                        self.metrics.lap('copy_back')
+                finally:
+                    if work_path != filepath:
+                        self.staging.discard(work_path, filepath)
+
+            except DataIntegrityError as e:
+                return False, f"🚨 데이터 무결성 오류 - 센서 데이터 변경 감지, 파일명 변경 안 함 ({e})", None
             except Exception as e:
-                return False, f"메타데이터 수정 중 오류: {str(e)}"
+                return False, f"메타데이터 수정 중 오류: {str(e)}", None
 
         # 파일 변경
         if not dry_run:
             try:
                 filepath.rename(new_filepath)
-                if modify_metadata:
-                    return True, f"변경 완료 (메타데이터 + 파일명): {filename} -> {new_filename}"
-                else:
-                    return True, f"변경 완료 (파일명만): {filename} -> {new_filename}"
             except Exception as e:
-                return False, f"파일 변경 실패: {str(e)}"
+                return False, f"파일 변경 실패: {str(e)}", None
+            self.metrics.lap('rename')
+
+            result = {'path': new_filepath, 'year': year, 'division': division, 'metadata': metadata}
+            if modify_metadata:
+                return True, f"변경 완료 (메타데이터 + 파일명): {filename} -> {new_filename}", result
+            else:
+                return True, f"변경 완료 (파일명만): {filename} -> {new_filename}", result
         else:
             if modify_metadata:
-                return True, f"[DRY-RUN] 메타데이터 + 파일명: {filename} -> {new_filename}"
+                return True, f"[DRY-RUN] 메타데이터 + 파일명: {filename} -> {new_filename}", None
             else:
-                return True, f"[DRY-RUN] 파일명만: {filename} -> {new_filename}"
+                return True, f"[DRY-RUN] 파일명만: {filename} -> {new_filename}", None
     
-    def run(self, division: str, year: int = None, dry_run: bool = False, modify_metadata: bool = True):
+    def run(self, division: Union[str, List[str], None], year: Union[int, List[int], None] = None,
+            dry_run: bool = False, modify_metadata: bool = True, jobs: int = 1):
         """전체 프로세스 실행
 
+        구분과 연도가 하나씩이면 모든 파일을 해당 구분으로 처리하고,
+        여러 개(또는 division=None, 전체)이면 필요한 시트를 한 번에 로드한 뒤
+        파일명 날짜와 착용 시작일로 파일마다 구분을 판별합니다.
+
         Args:
-            division: 구분 (예: "40주차")
-            year: 연도 (기본값: config.yaml의 defaults.year)
+            division: 구분 (예: "40주차"), 구분 리스트, 또는 None (로드한 연도의 전체 구분)
+            year: 연도 또는 연도 리스트 (기본값: config.yaml의 defaults.year)
             dry_run: True이면 실제 변경 없이 미리보기만
             modify_metadata: True이면 메타데이터도 수정, False이면 파일명만 변경
+            jobs: 병렬 처리 워커 프로세스 수 (1이면 순차 처리)
         """
         if year is None:
-            year = self.config['defaults']['year']
+            years = [self.config['defaults']['year']]
+        elif isinstance(year, int):
+            years = [year]
+        else:
+            years = list(year)
+
+        divisions = [division] if isinstance(division, str) else division
+
+        # 구분/연도가 하나씩이면 고정 구분, 아니면 파일별 자동 판별
+        fixed_division = None
+        if divisions is not None and len(divisions) == 1 and len(years) == 1:
+            fixed_division = divisions[0]
+
+        if divisions is None:
+            division_label = "전체"
+        elif len(divisions) > 5:
+            division_label = f"{divisions[0]} ~ {divisions[-1]} ({len(divisions)}개)"
+        else:
+            division_label = ", ".join(divisions)
 
         print(f"\n{'='*60}")
         print(f"ActiGraph 파일 자동 이름 변경")
         print(f"{'='*60}")
-        print(f"📅 연도: {year}")
-        print(f"📌 구분: {division}")
+        print(f"📅 연도: {', '.join(str(y) for y in years)}")
+        print(f"📌 구분: {division_label}")
+        if fixed_division is None:
+            print("🧭 구분 판별: 파일명 날짜 ↔ 착용 시작일")
         print(f"🔍 모드: {'DRY-RUN (미리보기)' if dry_run else '실제 변경'}")
         print(f"📝 메타데이터 수정: {'예' if modify_metadata else '아니오 (파일명만)'}")
+        print(f"⚙️  병렬 작업 수: {jobs}")
         print(f"{'='*60}\n")
         
-        # 데이터 로드
-        self.load_data(year)
-        
-        # 대상 디렉토리
-        target_dir = Path(self.config['paths']['target_directory'])
-        if not target_dir.exists():
-            print(f"❌ 오류: 디렉토리를 찾을 수 없습니다: {target_dir}")
-            return
-        
-        # 처리 대상 파일 찾기 (상수 사용)
-        files = []
-        for ext in FILE_EXTENSIONS:
-            files.extend(target_dir.glob(f"*{ext}"))
+        # 단계별 측정 (config.yaml의 instrumentation, --metrics 등으로 켜기)
+        self.metrics = Instrumentation.from_config(self.config.get('instrumentation', {}))
+        self.metrics.start()
+
+        if fixed_division is None and divisions is not None:
+            self.division_filter = {(y, d) for y in years for d in divisions}
+        else:
+            self.division_filter = None
         
-        if not files:
-            print(f"❌ 처리할 파일이 없습니다. (확장자: {', '.join(FILE_EXTENSIONS)})")
+        target_dirs = self._target_directories()
+        if not target_dirs:
             return
-        
-        print(f"📁 발견된 파일: {len(files)}개\n")
-        
+
+        scan_config = self.config.get('scan', {})
+        recursive = bool(scan_config.get('recursive', True))
+        print(f"📁 검색 대상: {', '.join(str(d) for d in target_dirs)}"
+              f"{' (하위 폴더 포함)' if recursive else ''}\n")
+
+        # 처리 기록(manifest): 이전 실행 이후 바뀌지 않은 파일은 Excel 로드 전에 건너뜀
+        manifest = None
+        registry_keys = {}
+        if self.use_manifest:
+            manifest = ProcessingManifest(manifest_path(self.config, target_dirs[0]), read_only=dry_run)
+            registry_keys = {y: registry_cache_key(self.config, str(y)) for y in years}
+            interrupted = manifest.interrupted_count()
+            if interrupted:
+                print(f"🔁 이전 실행에서 중단된 파일 {interrupted}개를 다시 처리합니다\n")
+        division_set = set(divisions) if divisions is not None else None
+
         # 파일 처리
         success_count = 0
         skip_count = 0
         error_count = 0
-        
-        for filepath in sorted(files):
-            success, message = self.process_file(filepath, division, dry_run, modify_metadata)
 
-            if success:
-                print(f"✅ {message}")
-                success_count += 1
+        # 처리 대상 파일 스트리밍 탐색 (모든 확장자 1회 탐색, 탐색 중 처리 시작)
+        files = []
+        queued = []
+
+        def iter_files():
+            nonlocal skip_count
+            for filepath, stat in scan_files(
+                target_dirs, FILE_EXTENSIONS,
+                include=scan_config.get('include'),
+                exclude=scan_config.get('exclude'),
+                recursive=recursive
+            ):
+                files.append(filepath)
+                if manifest is not None:
+                    with self.metrics.stage('manifest'):
+                        unchanged = manifest.is_unchanged(
+                            filepath, stat, registry_keys, division_set, modify_metadata)
+                    if unchanged:
+                        print(f"⏭️  {filepath.name}: 변경 없음 (처리 기록)")
+                        skip_count += 1
+                        continue
+
+                # 처리할 파일이 처음 나왔을 때 데이터 로드 (필요한 시트를 한 번에)
+                if self.years != years:
+                    with self.metrics.stage('load_data'):
+                        self.load_data(years)
+                if manifest is not None:
+                    with self.metrics.stage('manifest'):
+                        manifest.mark_started(filepath, stat)
+                queued.append(filepath)
+                yield filepath
+
+        # 로컬 스테이징 (메타데이터를 실제로 수정할 때만)
+        staging_config = self.config.get('staging') or {}
+        if staging_config.get('enabled') and modify_metadata and not dry_run:
+            self.staging = LocalStaging.from_config(staging_config)
+            print(f"🚚 로컬 스테이징: {self.staging.root}\n")
+
+        try:
+            if jobs > 1:
+                from concurrent.futures import ProcessPoolExecutor
+
+                # 조회 인덱스는 워커 초기화 시 한 번만 전달 (읽기 전용 공유)
+                # 탐색되는 대로 작업을 제출하므로 탐색 중에도 워커가 처리를 시작함
+                pending = iter_files()
+                first = next(pending, None)
+                results = []
+                if first is not None:
+                    with ProcessPoolExecutor(
+                        max_workers=jobs,
+                        initializer=_init_worker,
+                        initargs=(self,)
+                    ) as executor:
+                        worker_results = executor.map(
+                            _process_in_worker,
+                            chain([first], pending),
+                            repeat(fixed_division),
+                            repeat(dry_run),
+                            repeat(modify_metadata)
+                        )
+                        # 워커에서 측정한 파일 기록은 부모 측정기로 합침
+                        for filepath, (outcome, records) in zip(queued, worker_results):
+                            self.metrics.add_records(records)
+                            results.append((filepath, outcome))
             else:
-                if "이미 변경됨" in message:
-                    print(f"⏭️  {filepath.name}: {message}")
-                    skip_count += 1
+                # 스테이징 모드에서는 처리 순서대로 몇 개 앞의 파일을 미리 로컬로 복사
+                pending = iter_files()
+                if self.staging is not None:
+                    pending = self.staging.iter_prefetched(pending)
+                results = (
+                    (filepath, self._process_file(filepath, fixed_division, dry_run, modify_metadata))
+                    for filepath in pending
+                )
+
+            for filepath, (success, message, result) in results:
+                if success:
+                    print(f"✅ {message}")
+                    success_count += 1
                 else:
-                    print(f"❌ {filepath.name}: {message}")
-                    error_count += 1
+                    if "이미 변경됨" in message:
+                        print(f"⏭️  {filepath.name}: {message}")
+                        skip_count += 1
+                    else:
+                        print(f"❌ {filepath.name}: {message}")
+                        error_count += 1
+
+                if manifest is not None:
+                    with self.metrics.stage('manifest'):
+                        if result is not None:
+                            manifest.mark_done(filepath, result['path'], result['year'], result['division'],
+                                               registry_keys.get(result['year']), result['metadata'], message)
+                        else:
+                            manifest.mark_failed(filepath, message)
+        finally:
+            if self.staging is not None:
+                self.staging.close()
+                self.staging = None
+
+        if manifest is not None:
+            manifest.close()
         
+        if not files:
+            print(f"❌ 처리할 파일이 없습니다. (확장자: {', '.join(FILE_EXTENSIONS)})")
+            self._report_metrics()
+            return
+
         # 결과 요약
         print(f"\n{'='*60}")
         print(f"📊 처리 결과")
         print(f"{'='*60}")
+        print(f"📁 발견된 파일: {len(files)}개")
         print(f"✅ 성공: {success_count}개")
         print(f"⏭️  건너뜀: {skip_count}개")
         print(f"❌ 실패: {error_count}개")
         print(f"{'='*60}\n")
 
+        self._report_metrics()
+
+    def _target_directories(self) -> List[Path]:
+        """대상 디렉토리 (여러 개 지정 가능, 없는 디렉토리는 오류 출력 후 제외)"""
+        target_dirs = self.config['paths']['target_directory']
+        if isinstance(target_dirs, str):
+            target_dirs = [target_dirs]
+        target_dirs = [Path(target_dir) for target_dir in target_dirs]
+
+        missing_dirs = [target_dir for target_dir in target_dirs if not target_dir.exists()]
+        for target_dir in missing_dirs:
+            print(f"❌ 오류: 디렉토리를 찾을 수 없습니다: {target_dir}")
+        return [target_dir for target_dir in target_dirs if target_dir not in missing_dirs]
+
+    def watch(self, division: Union[str, List[str], None], year: Union[int, List[int], None] = None,
+              dry_run: bool = False, modify_metadata: bool = True):
+        """대상 디렉토리를 감시하며 다운로드가 끝난 파일을 바로 처리 (Ctrl+C로 종료)
+
+        대상자 정보는 시작할 때 한 번 로드해 메모리에 유지하고, Excel 파일이
+        바뀌었을 때만 다시 로드합니다. 파일은 크기/수정 시각이 watch.settle_seconds 동안
+        바뀌지 않고 열려 있지 않을 때 처리합니다. 시작 시 이미 있는 파일도 처리하며,
+        처리 기록(manifest)에 완료로 남은 파일은 건너뜁니다.
+
+        Args:
+            division: 구분, 구분 리스트, 또는 None (run과 동일)
+            year: 연도 또는 연도 리스트 (기본값: config.yaml의 defaults.year)
+            dry_run: True이면 실제 변경 없이 미리보기만
+            modify_metadata: True이면 메타데이터도 수정, False이면 파일명만 변경
+        """
+        from watcher import StabilityTracker, create_watcher, is_file_ready
+
+        if year is None:
+            years = [self.config['defaults']['year']]
+        elif isinstance(year, int):
+            years = [year]
+        else:
+            years = list(year)
+
+        divisions = [division] if isinstance(division, str) else division
+        fixed_division = None
+        if divisions is not None and len(divisions) == 1 and len(years) == 1:
+            fixed_division = divisions[0]
+        if fixed_division is None and divisions is not None:
+            self.division_filter = {(y, d) for y in years for d in divisions}
+        else:
+            self.division_filter = None
+
+        target_dirs = self._target_directories()
+        if not target_dirs:
+            return
+
+        scan_config = self.config.get('scan', {})
+        recursive = bool(scan_config.get('recursive', True))
+        watch_config = self.config.get('watch') or {}
+        poll_interval = float(watch_config.get('poll_interval', 5))
+        tracker = StabilityTracker(watch_config.get('settle_seconds', 3))
+
+        print(f"\n{'='*60}")
+        print("ActiGraph 파일 감시 모드")
+        print(f"{'='*60}")
+        print(f"📅 연도: {', '.join(str(y) for y in years)}")
+        print(f"📌 구분: {'전체' if divisions is None else ', '.join(divisions)}")
+        print(f"🔍 모드: {'DRY-RUN (미리보기)' if dry_run else '실제 변경'}")
+        print(f"📝 메타데이터 수정: {'예' if modify_metadata else '아니오 (파일명만)'}")
+        print(f"📁 감시 대상: {', '.join(str(d) for d in target_dirs)}"
+              f"{' (하위 폴더 포함)' if recursive else ''}")
+        print(f"{'='*60}\n")
+
+        # 대상자 정보는 한 번만 로드 (Excel이 바뀌면 다시 로드)
+        self.load_data(years)
+        registry_keys = {y: registry_cache_key(self.config, str(y)) for y in years}
+        registry_warned = False
+
+        manifest = None
+        if self.use_manifest:
+            manifest = ProcessingManifest(manifest_path(self.config, target_dirs[0]), read_only=dry_run)
+        division_set = set(divisions) if divisions is not None else None
+
+        staging_config = self.config.get('staging') or {}
+        if staging_config.get('enabled') and modify_metadata and not dry_run:
+            self.staging = LocalStaging.from_config(staging_config)
+            print(f"🚚 로컬 스테이징: {self.staging.root}")
+
+        watcher = create_watcher(target_dirs, watch_config.get('method', 'auto'), recursive)
+        print(f"\n👀 감시 시작 ({watcher.method}, 안정 대기 {tracker.settle_seconds:g}초) - Ctrl+C로 종료\n")
+
+        try:
+            while True:
+                present = []
+                for filepath, stat in scan_files(
+                    target_dirs, FILE_EXTENSIONS,
+                    include=scan_config.get('include'),
+                    exclude=scan_config.get('exclude'),
+                    recursive=recursive
+                ):
+                    present.append(filepath)
+                    tracker.observe(filepath, stat)
+                tracker.forget_missing(present)
+
+                # Excel이 바뀌었으면 대상자 정보 다시 로드 후 실패했던 파일 재시도
+                # (대상자 행이 나중에 추가된 다운로드는 파일이 바뀌지 않아도 다시 처리)
+                try:
+                    current_keys = {y: registry_cache_key(self.config, str(y)) for y in years}
+                except OSError as e:
+                    if not registry_warned:
+                        print(f"  ⚠️  경고: Excel 파일 확인 실패, 기존 대상자 정보 사용 ({e})")
+                    registry_warned = True
+                    current_keys = registry_keys
+                else:
+                    registry_warned = False
+                if current_keys != registry_keys:
+                    print("🔄 Excel 변경 감지 - 대상자 정보 다시 로드")
+                    self.load_data(years)
+                    registry_keys = current_keys
+                    retried = tracker.retry_failed()
+                    if retried:
+                        print(f"  🔁 실패했던 파일 {retried}개 다시 처리")
+
+                for filepath in tracker.ready():
+                    if not is_file_ready(filepath):
+                        tracker.retry(filepath)
+                        continue
+
+                    try:
+                        stat = filepath.stat()
+                    except OSError:
+                        continue
+                    if manifest is not None and manifest.is_unchanged(
+                            filepath, stat, registry_keys, division_set, modify_metadata):
+                        continue
+
+                    if manifest is not None:
+                        manifest.mark_started(filepath, stat)
+                    success, message, result = self._process_file(
+                        filepath, fixed_division, dry_run, modify_metadata)
+
+                    timestamp = datetime.datetime.now().strftime('%H:%M:%S')
+                    if success:
+                        print(f"[{timestamp}] ✅ {message}")
+                    elif result is not None:
+                        print(f"[{timestamp}] ⏭️  {filepath.name}: {message}")
+                    else:
+                        print(f"[{timestamp}] ❌ {filepath.name}: {message}")
+
+                    if manifest is not None:
+                        if result is not None:
+                            manifest.mark_done(filepath, result['path'], result['year'], result['division'],
+                                               registry_keys.get(result['year']), result['metadata'], message)
+                        else:
+                            manifest.mark_failed(filepath, message)
+
+                    # 처리 후 파일(이름 변경된 경로)은 다시 바뀔 때까지 처리하지 않음
+                    # 실패한 파일은 파일이 바뀌거나 Excel이 바뀌면 다시 처리
+                    try:
+                        if result is not None:
+                            tracker.mark_handled(result['path'], result['path'].stat())
+                        else:
+                            tracker.mark_failed(filepath, filepath.stat())
+                    except OSError:
+                        pass
+
+                # 안정 대기 중인 파일이 있으면 settle 시간 후 다시 확인
+                watcher.wait(min(poll_interval, tracker.settle_seconds) if len(tracker) else poll_interval)
+
+        except KeyboardInterrupt:
+            print("\n👋 감시 종료")
+        finally:
+            watcher.close()
+            if manifest is not None:
+                manifest.close()
+            if self.staging is not None:
+                self.staging.close()
+                self.staging = None
+
+    def _report_metrics(self):
+        """단계별 측정 결과 출력 및 내보내기 (config.yaml의 instrumentation.jsonl/prometheus)"""
+        if not self.metrics.enabled:
+            return
+        self.metrics.stop()
+        self.metrics.print_summary()
+
+        metrics_config = self.config.get('instrumentation', {})
+        if metrics_config.get('jsonl'):
+            self.metrics.write_jsonl(metrics_config['jsonl'])
+            print(f"📈 측정 기록 추가: {metrics_config['jsonl']}")
+        if metrics_config.get('prometheus'):
+            self.metrics.write_prometheus(metrics_config['prometheus'])
+            print(f"📈 Prometheus textfile 저장: {metrics_config['prometheus']}")
+        print()
+
+
+def expand_divisions(values: List[str]) -> List[str]:
+    """구분 인자 확장 (쉼표 구분 목록과 범위 지원)
+
+    예: ["1주차-3주차", "5주차"] -> ["1주차", "2주차", "3주차", "5주차"]
+        ["1-3주차"] -> ["1주차", "2주차", "3주차"]
+        ["38주차,40주차"] -> ["38주차", "40주차"]
+    """
+    divisions = []
+    for value in values:
+        for token in filter(None, (part.strip() for part in value.split(','))):
+            match = re.match(r'^(\d+)(\D*?)\s*[-~]\s*(\d+)(\D+)$', token)
+            if match and match.group(2) in ('', match.group(4)):
+                start, end, suffix = int(match.group(1)), int(match.group(3)), match.group(4)
+                step = 1 if end >= start else -1
+                divisions.extend(f"{n}{suffix}" for n in range(start, end + step, step))
+            else:
+                divisions.append(token)
+    return list(dict.fromkeys(divisions))
+
+
+def expand_years(values: List[str]) -> List[int]:
+    """연도 인자 확장 (쉼표 구분 목록과 범위 지원)
+
+    예: ["2024-2025"] -> [2024, 2025], ["2024,2025"] -> [2024, 2025]
+    """
+    years = []
+    for value in values:
+        for token in filter(None, (part.strip() for part in value.split(','))):
+            match = re.match(r'^(\d{4})\s*[-~]\s*(\d{4})$', token)
+            if match:
+                start, end = sorted((int(match.group(1)), int(match.group(2))))
+                years.extend(range(start, end + 1))
+            else:
+                years.append(int(token))
+    return list(dict.fromkeys(years))
+
+
+# 병렬 처리 워커 프로세스별 renamer (초기화 시 1회 설정)
+_WORKER_RENAMER: Optional[ActiGraphRenamer] = None
+
+
+def _init_worker(renamer: ActiGraphRenamer):
+    """워커 프로세스 초기화: 부모 프로세스의 조회 인덱스를 보관"""
+    global _WORKER_RENAMER
+    _WORKER_RENAMER = renamer
+    _WORKER_RENAMER.metrics = renamer.metrics.for_worker()
+
+
+def _process_in_worker(filepath: Path, division: Optional[str], dry_run: bool,
+                       modify_metadata: bool) -> Tuple[Tuple[bool, str, Optional[Dict]], List[Dict]]:
+    """워커 프로세스에서 단일 파일 처리
+
+    Returns:
+        (처리 결과, 워커에서 측정한 파일 기록) 튜플
+    """
+    try:
+        outcome = _WORKER_RENAMER._process_file(filepath, division, dry_run, modify_metadata)
+    except Exception as e:
+        outcome = False, f"처리 중 오류: {str(e)}", None
+    return outcome, _WORKER_RENAMER.metrics.take_records()
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -479,19 +1125,56 @@ def main():
   
   # 다른 주차 처리
   python name.py -- 1주차 --year 2024
+
+  # 병렬 처리 (워커 4개)
+  python name.py -- 40주차 --jobs 4
+
+  # 여러 구분 한 번에 처리 (파일별 구분은 착용 시작일로 자동 판별)
+  python name.py --week 1주차-40주차
+  python name.py --week 38주차 39주차 40주차
+
+  # 여러 연도의 전체 구분 처리
+  python name.py --all --year 2024-2025
+
+  # 여러 디렉토리 탐색 (하위 폴더 포함, 패턴 제외)
+  python name.py --week 40주차 --root D:/site1 --root D:/site2 --exclude "backup/*"
+  python name.py --week 40주차 --no-recursive
+
+  # OneDrive / WSL /mnt/c 대상: 로컬에서 수정 후 완료된 파일만 원래 위치로 교체
+  python name.py --week 40주차 --staging
+  python name.py --week 40주차 --staging-dir /var/tmp/actigraph
+
+  # 감시 모드: 다운로드가 끝난 파일을 바로 처리 (Ctrl+C로 종료)
+  python name.py --all --watch
+  python name.py --all --watch --watch-method poll --poll-interval 10
+
+  # 처리 기록을 무시하고 모든 파일 다시 확인
+  python name.py --week 40주차 --no-manifest
+
+  # 단계별 처리 시간 측정 (JSON lines / Prometheus textfile / cProfile)
+  python name.py --week 40주차 --metrics
+  python name.py --week 40주차 --metrics-jsonl metrics.jsonl --metrics-prom /var/lib/node_exporter/actigraph.prom
+  python name.py --week 40주차 --profile run.prof --tracemalloc
         """
     )
-    
-    parser.add_argument(
+
+    target_group = parser.add_mutually_exclusive_group(required=True)
+    target_group.add_argument(
         '--week',
-        required=True,
-        help='구분 값 (예: "40주차", "1주차")'
+        nargs='+',
+        help='구분 값 (예: "40주차", "1주차-5주차", "38주차,40주차")'
+    )
+
+    target_group.add_argument(
+        '--all',
+        action='store_true',
+        help='지정한 연도의 전체 구분 처리 (파일별 구분 자동 판별)'
     )
     
     parser.add_argument(
         '--year',
-        type=int,
-        help='연도 (기본값: config.yaml의 defaults.year)'
+        nargs='+',
+        help='연도 (예: 2025, 2024-2025) (기본값: config.yaml의 defaults.year)'
     )
     
     parser.add_argument(
@@ -506,6 +1189,122 @@ def main():
         help='메타데이터 수정 없이 파일명만 변경 (기본: 메타데이터도 수정)'
     )
 
+    parser.add_argument(
+        '--in-place',
+        action='store_true',
+        help='.gt3x info.txt를 아카이브 끝에 추가하는 in-place 모드 (config.yaml의 gt3x.in_place)'
+    )
+
+    parser.add_argument(
+        '--log-metadata',
+        action='store_true',
+        help='.gt3x log.bin의 Bio METADATA 패킷도 수정 (config.yaml의 gt3x.log_metadata)'
+    )
+
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='레지스트리 캐시를 사용하지 않고 Excel을 다시 읽음'
+    )
+
+    parser.add_argument(
+        '--no-manifest',
+        action='store_true',
+        help='처리 기록(manifest)을 사용하지 않고 모든 파일을 다시 확인'
+    )
+
+    parser.add_argument(
+        '--root',
+        action='append',
+        help='탐색할 디렉토리 (여러 번 지정 가능, 기본값: config.yaml의 paths.target_directory)'
+    )
+
+    parser.add_argument(
+        '--include',
+        action='append',
+        help='포함할 파일 glob 패턴 (여러 번 지정 가능, 예: "*60sec*")'
+    )
+
+    parser.add_argument(
+        '--exclude',
+        action='append',
+        help='제외할 파일/폴더 glob 패턴 (여러 번 지정 가능, 예: "backup/*")'
+    )
+
+    parser.add_argument(
+        '--no-recursive',
+        action='store_true',
+        help='하위 폴더를 탐색하지 않음'
+    )
+
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='대상 디렉토리를 감시하며 다운로드가 끝난 파일을 바로 처리 (순차 처리, Ctrl+C로 종료)'
+    )
+
+    parser.add_argument(
+        '--watch-method',
+        choices=['auto', 'inotify', 'poll'],
+        help='감시 방식 (기본값: config.yaml의 watch.method)'
+    )
+
+    parser.add_argument(
+        '--poll-interval',
+        type=float,
+        metavar='SECONDS',
+        help='다시 탐색하는 간격 (초, 기본값: config.yaml의 watch.poll_interval)'
+    )
+
+    parser.add_argument(
+        '--staging',
+        action='store_true',
+        help='로컬 디스크에 복사해 수정한 뒤 완료된 파일만 원래 위치로 교체 (config.yaml의 staging.enabled)'
+    )
+
+    parser.add_argument(
+        '--staging-dir',
+        metavar='DIR',
+        help='로컬 스테이징 작업 디렉토리 위치 (--staging 포함, 기본값: 시스템 임시 디렉토리)'
+    )
+
+    parser.add_argument(
+        '--metrics',
+        action='store_true',
+        help='단계별 처리 시간(p50/p95/max)과 읽기/쓰기 바이트 출력 (config.yaml의 instrumentation.enabled)'
+    )
+
+    parser.add_argument(
+        '--metrics-jsonl',
+        metavar='PATH',
+        help='파일별 측정 기록과 요약을 JSON lines로 추가 기록'
+    )
+
+    parser.add_argument(
+        '--metrics-prom',
+        metavar='PATH',
+        help='측정 요약을 Prometheus textfile로 저장'
+    )
+
+    parser.add_argument(
+        '--profile',
+        metavar='PATH',
+        help='cProfile 결과 저장 경로 (메인 프로세스만)'
+    )
+
+    parser.add_argument(
+        '--tracemalloc',
+        action='store_true',
+        help='tracemalloc으로 최대 메모리와 상위 할당 위치 기록 (메인 프로세스만)'
+    )
+
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        help='병렬 처리 워커 프로세스 수 (기본값: 1, 순차 처리)'
+    )
+
     parser.add_argument(
         '--config',
         default='config.yaml',
@@ -517,11 +1316,59 @@ def main():
     # 실행
     try:
         renamer = ActiGraphRenamer(args.config)
+        if args.in_place:
+            renamer.config.setdefault('gt3x', {})['in_place'] = True
+        if args.log_metadata:
+            renamer.config.setdefault('gt3x', {})['log_metadata'] = True
+        if args.no_cache:
+            renamer.use_cache = False
+        if args.no_manifest:
+            renamer.use_manifest = False
+        if args.root:
+            renamer.config['paths']['target_directory'] = args.root
+        scan_config = renamer.config['scan'] = dict(renamer.config.get('scan') or {})
+        if args.include:
+            scan_config['include'] = args.include
+        if args.exclude:
+            scan_config['exclude'] = list(scan_config.get('exclude') or []) + args.exclude
+        if args.no_recursive:
+            scan_config['recursive'] = False
+        staging_config = renamer.config['staging'] = dict(renamer.config.get('staging') or {})
+        if args.staging or args.staging_dir:
+            staging_config['enabled'] = True
+        if args.staging_dir:
+            staging_config['directory'] = args.staging_dir
+        metrics_config = renamer.config['instrumentation'] = dict(renamer.config.get('instrumentation') or {})
+        if args.metrics:
+            metrics_config['enabled'] = True
+        if args.metrics_jsonl:
+            metrics_config['jsonl'] = args.metrics_jsonl
+        if args.metrics_prom:
+            metrics_config['prometheus'] = args.metrics_prom
+        if args.profile:
+            metrics_config['profile'] = args.profile
+        if args.tracemalloc:
+            metrics_config['enabled'] = True
+            metrics_config['tracemalloc'] = True
+        watch_config = renamer.config['watch'] = dict(renamer.config.get('watch') or {})
+        if args.watch_method:
+            watch_config['method'] = args.watch_method
+        if args.poll_interval:
+            watch_config['poll_interval'] = args.poll_interval
+        if args.watch:
+            renamer.watch(
+                division=None if args.all else expand_divisions(args.week),
+                year=expand_years(args.year) if args.year else None,
+                dry_run=args.dry,
+                modify_metadata=not args.no_metadata
+            )
+            return
         renamer.run(
-            division=args.week,
-            year=args.year,
+            division=None if args.all else expand_divisions(args.week),
+            year=expand_years(args.year) if args.year else None,
             dry_run=args.dry,
-            modify_metadata=not args.no_metadata
+            modify_metadata=not args.no_metadata,
+            jobs=max(1, args.jobs)
         )
     except FileNotFoundError as e:
         print(f"❌ 오류: 파일을 찾을 수 없습니다: {e}")
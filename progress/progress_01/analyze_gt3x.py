@@ -1,11 +1,17 @@
 """
 Analyze and compare .gt3x files to find metadata differences
 """
+import io
+import sys
 import zipfile
 import json
-import re
 from pathlib import Path
 
+# Allow importing the packet index from the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from gt3x_index import PacketIndex
+
 
 def parse_info_txt(info_content):
     """
@@ -29,57 +35,32 @@ def find_metadata_json(log_bin):
     """
     Find and extract METADATA JSON from log.bin
 
+    Walks the packet headers once with PacketIndex and decodes only the
+    METADATA packets, instead of regex/byte scanning the whole log.
+
     Args:
-        log_bin: Binary content of log.bin
+        log_bin: Binary content of log.bin, or a readable log.bin stream
 
     Returns:
-        dict: Parsed metadata JSON or None if not found
+        dict: Parsed metadata JSON (Bio preferred) or None if not found
     """
     try:
-        # Look for JSON pattern in log.bin
-        # The METADATA packet contains UTF-8 encoded JSON
-        # Pattern: {"MetadataType" ... }
-
-        # Find all potential JSON objects
-        json_pattern = rb'\{[^\}]*"MetadataType"[^\}]*\}'
-        matches = re.findall(json_pattern, log_bin, re.DOTALL)
-
-        if not matches:
-            # Try broader search
-            idx = log_bin.find(b'{"MetadataType"')
-            if idx == -1:
-                return None
-
-            # Find the end of JSON object
-            depth = 0
-            start = idx
-            for i in range(idx, len(log_bin)):
-                if log_bin[i:i+1] == b'{':
-                    depth += 1
-                elif log_bin[i:i+1] == b'}':
-                    depth -= 1
-                    if depth == 0:
-                        end = i + 1
-                        json_bytes = log_bin[start:end]
-                        return json.loads(json_bytes.decode('utf-8'))
-            return None
-
-        # Parse the first match
-        for match in matches:
-            try:
-                metadata = json.loads(match.decode('utf-8'))
-                if metadata.get('MetadataType') == 'Bio':
-                    return metadata
-            except:
-                continue
+        stream = io.BytesIO(log_bin) if isinstance(log_bin, (bytes, bytearray)) else log_bin
+        index = PacketIndex.build(stream)
 
-        # If no Bio metadata found, return first valid JSON
-        for match in matches:
+        documents = []
+        for position in index.metadata_positions():
             try:
-                return json.loads(match.decode('utf-8'))
-            except:
+                documents.append(json.loads(index.read_payload(stream, position).decode('utf-8')))
+            except ValueError:
                 continue
 
+        # Prefer Bio metadata, otherwise return first valid JSON
+        for metadata in documents:
+            if isinstance(metadata, dict) and metadata.get('MetadataType') == 'Bio':
+                return metadata
+        return documents[0] if documents else None
+
     except Exception as e:
         print(f"  Warning: Could not extract metadata JSON: {e}")
         return None
@@ -118,10 +99,10 @@ def analyze_gt3x_file(file_path):
 
         # Read log.bin and extract metadata
         if 'log.bin' in zf.namelist():
-            log_bin = zf.read('log.bin')
-            print(f"\n=== log.bin size: {len(log_bin)} bytes ===")
+            print(f"\n=== log.bin size: {zf.getinfo('log.bin').file_size} bytes ===")
 
-            result['metadata_json'] = find_metadata_json(log_bin)
+            with zf.open('log.bin') as log_stream:
+                result['metadata_json'] = find_metadata_json(log_stream)
             if result['metadata_json']:
                 print(f"\n=== METADATA JSON found ===")
                 print(json.dumps(result['metadata_json'], indent=2, ensure_ascii=False))
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+대상자 정보 / 관리번호-시리얼번호 레지스트리 캐시
+
+Excel 파싱(openpyxl)과 중복 헤더/병합 셀 처리 결과를 pickle로 저장해
+다음 실행에서는 Excel을 다시 읽지 않고 조회 인덱스를 바로 불러옵니다.
+
+캐시 키는 두 Excel 파일의 경로, 크기, 수정 시각(mtime), 시트 이름,
+config.yaml의 columns 설정으로 구성되므로 이 중 하나라도 바뀌면
+자동으로 새 캐시가 만들어집니다.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+
+# 캐시 형식 버전 (저장 구조가 바뀌면 올려서 기존 캐시 무효화)
+REGISTRY_CACHE_VERSION = 3
+
+# 기본 캐시 디렉토리 (로컬 디스크 - OneDrive 동기화 폴더 밖)
+DEFAULT_CACHE_DIRECTORY = Path.home() / ".cache" / "agd-gt3x-renamer"
+
+
+def workbook_signature(path: str) -> Dict:
+    """Excel 파일 식별 정보 (경로, 크기, 수정 시각)"""
+    stat = os.stat(path)
+    return {
+        'path': os.path.abspath(path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+    }
+
+
+def registry_cache_key(config: Dict, sheet_name: str) -> str:
+    """레지스트리 캐시 키 생성
+
+    Args:
+        config: config.yaml 설정
+        sheet_name: 대상자 정보 시트 이름 (연도)
+
+    Returns:
+        str: 캐시 키 (sha256 hex)
+    """
+    key = {
+        'version': REGISTRY_CACHE_VERSION,
+        'serial_mapping': workbook_signature(config['paths']['serial_mapping']),
+        'subject_info': workbook_signature(config['paths']['subject_info']),
+        'sheet_name': sheet_name,
+        'columns': config['columns'],
+    }
+    encoded = json.dumps(key, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def cache_directory(config: Dict) -> Path:
+    """캐시 디렉토리 (config.yaml의 cache.directory, 없으면 기본값)"""
+    directory = config.get('cache', {}).get('directory')
+    return Path(directory).expanduser() if directory else DEFAULT_CACHE_DIRECTORY
+
+
+def load_registry_cache(directory: Path, key: str) -> Optional[Dict]:
+    """캐시된 레지스트리 로드
+
+    Args:
+        directory: 캐시 디렉토리
+        key: registry_cache_key 결과
+
+    Returns:
+        dict: 저장된 레지스트리 또는 None (캐시 없음/손상)
+    """
+    path = directory / f"registry-{key}.pkl"
+    try:
+        with open(path, 'rb') as f:
+            payload = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"  ⚠️  경고: 레지스트리 캐시 손상, 다시 생성합니다 ({e})")
+        return None
+
+    if payload.get('version') != REGISTRY_CACHE_VERSION:
+        return None
+    return payload
+
+
+def save_registry_cache(directory: Path, key: str, payload: Dict):
+    """레지스트리 캐시 저장 (임시 파일 + os.replace로 원자적 기록)
+
+    Args:
+        directory: 캐시 디렉토리
+        key: registry_cache_key 결과
+        payload: 저장할 레지스트리 (조회 인덱스와 건수)
+    """
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=".registry-", suffix=".tmp", dir=directory)
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(dict(payload, version=REGISTRY_CACHE_VERSION), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, directory / f"registry-{key}.pkl")
+    except OSError as e:
+        # 캐시 저장 실패는 처리 결과에 영향 없음
+        print(f"  ⚠️  경고: 레지스트리 캐시 저장 실패 ({e})")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+ActiGraph 파일 스트리밍 디렉토리 스캐너
+
+os.scandir 기반으로 여러 루트 디렉토리를 재귀 탐색하며
+(경로, stat) 항목을 찾는 즉시 하나씩 반환합니다.
+모든 확장자를 한 번의 탐색으로 처리하므로, 결과를 모두 모으기 전에
+파일 처리를 시작할 수 있습니다.
+
+사용 예시:
+    from scanner import scan_files
+    for path, stat in scan_files(["/data/site1", "/data/site2"], [".agd", ".gt3x"],
+                                 exclude=["backup/*"]):
+        ...
+"""
+
+import os
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+def _matches(relative_path: str, name: str, patterns: Sequence[str]) -> bool:
+    """glob 패턴 매칭 (상대 경로 또는 이름 기준)"""
+    return any(fnmatch(relative_path, pattern) or fnmatch(name, pattern) for pattern in patterns)
+
+
+def _directory_key(directory: Path):
+    """디렉토리 식별 키 (링크를 따라간 대상의 장치, inode / inode가 없으면 실제 경로)"""
+    stat = os.stat(directory)
+    return (stat.st_dev, stat.st_ino) if stat.st_ino else os.path.realpath(directory)
+
+
+def scan_files(roots: Iterable, extensions: Iterable[str],
+               include: Optional[Sequence[str]] = None,
+               exclude: Optional[Sequence[str]] = None,
+               recursive: bool = True) -> Iterator[Tuple[Path, os.stat_result]]:
+    """여러 루트에서 대상 파일을 스트리밍으로 탐색
+
+    디렉토리 단위로 항목을 읽어 이름순으로 반환하므로, 처리 중 같은 디렉토리에서
+    파일 이름이 바뀌어도 바뀐 이름이 다시 반환되지 않습니다.
+    루트가 겹치거나 링크로 같은 파일에 도달해도 (장치, inode) 기준으로 한 번만 반환합니다.
+    디렉토리도 (장치, inode) 기준으로 한 번만 탐색하므로 상위 디렉토리를 가리키는
+    심볼릭 링크/정션이 있어도 무한 반복하지 않습니다.
+
+    Args:
+        roots: 탐색할 루트 디렉토리들
+        extensions: 대상 확장자 (예: [".agd", ".gt3x"], 대소문자 무시)
+        include: 포함할 glob 패턴 (루트 기준 상대 경로 또는 파일명, 지정 시 일치하는 파일만)
+        exclude: 제외할 glob 패턴 (파일과 하위 디렉토리 모두 적용)
+        recursive: True이면 하위 디렉토리까지 탐색
+
+    Yields:
+        (파일 경로, os.stat_result) 튜플
+    """
+    suffixes = tuple(ext.lower() for ext in extensions)
+    include = list(include or [])
+    exclude = list(exclude or [])
+    seen = set()
+    visited = set()
+
+    for root in map(Path, roots):
+        if not root.is_dir():
+            print(f"⚠️  경고: 디렉토리를 찾을 수 없습니다: {root}")
+            continue
+
+        stack: List[Tuple[Path, str]] = [(root, "")]
+        while stack:
+            directory, relative_dir = stack.pop()
+            try:
+                key = _directory_key(directory)
+                if key in visited:
+                    continue
+                visited.add(key)
+
+                with os.scandir(directory) as iterator:
+                    entries = sorted(iterator, key=lambda entry: entry.name)
+            except OSError as e:
+                print(f"⚠️  경고: 디렉토리 읽기 실패 ({directory}): {e}")
+                continue
+
+            subdirectories = []
+            for entry in entries:
+                relative_path = f"{relative_dir}{entry.name}"
+
+                if exclude and _matches(relative_path, entry.name, exclude):
+                    continue
+
+                try:
+                    if entry.is_dir():
+                        if recursive:
+                            subdirectories.append((Path(entry.path), f"{relative_path}/"))
+                        continue
+
+                    if not entry.name.lower().endswith(suffixes) or entry.name.startswith('.'):
+                        continue
+                    if include and not _matches(relative_path, entry.name, include):
+                        continue
+
+                    stat = entry.stat()
+                except OSError:
+                    continue
+
+                # inode를 제공하지 않는 파일 시스템은 경로로 중복 확인
+                key = (stat.st_dev, stat.st_ino) if stat.st_ino else os.path.realpath(entry.path)
+                if key in seen:
+                    continue
+                seen.add(key)
+
+                yield Path(entry.path), stat
+
+            # 이름순 탐색을 위해 역순으로 스택에 추가
+            stack.extend(reversed(subdirectories))
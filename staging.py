@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+로컬 스테이징 (OneDrive / WSL /mnt/c 등 느린 대상 디렉토리용)
+
+대상 디렉토리가 느린 공유 파일시스템(WSL 9P 브리지, OneDrive 동기화 폴더)에 있으면
+SQLite 페이지 읽기/쓰기, 저널, ZIP 임시 파일 등 작은 I/O마다 지연과 동기화 작업이 생깁니다.
+스테이징 모드에서는 파일을 큰 순차 읽기로 로컬 디스크에 복사해 수정/검증을 모두 로컬에서 하고,
+완료된 파일만 한 번 복사해 원래 위치에 임시 파일 + os.replace로 원자적으로 교체합니다.
+
+- 순차 처리에서는 처리 순서대로 몇 개 앞의 파일을 백그라운드 스레드 하나가 미리 복사
+- 수정/검증에 실패한 파일은 로컬 복사본만 버리고 원본은 건드리지 않음
+- 이전 버전이 남긴 .bak 백업이 있는 파일은 복구를 위해 원래 위치에서 직접 처리
+
+사용 예시:
+    from staging import LocalStaging
+    with LocalStaging(prefetch=4) as staging:
+        for path in staging.iter_prefetched(paths):
+            local_path = staging.fetch(path)
+            ...  # local_path 수정
+            staging.commit(local_path, path)
+"""
+
+import itertools
+import os
+import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+
+# 복사 버퍼 크기 (공유 파일시스템에서 왕복 횟수를 줄이는 큰 순차 I/O)
+COPY_BUFFER_SIZE = 8 * 1024 * 1024
+
+# 순차 처리 시 미리 복사해 둘 파일 수 기본값
+DEFAULT_PREFETCH = 4
+
+
+def copy_file(source, destination, sync: bool = False,
+              buffer_size: int = COPY_BUFFER_SIZE) -> int:
+    """큰 버퍼 단위 순차 복사
+
+    Args:
+        source: 원본 경로
+        destination: 대상 경로 (덮어씀)
+        sync: True이면 닫기 전에 fsync (교체 전 내용이 디스크에 기록되도록)
+        buffer_size: 읽기/쓰기 단위
+
+    Returns:
+        int: 복사한 바이트 수
+    """
+    copied = 0
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    with open(source, 'rb', buffering=0) as src, open(destination, 'wb', buffering=0) as dst:
+        while True:
+            length = src.readinto(buffer)
+            if not length:
+                break
+            dst.write(view[:length])
+            copied += length
+        if sync:
+            os.fsync(dst.fileno())
+    return copied
+
+
+class LocalStaging:
+    """로컬 작업 디렉토리로 파일을 옮겨 처리하고 완료된 파일만 원래 위치로 교체"""
+
+    def __init__(self, directory: Optional[str] = None, prefetch: int = DEFAULT_PREFETCH):
+        """
+        Args:
+            directory: 로컬 작업 디렉토리를 만들 위치 (None이면 시스템 임시 디렉토리)
+            prefetch: 순차 처리 시 미리 복사해 둘 파일 수 (0이면 미리 복사하지 않음)
+        """
+        if directory:
+            Path(directory).expanduser().mkdir(parents=True, exist_ok=True)
+            directory = str(Path(directory).expanduser())
+        self.root = Path(tempfile.mkdtemp(prefix="actigraph-staging-", dir=directory or None))
+        self.prefetch_depth = max(0, int(prefetch))
+        self._counter = itertools.count()
+        self._pending: Dict[str, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'LocalStaging':
+        """config.yaml의 staging 설정으로 생성"""
+        return cls(directory=config.get('directory') or None,
+                   prefetch=config.get('prefetch', DEFAULT_PREFETCH))
+
+    def __getstate__(self):
+        """병렬 워커 전달용 상태 (미리 복사 중인 작업 제외, 워커는 필요할 때 직접 복사)"""
+        state = self.__dict__.copy()
+        state['_pending'] = {}
+        state['_executor'] = None
+        return state
+
+    def __enter__(self) -> 'LocalStaging':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """미리 복사 작업 취소 후 로컬 작업 디렉토리 삭제"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._pending.clear()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    # 로컬로 복사
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _key(path) -> str:
+        return os.path.abspath(path)
+
+    @staticmethod
+    def is_stageable(path) -> bool:
+        """로컬에서 처리할 수 있는 파일인지 (.bak 복구가 필요한 파일은 제외)"""
+        return not os.path.exists(f"{path}.bak")
+
+    def _copy_in(self, source: Path) -> Path:
+        """원본을 로컬 작업 디렉토리로 복사 (파일별 하위 디렉토리, 파일명 유지)"""
+        directory = self.root / f"{os.getpid()}-{next(self._counter)}"
+        directory.mkdir()
+        local_path = directory / source.name
+        try:
+            copy_file(source, local_path)
+        except BaseException:
+            shutil.rmtree(directory, ignore_errors=True)
+            raise
+        return local_path
+
+    def prefetch(self, source: Path):
+        """백그라운드 스레드에서 로컬 복사 시작 (fetch에서 결과 사용)"""
+        key = self._key(source)
+        if self.prefetch_depth == 0 or key in self._pending or not self.is_stageable(source):
+            return
+        if self._executor is None:
+            # 공유 파일시스템에는 순차 읽기가 유리하므로 복사 스레드는 하나만 사용
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="staging")
+        self._pending[key] = self._executor.submit(self._copy_in, Path(source))
+
+    def iter_prefetched(self, paths: Iterable[Path]) -> Iterator[Path]:
+        """prefetch개 앞의 파일까지 미리 복사를 시작하며 경로를 순서대로 전달"""
+        window = deque()
+        for path in paths:
+            self.prefetch(path)
+            window.append(path)
+            if len(window) > self.prefetch_depth:
+                yield window.popleft()
+        while window:
+            yield window.popleft()
+
+    def fetch(self, source: Path) -> Path:
+        """처리할 로컬 경로 (미리 복사한 파일이 있으면 사용, 없으면 지금 복사)
+
+        Returns:
+            Path: 로컬 복사본 경로 (.bak 복구가 필요한 파일은 원본 경로)
+        """
+        future = self._pending.pop(self._key(source), None)
+        if future is not None:
+            return future.result()
+        if not self.is_stageable(source):
+            return Path(source)
+        return self._copy_in(Path(source))
+
+    # ------------------------------------------------------------------
+    # 원래 위치로 교체
+    # ------------------------------------------------------------------
+
+    def commit(self, local_path: Path, source: Path):
+        """완료된 로컬 파일을 원래 위치에 원자적으로 교체
+
+        같은 디렉토리의 임시 파일로 한 번 복사(fsync)한 뒤 원본 권한을 복사하고
+        os.replace로 교체하므로 중간에 중단되어도 원본은 이전 내용 그대로 남습니다.
+
+        Args:
+            local_path: fetch가 돌려준 로컬 경로
+            source: 원래 위치 (원본 경로)
+        """
+        if Path(local_path) == Path(source):
+            return
+
+        temp_path = Path(source).parent / f".{Path(source).name}.staging.tmp"
+        try:
+            copy_file(local_path, temp_path, sync=True)
+            shutil.copymode(source, temp_path)
+            os.replace(temp_path, source)
+        except BaseException:
+            if temp_path.exists():
+                temp_path.unlink()
+            raise
+        finally:
+            self.discard(local_path, source)
+
+    def discard(self, local_path: Path, source: Path):
+        """로컬 복사본 삭제 (원본은 변경하지 않음)"""
+        if Path(local_path) != Path(source):
+            shutil.rmtree(Path(local_path).parent, ignore_errors=True)
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+대상 디렉토리 감시 (inotify 또는 polling) 및 다운로드 완료 판별
+
+ActiLife가 파일을 내려받는 동안에는 처리하지 않고, 크기/수정 시각이 settle_seconds 동안
+바뀌지 않고 파일이 열려 있지 않을 때(SQLite 잠금/저널 없음, ZIP 중앙 디렉토리 완성)
+처리 대상으로 넘깁니다.
+
+- InotifyWatcher: Linux inotify (ctypes, 추가 패키지 없음). 하위 디렉토리도 감시하며
+  새로 생긴 디렉토리는 자동으로 추가합니다. 이벤트는 "다시 탐색할 때"라는 신호로만 사용하고,
+  실제 변경 파일은 scan_files 결과의 크기/수정 시각으로 판단합니다.
+- PollingWatcher: 일정 간격으로 다시 탐색 (inotify를 쓸 수 없는 환경)
+- WSL /mnt/c(9P, drvfs), 네트워크 드라이브는 Windows 쪽 변경이 inotify로 전달되지 않으므로
+  method='auto'이면 polling을 사용합니다.
+
+사용 예시:
+    from watcher import create_watcher, StabilityTracker
+    watcher = create_watcher(roots, method='auto')
+    tracker = StabilityTracker(settle_seconds=3)
+    while True:
+        for path, stat in scan_files(roots, FILE_EXTENSIONS):
+            tracker.observe(path, stat)
+        for path in tracker.ready():
+            ...
+        watcher.wait(5)
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import sqlite3
+import struct
+import time
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+# inotify 이벤트 마스크 (linux/inotify.h)
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, 'O_CLOEXEC', 0o2000000)
+
+# 쓰기 도중에는 이벤트가 나지 않도록 IN_MODIFY는 제외 (다운로드 완료 시 IN_CLOSE_WRITE)
+WATCH_MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+INOTIFY_EVENT = struct.Struct('iIII')  # wd, mask, cookie, len
+EVENT_BUFFER_SIZE = 64 * 1024
+
+# 다른 쪽(Windows/원격)의 변경이 inotify로 전달되지 않는 파일시스템
+POLLING_FILESYSTEMS = {'9p', 'v9fs', 'drvfs', 'cifs', 'smb3', 'smbfs', 'nfs', 'nfs4',
+                       'fuse', 'fuseblk', 'fuse.sshfs', 'fuse.rclone'}
+
+FileSignature = Tuple[int, int]  # (크기, 수정 시각 ns)
+
+
+def filesystem_type(path) -> Optional[str]:
+    """경로가 속한 마운트의 파일시스템 종류 (/proc/mounts, 알 수 없으면 None)"""
+    try:
+        with open('/proc/mounts', 'r', encoding='utf-8', errors='replace') as f:
+            mounts = [line.split()[1:3] for line in f if len(line.split()) >= 3]
+    except OSError:
+        return None
+
+    target = os.path.realpath(path)
+    best, best_type = '', None
+    for mount_point, fs_type in mounts:
+        mount_point = mount_point.replace('\\040', ' ')
+        prefix = mount_point.rstrip('/') + '/'
+        if (target == mount_point or target.startswith(prefix)) and len(mount_point) > len(best):
+            best, best_type = mount_point, fs_type
+    return best_type
+
+
+def is_file_ready(path) -> bool:
+    """다운로드/기록이 끝나 처리해도 되는 파일인지 확인
+
+    .agd: 저널/WAL 파일이 없고, 다른 연결이 잠그고 있지 않아 쓰기 잠금을 잡을 수 있음
+    .gt3x: ZIP 중앙 디렉토리까지 기록되어 아카이브를 열 수 있음
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == '.agd':
+        if any(os.path.exists(f"{path}{extra}") for extra in ('-journal', '-wal')):
+            return False
+        try:
+            conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=rw", uri=True,
+                                   timeout=0, isolation_level=None)
+            try:
+                conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute("ROLLBACK")
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return False
+    elif suffix == '.gt3x':
+        try:
+            with zipfile.ZipFile(path, 'r'):
+                pass
+        except (zipfile.BadZipFile, OSError):
+            return False
+    return True
+
+
+class PollingWatcher:
+    """일정 간격으로 다시 탐색하도록 알리는 감시기"""
+
+    method = 'poll'
+
+    def wait(self, timeout: float) -> bool:
+        """timeout 동안 대기 (변경 여부를 알 수 없으므로 항상 True)"""
+        time.sleep(max(0.0, timeout))
+        return True
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify 감시기 (ctypes)"""
+
+    method = 'inotify'
+
+    def __init__(self, roots: Iterable, recursive: bool = True):
+        """
+        Args:
+            roots: 감시할 루트 디렉토리들
+            recursive: True이면 하위 디렉토리도 감시
+
+        Raises:
+            OSError: inotify를 사용할 수 없을 때
+        """
+        libc_name = ctypes.util.find_library('c') or 'libc.so.6'
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, 'inotify_init1'):
+            raise OSError(errno.ENOSYS, "inotify not available")
+
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+
+        self.recursive = recursive
+        self._directories: Dict[int, Path] = {}
+        try:
+            for root in roots:
+                self._add_tree(Path(root))
+        except OSError:
+            self.close()
+            raise
+
+    def _add(self, directory: Path):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(str(directory)), WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, f"{os.strerror(error)}: {directory}")
+        self._directories[wd] = directory
+
+    def _add_tree(self, root: Path):
+        """디렉토리 (recursive이면 하위 디렉토리 포함) 감시 추가"""
+        self._add(root)
+        if not self.recursive:
+            return
+        for directory, subdirectories, _ in os.walk(root):
+            for name in subdirectories:
+                try:
+                    self._add(Path(directory) / name)
+                except OSError as e:
+                    print(f"  ⚠️  경고: 디렉토리 감시 추가 실패 ({e})")
+
+    def _handle(self, data: bytes):
+        """이벤트 해석 (새 디렉토리 감시 추가, 삭제된 디렉토리 정리)"""
+        position = 0
+        while position + INOTIFY_EVENT.size <= len(data):
+            wd, mask, _, length = INOTIFY_EVENT.unpack_from(data, position)
+            name = data[position + INOTIFY_EVENT.size:position + INOTIFY_EVENT.size + length]
+            position += INOTIFY_EVENT.size + length
+
+            if mask & IN_IGNORED:
+                self._directories.pop(wd, None)
+            elif mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and self.recursive:
+                parent = self._directories.get(wd)
+                if parent is not None:
+                    try:
+                        self._add_tree(parent / os.fsdecode(name.rstrip(b'\0')))
+                    except OSError as e:
+                        print(f"  ⚠️  경고: 디렉토리 감시 추가 실패 ({e})")
+
+    def wait(self, timeout: float) -> bool:
+        """이벤트가 올 때까지 최대 timeout 동안 대기
+
+        Returns:
+            bool: 이벤트가 있었으면 True (큐 넘침 포함)
+        """
+        readable, _, _ = select.select([self.fd], [], [], max(0.0, timeout))
+        if not readable:
+            return False
+        while True:
+            try:
+                data = os.read(self.fd, EVENT_BUFFER_SIZE)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            self._handle(data)
+        return True
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def create_watcher(roots: List, method: str = 'auto', recursive: bool = True):
+    """감시기 생성
+
+    Args:
+        roots: 감시할 루트 디렉토리들
+        method: 'auto' (가능하면 inotify, 9P/네트워크 파일시스템은 polling), 'inotify', 'poll'
+        recursive: True이면 하위 디렉토리도 감시
+
+    Returns:
+        InotifyWatcher 또는 PollingWatcher
+    """
+    if method == 'poll':
+        return PollingWatcher()
+
+    if method == 'auto':
+        slow = [root for root in roots if filesystem_type(root) in POLLING_FILESYSTEMS]
+        if slow:
+            print(f"  ℹ️  {slow[0]}: inotify 이벤트가 전달되지 않는 파일시스템 - polling 사용")
+            return PollingWatcher()
+
+    try:
+        return InotifyWatcher(roots, recursive=recursive)
+    except (OSError, AttributeError) as e:
+        if method == 'inotify':
+            raise
+        print(f"  ℹ️  inotify 사용 불가 ({e}) - polling 사용")
+        return PollingWatcher()
+
+
+class StabilityTracker:
+    """파일별 크기/수정 시각이 안정될 때까지 추적"""
+
+    def __init__(self, settle_seconds: float = 3.0):
+        """
+        Args:
+            settle_seconds: 크기/수정 시각이 이 시간 동안 바뀌지 않으면 처리 대상
+        """
+        self.settle_seconds = float(settle_seconds)
+        self._pending: Dict[Path, Tuple[FileSignature, float]] = {}
+        self._handled: Dict[Path, FileSignature] = {}
+        self._failed: Set[Path] = set()
+
+    @staticmethod
+    def signature(stat: os.stat_result) -> FileSignature:
+        return stat.st_size, stat.st_mtime_ns
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def observe(self, path: Path, stat: os.stat_result, now: Optional[float] = None):
+        """탐색 결과 반영 (처리한 뒤 바뀌지 않은 파일은 무시, 바뀌면 대기 시간 다시 시작)"""
+        now = time.monotonic() if now is None else now
+        signature = self.signature(stat)
+        if self._handled.get(path) == signature:
+            return
+        pending = self._pending.get(path)
+        if pending is None or pending[0] != signature:
+            self._pending[path] = (signature, now)
+
+    def forget_missing(self, present: Iterable[Path]):
+        """탐색에서 사라진 파일(이름 변경/삭제) 정리"""
+        present = set(present)
+        for table in (self._pending, self._handled):
+            for path in [path for path in table if path not in present]:
+                del table[path]
+        self._failed &= present
+
+    def ready(self, now: Optional[float] = None) -> List[Path]:
+        """settle_seconds 동안 바뀌지 않은 파일 (반환한 파일은 처리 완료로 기록)"""
+        now = time.monotonic() if now is None else now
+        settled = [path for path, (_, since) in self._pending.items() if now - since >= self.settle_seconds]
+        for path in settled:
+            self._handled[path] = self._pending.pop(path)[0]
+        return sorted(settled)
+
+    def retry(self, path: Path, now: Optional[float] = None):
+        """아직 처리할 수 없는 파일 (잠김 등)을 다시 대기"""
+        now = time.monotonic() if now is None else now
+        signature = self._handled.pop(path, None)
+        if signature is not None:
+            self._pending[path] = (signature, now)
+
+    def mark_handled(self, path: Path, stat: os.stat_result):
+        """처리 결과 파일 (이름 변경 후 경로 등)을 처리 완료로 기록"""
+        self._handled[path] = self.signature(stat)
+        self._pending.pop(path, None)
+        self._failed.discard(path)
+
+    def mark_failed(self, path: Path, stat: os.stat_result):
+        """처리에 실패한 파일 기록 (파일이 바뀌거나 retry_failed 호출 전까지 처리하지 않음)"""
+        self.mark_handled(path, stat)
+        self._failed.add(path)
+
+    def retry_failed(self, now: Optional[float] = None) -> int:
+        """실패한 파일을 모두 다시 대기 (대상자 정보가 바뀐 경우 등), 다시 대기한 파일 수 반환"""
+        failed, self._failed = self._failed, set()
+        for path in failed:
+            self.retry(path, now)
+        return len(failed)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Excel 시트 스트리밍 리더 (openpyxl read-only, 필요한 컬럼만)
+
+대상자 정보/관리번호-시리얼번호 Excel에서 config.yaml의 columns에 지정된
+컬럼만 행 단위로 읽어 튜플 레코드로 만듭니다. 시트 전체를 DataFrame으로 만들지 않으므로
+메모리와 로드 시간이 사용하는 컬럼 수에 비례합니다.
+
+- 첫 번째 행을 헤더로 사용 (같은 이름이 여러 번 나오면 첫 번째 컬럼)
+- 첫 번째 데이터 행의 키 컬럼이 비어 있으면 중복 헤더 행으로 보고 제외
+- 병합된 셀(구분 등)은 읽는 중에 직전 값으로 채움 (forward-fill)
+- 읽는 컬럼이 모두 빈 행은 제외
+- 수식 셀은 Excel에 저장된 계산 결과를 사용 (data_only)
+
+사용 예시:
+    from workbook import WorkbookReader
+    with WorkbookReader(path) as reader:
+        table = reader.read_sheet('2025', {'division': '구분', 'management_number': '관리번호'},
+                                  key='management_number', fill_down=('division',))
+        for row in table.rows:
+            record = dict(zip(table.keys, row))
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class SheetTable(NamedTuple):
+    """시트에서 읽은 컬럼 레코드"""
+    keys: Tuple[str, ...]       # 읽은 컬럼의 config 키 (rows 튜플 순서)
+    rows: List[tuple]           # 행별 값 튜플
+    missing: Tuple[str, ...]    # 시트에 없는 config 키
+
+
+class WorkbookReader:
+    """openpyxl read-only 워크북 리더 (시트별 필요한 컬럼만 스트리밍)"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Excel 파일 경로 (.xlsx)
+        """
+        from openpyxl import load_workbook
+
+        self.path = path
+        self.workbook = load_workbook(path, read_only=True, data_only=True)
+
+    def __enter__(self) -> 'WorkbookReader':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.workbook.close()
+
+    @property
+    def sheet_names(self) -> List[str]:
+        return list(self.workbook.sheetnames)
+
+    def read_sheet(self, sheet_name: Optional[str], columns: Dict[str, str],
+                   key: Optional[str] = None, fill_down: Iterable[str] = ()) -> SheetTable:
+        """시트에서 지정한 컬럼만 읽기
+
+        Args:
+            sheet_name: 시트 이름 (None이면 첫 번째 시트)
+            columns: config 키 → 헤더 이름
+            key: 첫 번째 데이터 행에서 비어 있으면 중복 헤더 행으로 제외할 config 키
+            fill_down: 빈 셀을 직전 값으로 채울 config 키 (병합된 셀)
+
+        Returns:
+            SheetTable
+
+        Raises:
+            KeyError: 시트가 없을 때
+        """
+        worksheet = self.workbook.worksheets[0] if sheet_name is None else self.workbook[sheet_name]
+        # 저장된 dimension 정보가 틀린 파일이 있으므로 실제 셀 기준으로 읽기
+        worksheet.reset_dimensions()
+
+        header = next(worksheet.iter_rows(max_row=1, values_only=True), ())
+        positions = {}
+        for position, value in enumerate(header):
+            if value is not None:
+                positions.setdefault(str(value), position)
+
+        keys = tuple(k for k, column in columns.items() if column in positions)
+        missing = tuple(k for k, column in columns.items() if column not in positions)
+        if not keys:
+            return SheetTable(keys, [], missing)
+
+        # 필요한 컬럼 범위만 읽고, 범위 안에서 사용할 위치만 선택
+        first = min(positions[columns[k]] for k in keys)
+        last = max(positions[columns[k]] for k in keys)
+        offsets = [positions[columns[k]] - first for k in keys]
+        width = last - first + 1
+
+        key_offset = keys.index(key) if key in keys else None
+        fill_offsets = [keys.index(k) for k in fill_down if k in keys]
+        last_values = [None] * len(fill_offsets)
+
+        rows = []
+        first_row = True
+        for cells in worksheet.iter_rows(min_row=2, min_col=first + 1, max_col=last + 1, values_only=True):
+            if len(cells) < width:
+                cells = cells + (None,) * (width - len(cells))
+            values = [cells[offset] for offset in offsets]
+            if all(value is None for value in values):
+                continue
+
+            # 중복 헤더 행 (첫 번째 데이터 행의 키 컬럼이 비어 있음)
+            if first_row:
+                first_row = False
+                if key_offset is not None and values[key_offset] is None:
+                    continue
+
+            # 병합된 셀 forward-fill
+            for i, offset in enumerate(fill_offsets):
+                if values[offset] is None:
+                    values[offset] = last_values[i]
+                else:
+                    last_values[i] = values[offset]
+
+            rows.append(tuple(values))
+
+        return SheetTable(keys, rows, missing)